@@ -0,0 +1,51 @@
+"""Measure the recoloring of a 4K frame."""
+from time import perf_counter
+
+import numpy as np
+
+from mandelia.model import (GradientColoration, HistogramColoration,
+                            ModuloColoration)
+
+WIDTH, HEIGHT = 3840, 2160
+REPEAT = 20
+
+
+def best_of(function, repeat: int = REPEAT) -> float:
+    """Best duration of several calls of a function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and display timings."""
+    rng = np.random.default_rng(0)
+    content = rng.integers(0, 5000, (HEIGHT, WIDTH), dtype=np.uint32)
+    smooth = (content + rng.random((HEIGHT, WIDTH))).astype(np.float32)
+    color = ModuloColoration(3, 1, 10)
+    out = color.colorize(content)
+    best_new = best_reuse = float("inf")
+    for i in range(REPEAT):
+        color.r = 3 + i % 2  # a slider move invalidates the palette
+        start = perf_counter()
+        color.colorize(content)
+        best_new = min(best_new, perf_counter() - start)
+        start = perf_counter()
+        color.colorize(content, out)
+        best_reuse = min(best_reuse, perf_counter() - start)
+    print(f"{WIDTH}x{HEIGHT} colorize: {best_new * 1000:.1f}ms, "
+          f"into a reused buffer: {best_reuse * 1000:.1f}ms")
+    for coloration in (GradientColoration(), HistogramColoration()):
+        name = type(coloration).__name__
+        banded = best_of(lambda: coloration.colorize(content, out))
+        smoothed = best_of(
+            lambda: coloration.colorize(content, out, smooth))
+        print(f"{name}: {banded * 1000:.1f}ms, "
+              f"with smooth counts: {smoothed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
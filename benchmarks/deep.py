@@ -0,0 +1,38 @@
+"""Compare the cost of the perturbation kernel with the double kernel."""
+from time import perf_counter
+
+from mandelia.model import DeepMandelbrot, Mandelbrot, ModuloColoration
+
+# c = i is a Misiurewicz point, there is structure at every depth
+REAL, IMAGINARY = "0", "1"
+DEPTHS = (1e-5, 1e-12, 1e-50, 1e-100, 1e-200)
+WIDTH, HEIGHT = 800, 600
+ITERATIONS = 5_000
+
+
+def run(fractale: Mandelbrot) -> float:
+    """Return nanoseconds per iteration of a full compute."""
+    start = perf_counter()
+    fractale.image()
+    return (perf_counter() - start) * 1e9 / fractale.iterations_sum()
+
+
+def main() -> None:
+    """Run the benchmark and display a table."""
+    color = ModuloColoration()
+    print(f"{'pixel size':<12}{'double':>12}{'perturbation':>15}")
+    for pixel_size in DEPTHS:
+        deep = DeepMandelbrot(color, REAL, IMAGINARY, ITERATIONS,
+                              WIDTH, HEIGHT, pixel_size)
+        line = f"{pixel_size:<12.0e}"
+        if pixel_size > 1e-13:
+            double = Mandelbrot(color, float(REAL), float(IMAGINARY),
+                                ITERATIONS, WIDTH, HEIGHT, pixel_size)
+            line += f"{run(double):>8.2f}ns/i"
+        else:
+            line += f"{'-':>12}"
+        print(line + f"{run(deep):>11.2f}ns/i")
+
+
+if __name__ == "__main__":
+    main()
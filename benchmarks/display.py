@@ -0,0 +1,67 @@
+"""Measure the copies of a frame between the coloring and Tk."""
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from mandelia.model import ModuloColoration
+from mandelia.model.fractale import rgba_buffer, rgba_image
+
+WIDTH, HEIGHT = 1920, 1080
+REPEAT = 20
+
+
+def best_of(function: Callable[[], object], repeat: int = REPEAT) -> float:
+    """Best duration of several calls of a function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def shares(image: Image.Image, array: np.ndarray) -> bool:
+    """Return if the image reads the memory of the array."""
+    array[0, 0, 0] ^= 0xff
+    shared = image.getpixel((0, 0))[0] == array[0, 0, 0]
+    array[0, 0, 0] ^= 0xff
+    return bool(shared)
+
+
+def blit(image: Image.Image, mode: str) -> None:
+    """Convert an image to the block PhotoImage.paste gives to Tk."""
+    if not image.im.isblock() or image.mode != mode:
+        block = Image.core.new_block(mode, image.size)
+        image.im.convert2(block, image.im)
+
+
+def main() -> None:
+    """Run the benchmark and display timings and copies per frame."""
+    content = np.random.default_rng(0).integers(
+        0, 5000, (HEIGHT, WIDTH), dtype=np.uint32)
+    color = ModuloColoration(3, 1, 10)
+    rgb = color.colorize(content)
+    rgba = rgba_buffer(HEIGHT, WIDTH)
+    color.colorize(content, rgba)
+
+    def before() -> None:
+        color.colorize(content, rgb)
+        blit(Image.fromarray(rgb, "RGB"), "RGB")
+
+    def after() -> None:
+        color.colorize(content, rgba)
+        blit(rgba_image(rgba), "RGBA")
+
+    # the copy of Tk itself happens in both cases and is not counted
+    copies_before = 1 + (not shares(Image.fromarray(rgb, "RGB"), rgb))
+    copies_after = 1 + (not shares(rgba_image(rgba), rgba))
+    print(f"{WIDTH}x{HEIGHT} RGB array: {copies_before} copies before Tk, "
+          f"{best_of(before) * 1000:.1f}ms")
+    print(f"{WIDTH}x{HEIGHT} RGBA buffer: {copies_after} copies before Tk, "
+          f"{best_of(after) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
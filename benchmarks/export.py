@@ -0,0 +1,41 @@
+"""Measure a zoom video export with processes and keyframes."""
+import os
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from mandelia.model import Mandelbrot, ModuloColoration
+
+WIDTH, HEIGHT = 320, 240
+
+
+def main() -> None:
+    """Run the benchmark and display timings."""
+    mandelbrot = Mandelbrot(ModuloColoration(), width=WIDTH, height=HEIGHT,
+                            real=-0.743643, imaginary=0.131825)
+    mandelbrot.set_pixel_size(1e-6)
+    cores = os.cpu_count() or 1
+    reference = None
+    with TemporaryDirectory() as directory:
+        for workers in sorted({1, 2, cores // 2, cores} - {0}):
+            start = perf_counter()
+            mandelbrot.drop({"path": os.path.join(directory, "zoom.mp4"),
+                             "ext": "mp4", "width": WIDTH, "height": HEIGHT,
+                             "compression": 95, "fps": 30, "speed": 50,
+                             "workers": workers})
+            duration = perf_counter() - start
+            reference = reference or duration
+            print(f"{workers} processes: {duration:.2f}s, "
+                  f"speedup {reference / duration:.2f}x")
+        for quality in (1, 0.5, 0.25):
+            start = perf_counter()
+            mandelbrot.drop({"path": os.path.join(directory, "zoom.mp4"),
+                             "ext": "mp4", "width": WIDTH, "height": HEIGHT,
+                             "compression": 95, "fps": 30, "speed": 50,
+                             "quality": quality})
+            duration = perf_counter() - start
+            print(f"keyframes of quality {quality}: {duration:.2f}s, "
+                  f"speedup {reference / duration:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
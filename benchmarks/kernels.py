@@ -0,0 +1,73 @@
+"""
+Compare escape-time kernels of Mandelbrot on some canonical views, in
+milliseconds and in millions of pixel-iterations per second.
+"""
+from time import perf_counter
+from typing import List, Tuple
+
+import numpy as np
+
+from mandelia.model import KERNELS, Mandelbrot, ModuloColoration
+from mandelia.model.fractale import BATCH_TARGET
+
+View = Tuple[str, float, float, float]
+
+VIEWS: List[View] = [
+    ("default", 0.0, 0.0, 0.02),
+    ("cardioid", -0.2, 0.0, 0.004),
+    ("period-3 bulb", -0.12, 0.75, 0.0002),
+    ("minibrot", -1.7549, 0.0, 0.00001),
+]
+WIDTH, HEIGHT = 512, 512
+ITERATIONS = (1_000, 5_000)
+REPEAT = 3
+
+
+def timeit(fractale: Mandelbrot) -> float:
+    """Return the best time of a full compute."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        fractale.set_real(fractale.real)  # force a new compute
+        start = perf_counter()
+        fractale.image()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def pixel_iterations(content: np.ndarray, iterations: int) -> int:
+    """
+    Iterations of the scalar kernel for a content, the points that do
+    not escape cost the maximum of iterations.
+    """
+    escaped = content[content != 0]
+    return (int(escaped.sum(dtype=np.uint64))
+            + (content.size - escaped.size) * iterations)
+
+
+def main() -> None:
+    """Run the benchmark and display a table."""
+    color = ModuloColoration()
+    print(f"batch kernel: {BATCH_TARGET}")
+    print(f"{'view':<16}{'iterations':>11}"
+          + "".join(f"{kernel:>21}" for kernel in KERNELS)
+          + f"{'speedup':>10}")
+    for name, real, imaginary, pixel_size in VIEWS:
+        for iterations in ITERATIONS:
+            times = []
+            contents = []
+            for kernel in KERNELS:
+                fractale = Mandelbrot(color, real, imaginary, iterations,
+                                      WIDTH, HEIGHT, pixel_size, kernel)
+                times.append(timeit(fractale))
+                contents.append(fractale.content)
+            for content in contents[1:]:
+                np.testing.assert_array_equal(contents[0], content)
+            work = pixel_iterations(contents[0], iterations) / 1e6
+            print(f"{name:<16}{iterations:>11}"
+                  + "".join(f"{t * 1000:>8.1f}ms{work / t:>8.0f}M/s"
+                            for t in times)
+                  + f"{times[0] / min(times[1:]):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Find the best thread count, schedule and chunk size of the computes for
+each kind of view and frame shape.
+"""
+import os
+from itertools import product
+from time import perf_counter
+from typing import List, Tuple
+
+from mandelia.model import Mandelbrot, ModuloColoration
+from mandelia.model.fractale import SCHEDULES
+
+# name, real, imaginary, pixel size, width, height
+View = Tuple[str, float, float, float, int, int]
+
+VIEWS: List[View] = [
+    ("full set", -0.5, 0.0, 0.006, 512, 512),
+    ("seahorse valley", -0.743643, 0.131825, 0.00001, 512, 512),
+    ("deep interior", -0.2, 0.0, 0.00025, 512, 512),
+    ("wide strip", -0.5, 0.0, 0.0015, 2048, 32),
+    ("tall strip", -0.5, 0.0, 0.0015, 32, 2048),
+]
+ITERATIONS = 2_000
+CHUNKS = (0, 1, 16)
+REPEAT = 3
+
+
+def timeit(fractale: Mandelbrot) -> float:
+    """Return the best time of a full compute."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        fractale.set_real(fractale.real)  # force a new compute
+        start = perf_counter()
+        fractale.image()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and display the settings of each view."""
+    cores = os.cpu_count() or 1
+    threads = sorted({1, cores // 2, cores} - {0})
+    print(f"{cores} cores, {ITERATIONS} iterations")
+    for name, real, imaginary, pixel_size, width, height in VIEWS:
+        fractale = Mandelbrot(ModuloColoration(), real, imaginary,
+                              ITERATIONS, width, height, pixel_size)
+        timings = []
+        for count, schedule, chunk in product(threads, SCHEDULES, CHUNKS):
+            fractale.set_threads(count)
+            fractale.set_schedule(schedule, chunk)
+            timings.append((timeit(fractale), count, schedule, chunk))
+        best = min(timings)
+        worst = max(timings)
+        print(f"{name:<16} best: {best[1]} threads {best[2]},{best[3]} "
+              f"{best[0] * 1000:.1f}ms, worst: {worst[1]} threads "
+              f"{worst[2]},{worst[3]} {worst[0] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
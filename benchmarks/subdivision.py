@@ -0,0 +1,58 @@
+"""Compare the pixel and subdivision methods on a 4K frame."""
+from time import perf_counter
+from typing import List, Tuple
+
+import numpy as np
+
+from mandelia.model import Julia, Mandelbrot, ModuloColoration
+
+View = Tuple[str, float, float, float]
+
+VIEWS: List[View] = [
+    ("full set", -0.5, 0.0, 0.0008),
+    ("cardioid", -0.2, 0.0, 0.0002),
+    ("seahorse valley", -0.7453, 0.1127, 0.0000015),
+    ("minibrot", -1.7549, 0.0, 0.0000005),
+]
+WIDTH, HEIGHT = 3840, 2160
+ITERATIONS = 1_000
+
+
+def run(fractale: Mandelbrot) -> Tuple[float, float]:
+    """Return the time of a compute and the ratio of iterated pixels."""
+    start = perf_counter()
+    fractale.image()
+    elapsed = perf_counter() - start
+    return elapsed, fractale.computed_pixels / (WIDTH * HEIGHT)
+
+
+def main() -> None:
+    """Run the benchmark and display a table."""
+    color = ModuloColoration()
+    print(f"{'view':<18}{'pixel':>10}{'subdivision':>13}"
+          f"{'iterated':>10}{'speedup':>9}")
+    fractales = [
+        (name, Mandelbrot, dict(real=real, imaginary=imaginary,
+                                pixel_size=pixel_size))
+        for name, real, imaginary, pixel_size in VIEWS
+    ]
+    fractales.append(("julia", Julia, dict(c_r=-0.8, c_i=0.156,
+                                           pixel_size=0.0008)))
+    for name, cls, kwargs in fractales:
+        results = []
+        contents = []
+        for method in ("pixel", "subdivision"):
+            fractale = cls(color, iterations=ITERATIONS, width=WIDTH,
+                           height=HEIGHT, kernel="interior", method=method,
+                           **kwargs)
+            results.append(run(fractale))
+            contents.append(fractale.content)
+        mismatch = np.count_nonzero(contents[0] != contents[1])
+        (pixel, _), (subdivision, ratio) = results
+        print(f"{name:<18}{pixel * 1000:>8.0f}ms{subdivision * 1000:>11.0f}ms"
+              f"{ratio:>10.1%}{pixel / subdivision:>8.1f}x"
+              + (f"  ({mismatch} pixels differ)" if mismatch else ""))
+
+
+if __name__ == "__main__":
+    main()
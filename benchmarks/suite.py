@@ -0,0 +1,243 @@
+"""
+Reproducible benchmark suite, results are written as JSON to compare
+versions, machines and thread counts.
+
+    python -m benchmarks.suite -o results.json --threads 4
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from io import StringIO
+from statistics import mean, median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mandelia import __version__
+from mandelia.model import (DataExport, Fractale, FractaleManager, Julia,
+                            Mandelbrot, ModuloColoration)
+from mandelia.model.fractale import BATCH_TARGET, set_threads
+
+Result = Dict[str, Any]
+
+# name, real, imaginary, pixel size
+VIEWS: List[Tuple[str, float, float, float]] = [
+    ("full set", -0.5, 0.0, 0.012),
+    ("seahorse valley", -0.743643, 0.131825, 0.00002),
+    ("deep interior", -0.2, 0.0, 0.0005),
+]
+JULIAS: List[Tuple[str, float, float]] = [
+    ("dendrite", 0.0, 1.0),
+    ("douady rabbit", -0.123, 0.745),
+]
+SIZES = ((256, 256), (1024, 768))
+ITERATIONS = (500, 5_000)
+KERNELS = ("scalar", "batch")
+GROUPS = ("compute", "coloring", "manager", "export")
+
+
+class Suite:
+    """Run benchmarks and collect their results."""
+    def __init__(self, repeat: int, quick: bool) -> None:
+        """Instantiate Suite."""
+        self.repeat = repeat
+        self.quick = quick
+        self.results: List[Result] = []
+
+    def measure(self, name: str, params: Dict[str, Any],
+                function: Callable[[], object],
+                setup: Optional[Callable[[], None]] = None) -> Result:
+        """
+        Time several calls of a function, setup is called before each one
+        without being timed. The iterations are kept when the function
+        returns them as an int.
+        """
+        times = []
+        value = None
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            start = perf_counter()
+            value = function()
+            times.append(perf_counter() - start)
+        result: Result = {
+            "name": name,
+            "params": params,
+            "repeat": self.repeat,
+            "min": min(times),
+            "median": median(times),
+            "mean": mean(times),
+            "max": max(times),
+        }
+        if isinstance(value, int):
+            result["iterations"] = value
+            result["iterations_per_second"] = value / min(times)
+        self.results.append(result)
+        print(f"{name:<14} {format_params(params):<60} "
+              f"{min(times) * 1000:>10.1f}ms")
+        return result
+
+    def sizes(self) -> Sequence[Tuple[int, int]]:
+        """Sizes of the computes."""
+        return SIZES[:1] if self.quick else SIZES
+
+    def iterations(self) -> Sequence[int]:
+        """Iteration budgets of the computes."""
+        return ITERATIONS[:1] if self.quick else ITERATIONS
+
+    def compute(self) -> None:
+        """Full computes of Mandelbrot and Julia."""
+        color = ModuloColoration()
+        for kernel in KERNELS:
+            for (width, height) in self.sizes():
+                for iterations in self.iterations():
+                    for view, real, imaginary, pixel_size in VIEWS:
+                        mandelbrot = Mandelbrot(
+                            color, real, imaginary, iterations, width,
+                            height, pixel_size * 256 / width, kernel)
+                        self.measure(
+                            "mandelbrot",
+                            {"view": view, "width": width, "height": height,
+                             "iterations": iterations, "kernel": kernel},
+                            lambda f=mandelbrot: computed(f),
+                            lambda f=mandelbrot: f.set_real(f.real))
+                    for view, c_r, c_i in JULIAS:
+                        julia = Julia(color, c_r, c_i, iterations=iterations,
+                                      width=width, height=height,
+                                      pixel_size=0.012 * 256 / width,
+                                      kernel=kernel)
+                        self.measure(
+                            "julia",
+                            {"view": view, "width": width, "height": height,
+                             "iterations": iterations, "kernel": kernel},
+                            lambda f=julia: computed(f),
+                            lambda f=julia: f.set_real(f.real))
+
+    def coloring(self) -> None:
+        """Coloring of escape counts and images at another size."""
+        color = ModuloColoration(3, 1, 10)
+        for (width, height) in self.sizes():
+            content = np.random.default_rng(0).integers(
+                0, 5000, (height, width), dtype=np.uint32)
+            out = color.colorize(content)
+            self.measure("colorize", {"width": width, "height": height},
+                         lambda c=content, o=out: color.colorize(c, o))
+        mandelbrot = Mandelbrot(color, -0.5, 0, 500, 256, 256, 0.012)
+        mandelbrot.image()
+        for (width, height) in self.sizes():
+            self.measure("image_at_size", {"width": width,
+                                           "height": height},
+                         lambda w=width, h=height:
+                         mandelbrot.image_at_size(w, h))
+
+    def manager(self) -> None:
+        """Swap of the fractals of the manager."""
+        for (width, height) in self.sizes():
+            manager = FractaleManager(width, height)
+            manager.images()
+
+            def swap(manager: FractaleManager = manager) -> None:
+                manager.swap()
+                manager.images()
+
+            self.measure("swap", {"width": width, "height": height}, swap)
+
+    def export(self) -> None:
+        """Short zoom exports."""
+        mandelbrot = Mandelbrot(ModuloColoration(), -0.743643, 0.131825,
+                                500, 160, 120)
+        mandelbrot.set_pixel_size(1e-4)
+        with TemporaryDirectory() as directory:
+            for ext in ("gif", "mp4"):
+                data: DataExport = {
+                    "path": os.path.join(directory, f"zoom.{ext}"),
+                    "ext": ext, "width": 160, "height": 120,
+                    "compression": 95, "fps": 10, "speed": 50,
+                    "workers": 1}
+
+                def drop(data: DataExport = data) -> None:
+                    with redirect_stdout(StringIO()):
+                        mandelbrot.drop(data)
+
+                self.measure("drop", {"ext": ext, "width": 160,
+                                      "height": 120, "workers": 1}, drop)
+
+
+def computed(fractale: Fractale) -> int:
+    """Compute a fractal, return its iterations."""
+    fractale.image()
+    assert fractale.metrics is not None
+    return fractale.metrics.iterations
+
+
+def format_params(params: Dict[str, Any]) -> str:
+    """Short text of the parameters of a benchmark."""
+    return " ".join(f"{key}={value}" for key, value in params.items())
+
+
+def environment(threads: Optional[int]) -> Dict[str, Any]:
+    """Describe the version and the machine of the results."""
+    return {
+        "version": __version__,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "threads": threads,
+        "batch_target": BATCH_TARGET,
+    }
+
+
+def compare(previous: Sequence[Result], results: Sequence[Result]) -> None:
+    """Display the speedup of each result over the same previous one."""
+    times = {(result["name"], format_params(result["params"])): result["min"]
+             for result in previous}
+    for result in results:
+        key = (result["name"], format_params(result["params"]))
+        if key in times:
+            print(f"{key[0]:<14} {key[1]:<60} "
+                  f"{times[key] / result['min']:>10.2f}x")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite and write its results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", default="benchmark.json",
+                        help="JSON file of the results")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-t", "--threads", type=int,
+                        help="OpenMP threads, all the cores by default")
+    parser.add_argument("-q", "--quick", action="store_true",
+                        help="smallest size and budget only")
+    parser.add_argument("-k", "--only", nargs="*", choices=GROUPS,
+                        help="groups of benchmarks to run")
+    parser.add_argument("-c", "--compare",
+                        help="JSON file of previous results to compare")
+    args = parser.parse_args(argv)
+    if args.threads is not None:
+        set_threads(args.threads)
+    suite = Suite(args.repeat, args.quick)
+    for group in args.only or GROUPS:
+        getattr(suite, group)()
+    report = {"environment": environment(args.threads),
+              "results": suite.results}
+    with open(args.output, "w", encoding="utf8") as file:
+        json.dump(report, file, indent=2)
+    print(f"{len(suite.results)} results written in {args.output}")
+    if args.compare is not None:
+        with open(args.compare, "r", encoding="utf8") as file:
+            compare(json.load(file)["results"], suite.results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
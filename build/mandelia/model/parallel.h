@@ -0,0 +1,34 @@
+/*
+ * Schedule of the parallel loops chosen at runtime.
+ *
+ * omp_set_schedule() only exists since OpenMP 3.0, MSVC implements
+ * OpenMP 2.0. Without it the loops use the guided schedule and the
+ * schedule of the fractals is ignored.
+ */
+#ifndef MANDELIA_PARALLEL_H
+#define MANDELIA_PARALLEL_H
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#if defined(_OPENMP) && _OPENMP >= 200805
+#define RUNTIME_SCHEDULE 1
+#else
+#define RUNTIME_SCHEDULE 0
+#endif
+
+/*
+ * Schedule of the next runtime loops of the calling thread, kind is 1
+ * for static, 2 for dynamic and 3 for guided like omp_sched_t.
+ */
+static void set_runtime_schedule(int kind, int chunk) {
+#if RUNTIME_SCHEDULE
+    omp_set_schedule((omp_sched_t)kind, chunk);
+#else
+    (void)kind;
+    (void)chunk;
+#endif
+}
+
+#endif
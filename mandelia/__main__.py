@@ -1,11 +1,17 @@
 """File call when module is called as script."""
+# pylint: disable=import-outside-toplevel
 import sys
-
-from .controller.controller import Controller
+from multiprocessing import freeze_support
 
 
 def main() -> None:
-    """Run Controller from sys.argv."""
+    """Run Controller from sys.argv, or the headless render command."""
+    # the workers of the exports run this entry point in a frozen exe
+    freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        from .batch import main as render  # no tkinter needed
+        sys.exit(render(sys.argv[2:]))
+    from .controller.controller import Controller
     if len(sys.argv) == 1:
         Controller()
     elif len(sys.argv) == 2:
@@ -0,0 +1,273 @@
+"""Headless rendering of fractals, without tkinter."""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, cast
+
+from .model.fractale import Julia, parse_schedule
+from .model.manager import DataExport, FractaleManager
+
+if sys.version_info >= (3, 8):
+    from typing import TypedDict
+else:
+    from typing_extensions import TypedDict
+
+
+class Job(TypedDict, total=False):
+    """Describe a rendering job, its output and its settings."""
+    output: str
+    config: Optional[str]
+    real: Optional[float]
+    imaginary: Optional[float]
+    pixel_size: Optional[float]
+    iterations: Optional[int]
+    adaptive: bool
+    julia: Optional[Tuple[float, float]]
+    width: int
+    height: int
+    compression: int
+    fps: int
+    speed: int
+    quality: Optional[float]
+    tiled: bool
+    threads: Optional[int]
+    schedule: Optional[str]
+
+
+DEFAULTS: Job = {
+    "config": None,
+    "real": None,
+    "imaginary": None,
+    "pixel_size": None,
+    "iterations": None,
+    "adaptive": False,
+    "julia": None,
+    "width": 1920,
+    "height": 1080,
+    "compression": 95,
+    "fps": 30,
+    "speed": 10,
+    "quality": None,
+    "tiled": False,
+    "threads": None,
+    "schedule": None,
+}
+
+
+class JobResult(NamedTuple):
+    """Outcome of a rendering job."""
+    output: str
+    seconds: float
+    error: Optional[str] = None
+
+
+def build_manager(job: Job) -> FractaleManager:
+    """Return a manager set up as described by the job."""
+    manager = FractaleManager(job["width"], job["height"])
+    if job["config"] is not None:
+        manager.load(job["config"])
+    if job["julia"] is not None:
+        if manager.is_mandelbrot_first():
+            manager.swap()
+        julia = manager.first
+        assert isinstance(julia, Julia)
+        c_r, c_i = job["julia"]
+        julia.set_c_r(c_r)
+        julia.set_c_i(c_i)
+    fractale = manager.first
+    if job["real"] is not None:
+        fractale.set_real(job["real"])
+    if job["imaginary"] is not None:
+        fractale.set_imaginary(job["imaginary"])
+    if job["pixel_size"] is not None:
+        fractale.set_pixel_size(job["pixel_size"])
+    if job["iterations"] is not None:
+        manager.iterations = job["iterations"]
+    if job["adaptive"]:
+        manager.adaptive = True
+    if job["threads"] is not None:
+        manager.threads = job["threads"]
+    if job["schedule"] is not None:
+        manager.set_schedule(*parse_schedule(job["schedule"]))
+    return manager
+
+
+def render_job(job: Job, workers: Optional[int] = None) -> JobResult:
+    """
+    Render a job, errors are reported in the result. Frames of videos
+    are rendered on workers processes, all cores by default.
+    """
+    output = job["output"]
+    start = perf_counter()
+    try:
+        data: DataExport = {
+            "path": output,
+            "ext": output.lower().rsplit(".", 1)[-1],
+            "width": job["width"],
+            "height": job["height"],
+            "compression": job["compression"],
+            "fps": job["fps"],
+            "speed": job["speed"],
+        }
+        if workers is not None:
+            data["workers"] = workers
+        if job["quality"] is not None:
+            data["quality"] = job["quality"]
+        if job["tiled"]:
+            data["tiled"] = True
+        build_manager(job).drop(data)
+    except Exception as err:  # pylint: disable=broad-except
+        return JobResult(output, perf_counter() - start,
+                         f"{type(err).__name__}: {err}")
+    return JobResult(output, perf_counter() - start)
+
+
+def run_jobs(jobs: Sequence[Job],
+             workers: Optional[int] = None) -> List[JobResult]:
+    """
+    Render jobs on a pool of processes, in the current process when
+    there is only one worker or one job. Results are in the order of
+    completion.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results: List[JobResult] = []
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            results.append(render_job(job, workers))
+            report(results[-1])
+        return results
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        # jobs already use every core, their frames are not split more
+        futures = [pool.submit(render_job, job, 1) for job in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+            report(results[-1])
+    return results
+
+
+def report(result: JobResult) -> None:
+    """Display the timing of a job."""
+    if result.error is None:
+        print(f"{result.output} : {result.seconds:.2f}s")
+    else:
+        print(f"{result.output} : échec après {result.seconds:.2f}s "
+              f"({result.error})", file=sys.stderr)
+
+
+def load_manifest(path: str, defaults: Job) -> List[Job]:
+    """
+    Load jobs from a JSON manifest, a list of jobs or an object with a
+    "jobs" list. Relative paths are relative to the manifest.
+    """
+    with open(path, "r", encoding="utf8") as file:
+        manifest = cast(object, json.load(file))
+    if isinstance(manifest, dict):
+        manifest = cast(Dict[str, object], manifest).get("jobs")
+    if not isinstance(manifest, list):
+        raise ValueError(f"Le manifeste {path!r} doit contenir "
+                         "une liste de rendus")
+    directory = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for item in cast(List[object], manifest):
+        if not isinstance(item, dict):
+            raise ValueError(f"Le manifeste {path!r} doit contenir "
+                             "une liste de rendus")
+        entry = cast(Dict[str, object], item)
+        unknown = set(entry) - set(DEFAULTS) - {"output"}
+        if unknown:
+            raise ValueError(f"Clés inconnues dans le manifeste : "
+                             f"{', '.join(sorted(unknown))}")
+        if "output" not in entry:
+            raise ValueError("Chaque rendu du manifeste doit avoir "
+                             "une sortie \"output\"")
+        job = cast(Job, {**defaults, **entry})
+        config = entry.get("config")
+        if config is not None:
+            job["config"] = os.path.join(directory, str(config))
+        job["output"] = os.path.join(directory, str(entry["output"]))
+        jobs.append(job)
+    return jobs
+
+
+def parser() -> argparse.ArgumentParser:
+    """Return the parser of the render command."""
+    parser_ = argparse.ArgumentParser(
+        prog="mandelia render",
+        description="Rendu de fractales en PNG, GIF ou MP4 "
+                    "sans interface graphique.")
+    parser_.add_argument("config", nargs="?",
+                         help="configuration .mbc à charger")
+    parser_.add_argument("-o", "--output",
+                         help="fichier de sortie (.png, .gif, .mp4)")
+    parser_.add_argument("-m", "--manifest",
+                         help="manifeste JSON de plusieurs rendus")
+    parser_.add_argument("-j", "--workers", type=int,
+                         help="nombre de processus, tous les coeurs "
+                              "par défaut")
+    parser_.add_argument("--real", type=float, help="partie réelle")
+    parser_.add_argument("--imaginary", type=float,
+                         help="partie imaginaire")
+    parser_.add_argument("--pixel-size", type=float,
+                         help="taille d'un pixel")
+    parser_.add_argument("--iterations", type=int,
+                         help="nombre maximum d'itérations")
+    parser_.add_argument("--adaptive", action="store_true",
+                         help="estimer les itérations nécessaires à chaque "
+                              "rendu, au plus --iterations")
+    parser_.add_argument("--julia", type=float, nargs=2,
+                         metavar=("C_R", "C_I"),
+                         help="rendre l'ensemble de Julia de C")
+    parser_.add_argument("--width", type=int, default=DEFAULTS["width"])
+    parser_.add_argument("--height", type=int, default=DEFAULTS["height"])
+    parser_.add_argument("--compression", type=int,
+                         default=DEFAULTS["compression"],
+                         help="qualité des images")
+    parser_.add_argument("--fps", type=int, default=DEFAULTS["fps"],
+                         help="images par seconde des vidéos")
+    parser_.add_argument("--speed", type=int, default=DEFAULTS["speed"],
+                         help="vitesse du zoom des vidéos")
+    parser_.add_argument("--quality", type=float,
+                         help="qualité dans ]0, 1] des images clés des "
+                              "vidéos, chaque image est calculée sinon")
+    parser_.add_argument("--tiled", action="store_true",
+                         help="rendu PNG par tuiles en mémoire bornée, "
+                              "automatique au delà de 32767 pixels")
+    parser_.add_argument("--threads", type=int,
+                         help="threads du calcul de chaque rendu, tous par "
+                              "défaut ou MANDELIA_THREADS")
+    parser_.add_argument("--schedule",
+                         help="répartition des blocs de pixels entre les "
+                              "threads, static, dynamic ou guided suivi "
+                              "d'une taille de lot optionnelle comme "
+                              "dynamic,4, guided par défaut ou "
+                              "MANDELIA_SCHEDULE")
+    return parser_
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the render command, return the exit status."""
+    parser_ = parser()
+    args = cast(Dict[str, object], vars(parser_.parse_args(argv)))
+    defaults = cast(Job, {key: args[key] for key in DEFAULTS})
+    manifest = cast(Optional[str], args["manifest"])
+    output = cast(Optional[str], args["output"])
+    if manifest is not None:
+        try:
+            jobs = load_manifest(manifest, defaults)
+        except (OSError, ValueError) as err:
+            parser_.error(str(err))
+    elif output is not None:
+        jobs = [defaults]
+        jobs[0]["output"] = output
+    else:
+        parser_.error("une sortie --output ou un --manifest est requis")
+    start = perf_counter()
+    results = run_jobs(jobs, cast(Optional[int], args["workers"]))
+    failed = sum(result.error is not None for result in results)
+    print(f"{len(results) - failed}/{len(results)} rendus "
+          f"en {perf_counter() - start:.2f}s")
+    return 1 if failed else 0
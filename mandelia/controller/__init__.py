@@ -1,4 +1,8 @@
 """Controller module."""
 from .controller import Controller
+from .preview import AtlasBuilder, JuliaPreview, PreviewQuality
+from .render import ProgressiveRender
+from .schedule import RenderScheduler
 
-__all__ = ['Controller']
+__all__ = ['AtlasBuilder', 'Controller', 'JuliaPreview', 'PreviewQuality',
+           'ProgressiveRender', 'RenderScheduler']
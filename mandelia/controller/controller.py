@@ -5,14 +5,20 @@ from random import randint
 from tkinter.filedialog import askopenfilename, asksaveasfilename
 from tkinter.messagebox import showerror, showinfo
 from traceback import print_exc
-from typing import Generator, Optional
+from typing import FrozenSet, Generator, Optional, Tuple
 
 from PIL import Image
 
+from ..model import JuliaAtlas
 from ..model.manager import DataExport, FractaleManager
-from ..util import logger, stat_file
+from ..trace import tracer
+from ..util import stat_file
 from ..view.view import View
 from ..view.wait import Wait
+from .preview import AtlasBuilder, JuliaPreview
+from .render import ProgressiveRender
+from .schedule import (COLOR, GEOMETRY, ITERATIONS, POSITION,
+                       RenderScheduler)
 
 
 class Controller:
@@ -24,8 +30,15 @@ class Controller:
             view = self.view = View()
             view.update()
             self.manager = FractaleManager(view.width, view.height)
+            self.manager.resumable = True
             self.__ignore_update = False
             self.__wait: Optional[Wait] = None
+            self.render = ProgressiveRender(view, self.on_render)
+            self.preview = JuliaPreview(view, self.manager,
+                                        view.set_2nd_image)
+            self.atlas = AtlasBuilder(self.manager)
+            self.scheduler = RenderScheduler(view, self.on_invalidate)
+            self.__size: Tuple[int, int] = (view.width, view.height)
 
             interaction = view.interaction
             interaction.action.actualization.config(
@@ -38,6 +51,10 @@ class Controller:
             interaction.iteration.max.var.trace_add(
                 "write", self.on_iteration_max
             )
+            interaction.iteration.adaptive.var.trace_add(
+                "write", self.on_adaptive
+            )
+            interaction.action.atlas.var.trace_add("write", self.on_atlas)
 
             view.visualization.bind("<MouseWheel>", self.on_wheel)
             view.visualization.bind("<Button-4>", self.on_right_click)
@@ -60,17 +77,17 @@ class Controller:
         name = self.__class__.__name__
         return f"<{name} locked_update={self.locked_update}>"
 
-    @logger
+    @tracer.traced()
     def on_swap(self, event):
         # type: (tk.Event[tk.Canvas]) -> None
         """Handle swap between julia and mandelbrot."""
+        self.render.cancel()
+        self.preview.cancel()
         self.manager.swap()
-        img1, img2 = self.manager.images()
-        self.view.set_image(img1)
-        self.view.set_2nd_image(img2)
+        self.view.set_2nd_image(self.manager.second.image_view())
         self.update()
 
-    @logger
+    @tracer.traced()
     def on_export(self, data: DataExport) -> None:
         """Handle export."""
         if self.__wait is not None:
@@ -93,6 +110,7 @@ class Controller:
             def handler_progress(progress: float, image: Image.Image) -> None:
                 pass
 
+        self.render.cancel()
         try:
             self.manager.drop(data, handler_progress)
             showinfo("Exporter", "Exportation réussi\n" + stat_file(path))
@@ -105,13 +123,12 @@ class Controller:
     def on_motion(self, event):
         # type: (tk.Event[tk.Canvas]) -> None
         """Handle mouse movement."""
-        self.manager.motion(event.x, event.y)
         if self.manager.is_mandelbrot_first():
-            img = self.manager.second.image()
-            self.view.set_2nd_image(img)
+            self.preview.move(event.x, event.y)
 
     def load_configuration(self, path: str) -> None:
         """Load configuration with displayable error."""
+        self.render.cancel()
         self.manager.load(path)
         self.update()
         self.update_colors()
@@ -128,7 +145,7 @@ class Controller:
         """Return if update is locked."""
         return self.__ignore_update
 
-    @logger
+    @tracer.traced()
     def on_load(self) -> None:
         """Handle load of configuration."""
         path = askopenfilename(
@@ -139,7 +156,7 @@ class Controller:
         if path:
             self.load_configuration(path)
 
-    @logger
+    @tracer.traced()
     def on_save(self) -> None:
         """Handle save of configuration."""
         path = asksaveasfilename(
@@ -175,19 +192,41 @@ class Controller:
         """Handle left click."""
         self.zoom(event.x, event.y, 0.5)
 
-    @logger
+    @tracer.traced()
     def zoom(self, x: int, y: int, power: float) -> None:
         """Zoom in actual fractale."""
+        self.render.cancel()
         self.manager.zoom(x, y, power)
-        self.update()
+        self.scheduler.invalidate(POSITION)
 
-    @logger
+    @tracer.traced()
     def on_iteration_max(self, name: str, index: str, mode: str) -> None:
         """Handle change of max iterations."""
+        if self.locked_update:
+            return
         iterations = int(self.view.interaction.iteration.max.var.get())
+        self.render.cancel()
         self.manager.iterations = iterations
+        self.scheduler.invalidate(ITERATIONS)
 
-    @logger
+    @tracer.traced()
+    def on_adaptive(self, name: str, index: str, mode: str) -> None:
+        """Handle switch of the estimation of the iterations."""
+        self.render.cancel()
+        adaptive = self.view.interaction.iteration.adaptive.var.get()
+        self.manager.adaptive = adaptive
+        self.update()
+
+    @tracer.traced()
+    def on_atlas(self, name: str, index: str, mode: str) -> None:
+        """Handle switch of the atlas of Julia sets."""
+        if self.view.interaction.action.atlas.var.get():
+            self.manager.atlas = JuliaAtlas()
+            self.atlas.start()
+        else:
+            self.manager.atlas = None
+
+    @tracer.traced()
     def on_color(self) -> None:
         """Handle color changes."""
         if self.locked_update:
@@ -197,10 +236,26 @@ class Controller:
             int(self.view.green.get()),
             int(self.view.blue.get())
         )
-        self.update_colors()
-        self.update()
+        self.scheduler.invalidate(COLOR)
+
+    @tracer.traced()
+    def on_invalidate(self, kinds: FrozenSet[str]) -> None:
+        """
+        Handle every change since the last frame at once, a change of
+        color alone only recolors the images already computed.
+        """
+        first = self.manager.first
+        resized = (GEOMETRY in kinds
+                   and self.__size != (first.width, first.height))
+        if resized:
+            self.render.cancel()
+            self.manager.resize(*self.__size)
+        if COLOR in kinds or resized:
+            self.update_colors()
+        if kinds - {COLOR}:
+            self.update()
 
-    @logger
+    @tracer.traced()
     def update(self) -> None:
         """Update images."""
         if self.locked_update:
@@ -213,47 +268,65 @@ class Controller:
             interaction.positioning.imaginary.var.set(str(manager.imaginary))
             interaction.positioning.zoom.var.set(str(manager.pixel_size))
             interaction.iteration.max.var.set(manager.iterations)
-            interaction.iteration.sum.var.set(f"{manager.iter_sum} i")
-            interaction.iteration.per_pixel.var.set(
-                f"{manager.iter_pixel:.2f} i/pxl")
-            img = manager.first.image()
-            self.view.set_image(img)
+        self.render.start(manager.first)
 
-    @logger
+    def on_render(self, image: Image.Image, final: bool) -> None:
+        """Handle an image of the progressive render."""
+        self.view.set_image(image)
+        if final:
+            manager = self.manager
+            interaction = self.view.interaction
+            with self.lock_update():
+                interaction.iteration.budget.var.set(f"{manager.budget} i")
+                interaction.iteration.sum.var.set(f"{manager.iter_sum} i")
+                interaction.iteration.per_pixel.var.set(
+                    f"{manager.iter_pixel:.2f} i/pxl")
+                interaction.iteration.per_second.var.set(
+                    f"{manager.iter_second / 1e6:.0f} Mi/s")
+            if manager.is_mandelbrot_first():
+                self.atlas.start()
+
+    @tracer.traced()
     def on_random_color(self) -> None:
         """Handle random color button pressed."""
         rgb = [randint(0, 6) + randint(0, 6) + randint(0, 4) for _ in range(3)]
         self.manager.color(*rgb)
-        self.update_colors()
-        self.update()
+        self.scheduler.invalidate(COLOR)
 
     def update_colors(self) -> None:
         """Update colors."""
-        with self.lock_update():
+        with self.lock_update(), tracer.span("colorize"):
             r, g, b = self.manager.rgb
             self.view.red.set(r)
             self.view.green.set(g)
             self.view.blue.set(b)
-            self.view.set_image(self.manager.first.image())
-            self.view.set_2nd_image(self.manager.second.image())
+            if not self.render.busy and not self.manager.first.need_update:
+                self.view.set_image(self.manager.first.image_view())
+            self.view.set_2nd_image(self.manager.second.image_view())
 
-    @logger
+    @tracer.traced()
     def on_resize(self, event):
         # type: (tk.Event[tk.Canvas]) -> None
-        """Handle window resize."""
-        self.manager.resize(event.width, event.height)
-        self.view.set_2nd_image(self.manager.second.image())
-        self.update()
+        """Handle window resize, computed once the resize ended."""
+        self.__size = (event.width, event.height)
+        first = self.manager.first
+        if (self.__size == (first.width, first.height)
+                and GEOMETRY not in self.scheduler.pending):
+            return
+        self.render.cancel()
+        self.scheduler.invalidate(GEOMETRY)
 
-    @logger
+    @tracer.traced()
     def on_actualization(self) -> None:
         """Handle actualization button."""
+        self.render.cancel()
         self.manager.resize(self.view.width, self.view.height)
         self.update()
 
-    @logger
+    @tracer.traced()
     def on_reset(self) -> None:
         """Handle reset button."""
+        self.render.cancel()
         self.manager.reset()
-        self.view.set_2nd_image(self.manager.second.image())
+        self.view.set_2nd_image(self.manager.second.image_view())
         self.update()
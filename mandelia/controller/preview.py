@@ -0,0 +1,188 @@
+"""Low latency preview of the secondary fractal while the mouse moves."""
+import tkinter as tk
+from copy import copy
+from threading import Lock, Thread
+from time import perf_counter
+from traceback import print_exc
+from typing import Callable, Optional, Tuple
+
+from PIL import Image
+
+from ..model import Fractale
+from ..model.manager import FractaleManager
+
+FRAME_BUDGET = 0.016  # seconds of compute of a preview
+REFINE_DELAY = 150  # milliseconds without motion before the full image
+MAX_SCALE = 8
+MIN_ITERATIONS = 50
+PreviewCallback = Callable[[Image.Image], None]
+
+
+class PreviewQuality:
+    """
+    Divider of the size and of the iterations of the previews, adapted
+    after each preview so that one takes about the frame budget.
+    """
+    def __init__(self, budget: float = FRAME_BUDGET) -> None:
+        """Instantiate PreviewQuality."""
+        self.budget = budget
+        self.scale = 2
+
+    def __repr__(self) -> str:
+        """Represent a PreviewQuality."""
+        name = self.__class__.__name__
+        return f"<{name} scale={self.scale} budget={self.budget}>"
+
+    def update(self, seconds: float) -> None:
+        """Adapt the scale to the duration of the last preview."""
+        if seconds > self.budget and self.scale < MAX_SCALE:
+            self.scale += 1
+        elif seconds < self.budget / 2 and self.scale > 1:
+            self.scale -= 1
+
+    def size(self, width: int, height: int) -> Tuple[int, int]:
+        """Size of the preview of an image."""
+        return max(1, width // self.scale), max(1, height // self.scale)
+
+    def iterations(self, iterations: int) -> int:
+        """Max iterations of the preview of an image."""
+        return min(iterations, max(MIN_ITERATIONS, iterations // self.scale))
+
+
+class JuliaPreview:
+    """
+    Show the Julia set under the mouse without lagging behind it.
+
+    Motions are coalesced: at most one preview is rendered per frame
+    budget, for the last position only. The preview is the thumbnail of
+    the atlas of the manager when it has one, otherwise it is rendered at
+    a lower size and budget on a copy of the secondary fractal. The full
+    image is rendered once the mouse stops.
+    """
+    def __init__(self, widget: tk.Misc, manager: FractaleManager,
+                 callback: PreviewCallback) -> None:
+        """Instantiate JuliaPreview."""
+        self.widget = widget
+        self.manager = manager
+        self.callback = callback
+        self.quality = PreviewQuality()
+        self.__fractale: Optional[Fractale] = None
+        self.__position: Optional[Tuple[int, int]] = None
+        self.__tick: Optional[str] = None
+        self.__refine: Optional[str] = None
+        self.__last = 0.0
+
+    def __repr__(self) -> str:
+        """Represent a JuliaPreview."""
+        name = self.__class__.__name__
+        return f"<{name} quality={self.quality!r}>"
+
+    def move(self, x: int, y: int) -> None:
+        """Ask for the preview of a position of the first fractal."""
+        self.__position = (x, y)
+        if self.__refine is not None:
+            self.widget.after_cancel(self.__refine)
+            self.__refine = None
+        if self.__tick is None:
+            wait = self.__last + self.quality.budget - perf_counter()
+            self.__tick = self.widget.after(max(0, int(wait * 1000)),
+                                            self.__render)
+
+    def cancel(self) -> None:
+        """Forget the pending preview and refinement."""
+        for pending in (self.__tick, self.__refine):
+            if pending is not None:
+                self.widget.after_cancel(pending)
+        self.__tick = None
+        self.__refine = None
+        self.__position = None
+
+    def preview(self) -> Image.Image:
+        """
+        Image of the secondary fractal at the preview quality, scaled to
+        its full size.
+        """
+        second = self.manager.second
+        width, height = self.quality.size(second.width, second.height)
+        fractale = self.__fractale
+        if fractale is None or type(fractale) is not type(second):
+            fractale = self.__fractale = copy(second)
+        if (fractale.width, fractale.height) != (width, height):
+            fractale.resize(width, height)
+        # also copies C and the coloration, the size of the copy is kept
+        fractale.from_bytes(second.to_bytes())
+        fractale.set_real(second.real)
+        fractale.set_imaginary(second.imaginary)
+        fractale.set_pixel_size(second.pixel_size * second.width / width)
+        fractale.set_iterations(self.quality.iterations(second.iterations))
+        return fractale.image_view().resize(
+            (second.width, second.height), Image.Resampling.NEAREST)
+
+    def __render(self) -> None:
+        """Render the preview of the last position."""
+        self.__tick = None
+        if self.__position is None or not self.manager.is_mandelbrot_first():
+            return
+        self.manager.motion(*self.__position)
+        self.__position = None
+        start = perf_counter()
+        thumbnail = self.manager.atlas_image()
+        if thumbnail is not None:
+            self.callback(thumbnail)
+            self.__last = perf_counter()
+        else:
+            self.callback(self.preview())
+            self.__last = perf_counter()
+            self.quality.update(self.__last - start)
+        self.__refine = self.widget.after(REFINE_DELAY, self.__full)
+
+    def __full(self) -> None:
+        """Render the full image of the secondary fractal."""
+        self.__refine = None
+        self.callback(self.manager.second.image_view())
+
+
+class AtlasBuilder:
+    """
+    Build the Julia atlas of a manager on a background thread. A build
+    asked during another one is done once the current one ends.
+    """
+    def __init__(self, manager: FractaleManager) -> None:
+        """Instantiate AtlasBuilder."""
+        self.manager = manager
+        self.__lock = Lock()
+        self.__thread: Optional[Thread] = None
+        self.__stale = False
+
+    def __repr__(self) -> str:
+        """Represent an AtlasBuilder."""
+        name = self.__class__.__name__
+        return f"<{name} busy={self.busy}>"
+
+    @property
+    def busy(self) -> bool:
+        """Return if a build is running."""
+        return self.__thread is not None
+
+    def start(self) -> None:
+        """Build the atlas for the current view of the manager."""
+        if self.manager.atlas is None:
+            return
+        with self.__lock:
+            self.__stale = True
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__run, daemon=True)
+                self.__thread.start()
+
+    def __run(self) -> None:
+        """Build until the atlas matches the last request, in the worker."""
+        while True:
+            with self.__lock:
+                if not self.__stale:
+                    self.__thread = None
+                    return
+                self.__stale = False
+            try:
+                self.manager.build_atlas()
+            except Exception:  # pylint: disable=broad-except
+                print_exc()
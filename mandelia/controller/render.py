@@ -0,0 +1,98 @@
+"""Progressive rendering of a fractal on a worker thread."""
+import tkinter as tk
+from queue import Empty, Queue
+from threading import Thread
+from traceback import print_exc
+from typing import Callable, Optional, Tuple
+
+from PIL import Image
+
+from ..model import Fractale
+from ..trace import tracer
+
+POLL_DELAY = 10
+RenderCallback = Callable[[Image.Image, bool], None]
+
+
+class ProgressiveRender:
+    """
+    Render a fractal from coarse to fine on a worker thread.
+
+    Images are handed to the callback on the Tk main loop as they arrive,
+    the boolean tells if the image is the final one.
+    """
+    def __init__(self, widget: tk.Misc, callback: RenderCallback) -> None:
+        """Instantiate ProgressiveRender."""
+        self.widget = widget
+        self.callback = callback
+        self.__thread: Optional[Thread] = None
+        self.__fractale: Optional[Fractale] = None
+        self.__queue: 'Queue[Tuple[Image.Image, bool]]' = Queue()
+        self.__polling: Optional[str] = None
+
+    def __repr__(self) -> str:
+        """Represent a ProgressiveRender."""
+        name = self.__class__.__name__
+        return f"<{name} busy={self.busy}>"
+
+    @property
+    def busy(self) -> bool:
+        """Return if a render is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self, fractale: Fractale) -> None:
+        """Cancel the current render and start a new one."""
+        self.cancel()
+        fractale.set_cancelled(False)
+        self.__fractale = fractale
+        self.__queue = Queue()
+        self.__thread = Thread(target=self.__run,
+                               args=(fractale, self.__queue), daemon=True)
+        self.__thread.start()
+        self.__polling = self.widget.after(POLL_DELAY, self.__poll)
+
+    def cancel(self) -> None:
+        """Cancel the current render and wait for the worker to stop."""
+        if self.__polling is not None:
+            self.widget.after_cancel(self.__polling)
+            self.__polling = None
+        if self.__fractale is not None:
+            self.__fractale.set_cancelled(True)
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        if self.__fractale is not None:
+            self.__fractale.set_cancelled(False)
+            self.__fractale = None
+
+    @staticmethod
+    def __run(fractale: Fractale,
+              queue: 'Queue[Tuple[Image.Image, bool]]') -> None:
+        """Compute images, executed by the worker."""
+        try:
+            with tracer.span("render"):
+                images = fractale.progressive()
+                previous = next(images, None)
+                for image in images:
+                    assert previous is not None
+                    queue.put((previous, False))
+                    previous = image
+            if previous is not None and not fractale.cancelled:
+                queue.put((previous, True))
+        except Exception:  # pylint: disable=broad-except
+            print_exc()
+
+    def __poll(self) -> None:
+        """Give available images to the callback, on the main loop."""
+        queue = self.__queue
+        alive = self.busy
+        try:
+            while True:
+                image, final = queue.get_nowait()
+                self.callback(image, final)
+        except Empty:
+            pass
+        if alive and queue is self.__queue:
+            self.__polling = self.widget.after(POLL_DELAY, self.__poll)
+        elif queue is self.__queue:
+            self.__polling = None
@@ -0,0 +1,76 @@
+"""Merge the invalidations of the view into one render per frame."""
+import tkinter as tk
+from typing import Callable, FrozenSet, Optional, Set
+
+GEOMETRY = "geometry"
+COLOR = "color"
+ITERATIONS = "iterations"
+POSITION = "position"
+RESIZE_DELAY = 200  # milliseconds without resize before the job
+Job = Callable[[FrozenSet[str]], None]
+
+
+class RenderScheduler:
+    """
+    Collect what changed in the view and run the job once for all of it
+    when Tk is idle. A change of geometry also waits for the end of the
+    resize, so that a drag of the window gives a single job.
+    """
+    def __init__(self, widget: tk.Misc, job: Job) -> None:
+        """Instantiate RenderScheduler."""
+        self.widget = widget
+        self.job = job
+        self.__pending: Set[str] = set()
+        self.__idle: Optional[str] = None
+        self.__delay: Optional[str] = None
+
+    def __repr__(self) -> str:
+        """Represent a RenderScheduler."""
+        name = self.__class__.__name__
+        return f"<{name} pending={sorted(self.__pending)}>"
+
+    @property
+    def pending(self) -> FrozenSet[str]:
+        """Return the invalidations waiting for the job."""
+        return frozenset(self.__pending)
+
+    def invalidate(self, *kinds: str) -> None:
+        """Ask for a job covering kinds of changes."""
+        self.__pending.update(kinds)
+        if GEOMETRY in kinds:
+            self.__cancel_timers()
+            self.__delay = self.widget.after(RESIZE_DELAY, self.__settled)
+        elif self.__idle is None and self.__delay is None:
+            self.__idle = self.widget.after_idle(self.__run)
+
+    def cancel(self) -> None:
+        """Forget the pending invalidations."""
+        self.__cancel_timers()
+        self.__pending.clear()
+
+    def flush(self) -> None:
+        """Run the pending job now."""
+        self.__cancel_timers()
+        self.__run()
+
+    def __cancel_timers(self) -> None:
+        """Cancel the scheduled job."""
+        for pending in (self.__idle, self.__delay):
+            if pending is not None:
+                self.widget.after_cancel(pending)
+        self.__idle = None
+        self.__delay = None
+
+    def __settled(self) -> None:
+        """Schedule the job once the resize ended."""
+        self.__delay = None
+        self.__idle = self.widget.after_idle(self.__run)
+
+    def __run(self) -> None:
+        """Run the job with every pending invalidation."""
+        self.__idle = None
+        if not self.__pending:
+            return
+        kinds = frozenset(self.__pending)
+        self.__pending.clear()
+        self.job(kinds)
@@ -1,8 +1,18 @@
 """Model module."""
-from .fractale import Fractale, Julia, Mandelbrot, ModuloColoration
+from .atlas import JuliaAtlas
+from .cache import TileCache
+from .fractale import (KERNELS, METHODS, Coloration, DeepMandelbrot,
+                       Fractale, GradientColoration, HistogramColoration,
+                       Julia, Mandelbrot, ModuloColoration)
+from .gif import GifWriter
+from .png import PngWriter
 from .manager import DataExport, FractaleManager
+from .metrics import RenderMetrics
 
 __all__ = [
-    "ModuloColoration", "Fractale", "Julia",
-    "Mandelbrot", "FractaleManager", "DataExport"
+    "Coloration", "ModuloColoration", "GradientColoration",
+    "HistogramColoration", "Fractale", "Julia",
+    "Mandelbrot", "DeepMandelbrot", "FractaleManager", "DataExport",
+    "KERNELS", "METHODS", "TileCache", "GifWriter",
+    "PngWriter", "RenderMetrics", "JuliaAtlas"
 ]
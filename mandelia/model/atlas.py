@@ -0,0 +1,122 @@
+"""Thumbnails of Julia sets over a region of the Mandelbrot set."""
+import sys
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .fractale import Fractale, Julia, julia_thumbnails
+
+if sys.version_info >= (3, 10):
+    from typing import TypeAlias
+else:
+    from typing_extensions import TypeAlias
+
+ATLAS_COLUMNS = 16
+THUMBNAIL_WIDTH = 64
+ATLAS_ITERATIONS = 500
+
+Counts: TypeAlias = "npt.NDArray[np.uint32]"
+Grid: TypeAlias = "npt.NDArray[np.float64]"
+# real, imaginary, pixel size, width, height, iterations, kernel
+View = Tuple[float, float, float, int, int, int, str]
+
+
+class AtlasGrid(NamedTuple):
+    """
+    Grid of C of an atlas, from the C of the first cell with a step
+    between cells, and the view of the Julia sets of its thumbnails.
+    """
+    real: float
+    imaginary: float
+    step_real: float
+    step_imaginary: float
+    view: View
+    counts: Counts  # (rows, columns, height, width)
+
+
+class JuliaAtlas:
+    """
+    Escape counts of small Julia sets on a grid of C over the region
+    shown by the Mandelbrot set, the thumbnail of the nearest C stands in
+    for any Julia set of the region until its own image is computed.
+
+    The atlas is built on a background thread while the main thread reads
+    it, a build replaces the grid at once.
+    """
+    def __init__(self, columns: int = ATLAS_COLUMNS,
+                 thumbnail_width: int = THUMBNAIL_WIDTH,
+                 max_iterations: int = ATLAS_ITERATIONS) -> None:
+        """Instantiate JuliaAtlas."""
+        self.columns = columns
+        self.thumbnail_width = thumbnail_width
+        self.max_iterations = max_iterations
+        self.__grid: Optional[AtlasGrid] = None
+
+    def __repr__(self) -> str:
+        """Represent a JuliaAtlas."""
+        name = self.__class__.__name__
+        return f"<{name} columns={self.columns} ready={self.ready}>"
+
+    @property
+    def ready(self) -> bool:
+        """Return if the atlas has thumbnails."""
+        return self.__grid is not None
+
+    def clear(self) -> None:
+        """Forget the thumbnails."""
+        self.__grid = None
+
+    def build(self, mandelbrot: Fractale, julia: Julia,
+              threads: int = 0) -> None:
+        """
+        Compute the thumbnails of the region shown by mandelbrot, each
+        one is the view of julia at a smaller size.
+        """
+        view = self.view(julia)
+        width, height = mandelbrot.width, mandelbrot.height
+        if min(width, height, julia.width, julia.height) <= 0:
+            return
+        rows = max(1, round(self.columns * height / width))
+        step_real = width * mandelbrot.pixel_size / self.columns
+        step_imaginary = height * mandelbrot.pixel_size / rows
+        real = mandelbrot.real_at_x(0) + step_real / 2
+        imaginary = mandelbrot.imaginary_at_y(0) + step_imaginary / 2
+        cell_rows: Grid = np.arange(rows, dtype=float)
+        cell_columns: Grid = np.arange(self.columns, dtype=float)
+        c_i, c_r = np.meshgrid(imaginary + cell_rows * step_imaginary,
+                               real + cell_columns * step_real, indexing="ij")
+        thumbnail_height = max(
+            1, round(self.thumbnail_width * julia.height / julia.width))
+        counts = julia_thumbnails(
+            np.ascontiguousarray(c_r.ravel()),
+            np.ascontiguousarray(c_i.ravel()), julia.real, julia.imaginary,
+            julia.pixel_size * julia.width / self.thumbnail_width,
+            self.thumbnail_width, thumbnail_height,
+            min(julia.iterations, self.max_iterations), julia.kernel,
+            threads)
+        self.__grid = AtlasGrid(
+            real, imaginary, step_real, step_imaginary, view,
+            counts.reshape(rows, self.columns, thumbnail_height,
+                           self.thumbnail_width))
+
+    @staticmethod
+    def view(julia: Julia) -> View:
+        """Settings of a Julia set shared by the thumbnails."""
+        return (julia.real, julia.imaginary, julia.pixel_size, julia.width,
+                julia.height, julia.iterations, julia.kernel)
+
+    def nearest(self, julia: Julia) -> Optional[Counts]:
+        """
+        Escape counts of the thumbnail nearest to the C of julia, None
+        when C is out of the region or the view of julia changed.
+        """
+        grid = self.__grid
+        if grid is None or grid.view != self.view(julia):
+            return None
+        rows, columns = len(grid.counts), self.columns
+        column = round((julia.c_r - grid.real) / grid.step_real)
+        row = round((julia.c_i - grid.imaginary) / grid.step_imaginary)
+        if not (0 <= row < rows and 0 <= column < columns):
+            return None
+        return grid.counts[row, column, :, :]
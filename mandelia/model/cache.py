@@ -0,0 +1,119 @@
+"""Cache of iteration tiles with LRU eviction."""
+import os
+import sys
+from collections import OrderedDict
+from threading import RLock
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+if sys.version_info >= (3, 10):
+    from typing import TypeAlias
+else:
+    from typing_extensions import TypeAlias
+
+Shape = Tuple[int, int]
+Tile: TypeAlias = "npt.NDArray[np.uint32]"
+Spilled: TypeAlias = "np.memmap[Shape, np.dtype[np.uint32]]"
+
+
+class TileCache:
+    """
+    Bounded LRU cache of iteration tiles.
+
+    When a directory is given, tiles evicted from memory are spilled to
+    disk through np.memmap instead of being dropped. The cache can be
+    shared by fractals rendered on different threads.
+    """
+    def __init__(self, max_tiles: int = 512,
+                 directory: Optional[str] = None,
+                 max_disk_tiles: int = 8192) -> None:
+        """Instantiate TileCache."""
+        self.max_tiles = max_tiles
+        self.max_disk_tiles = max_disk_tiles
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.__memory: 'OrderedDict[Hashable, Tile]' = OrderedDict()
+        self.__disk: 'OrderedDict[Hashable, Tuple[str, Shape]]' = (
+            OrderedDict())
+        self.__counter = 0
+        self.__lock = RLock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self) -> str:
+        """Represent a TileCache."""
+        name = self.__class__.__name__
+        return (f"<{name} tiles={len(self.__memory)} "
+                f"disk_tiles={len(self.__disk)} "
+                f"hits={self.hits} misses={self.misses}>")
+
+    def __len__(self) -> int:
+        """Number of tiles in memory and on disk."""
+        return len(self.__memory) + len(self.__disk)
+
+    def get(self, key: Hashable) -> Optional[Tile]:
+        """Return the tile of the key or None, update counters."""
+        with self.__lock:
+            tile = self.__memory.get(key)
+            if tile is not None:
+                self.__memory.move_to_end(key)
+                self.hits += 1
+                return tile
+            spilled = self.__disk.pop(key, None)
+            if spilled is not None:
+                path, shape = spilled
+                mapped: Spilled = np.memmap(path, dtype="uint32", mode="r",
+                                            shape=shape)
+                tile = np.array(mapped)
+                del mapped
+                os.remove(path)
+                self.put(key, tile)
+                self.hits += 1
+                return tile
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, tile: Tile) -> None:
+        """Insert a tile and evict the least recently used ones."""
+        with self.__lock:
+            self.__memory[key] = tile
+            self.__memory.move_to_end(key)
+            while len(self.__memory) > self.max_tiles:
+                old_key, old_tile = self.__memory.popitem(last=False)
+                if self.directory is not None:
+                    self.__spill(old_key, old_tile)
+
+    def __spill(self, key: Hashable, tile: Tile) -> None:
+        """Write a tile on disk."""
+        assert self.directory is not None
+        self.__counter += 1
+        path = os.path.join(self.directory, f"tile-{self.__counter}.bin")
+        shape: Shape = tile.shape
+        spilled: Spilled = np.memmap(path, dtype="uint32", mode="w+",
+                                     shape=shape)
+        spilled[:] = tile
+        spilled.flush()
+        del spilled
+        self.__disk[key] = (path, shape)
+        while len(self.__disk) > self.max_disk_tiles:
+            _, (old_path, _) = self.__disk.popitem(last=False)
+            os.remove(old_path)
+
+    def clear(self) -> None:
+        """Remove all tiles and reset counters."""
+        with self.__lock:
+            self.__memory.clear()
+            for path, _ in self.__disk.values():
+                os.remove(path)
+            self.__disk.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of hits on all lookups."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
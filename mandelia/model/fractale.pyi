@@ -1,13 +1,51 @@
 # pylint: disable=unused-argument, disable=super-init-not-called, no-self-use
-from typing import Optional
+from decimal import Decimal
+from typing import (Deque, Iterator, List, Optional, Sequence, Tuple, Type,
+                    Union)
 
 import numpy as np
 import numpy.typing as npt
 from PIL import Image
 
+from ..model.cache import TileCache
 from ..model.manager import DataExport, ProgressHandler
+from ..model.metrics import RenderMetrics
 
-class ModuloColoration:
+KERNELS: Tuple[str, ...]
+SCHEDULES: Tuple[str, ...]
+DEFAULT_THREADS: int
+DEFAULT_SCHEDULE: Tuple[str, int]
+BATCH_TARGET: str
+METHODS: Tuple[str, ...]
+
+class Coloration:
+
+    def to_bytes(self) -> bytes:
+        ...
+
+    def from_bytes(self, data: bytes) -> None:
+        ...
+
+    def bytes_size(self) -> int:
+        ...
+
+    def palette(self) -> Optional[npt.NDArray[np.uint8]]:
+        ...
+
+    def indexes(
+        self, np_fractale: npt.NDArray[np.uint32]
+    ) -> npt.NDArray[np.uint8]:
+        ...
+
+    def colorize(
+        self, np_fractale: npt.NDArray[np.uint32],
+        out: Optional[npt.NDArray[np.uint8]] = None,
+        smooth: Optional[npt.NDArray[np.float32]] = None
+    ) -> npt.NDArray[np.uint8]:
+        ...
+
+
+class ModuloColoration(Coloration):
     r: int
     g: int
     b: int
@@ -15,21 +53,103 @@ class ModuloColoration:
     def __init__(self, r: int, g: int, b: int):
         ...
 
-    def to_bytes(self) -> bytes:
+    def palette(self) -> npt.NDArray[np.uint8]:
         ...
 
-    def from_bytes(self, data: bytes) -> None:
+
+GRADIENT_STOPS: Tuple[Tuple[int, int, int], ...]
+
+
+class GradientColoration(Coloration):
+    period: float
+    stops: Tuple[Tuple[int, int, int], ...]
+
+    def __init__(
+        self, period: float = 32.0,
+        stops: Sequence[Sequence[int]] = GRADIENT_STOPS
+    ) -> None:
         ...
 
-    def bytes_size(self) -> int:
+    def set_stops(self, stops: Sequence[Sequence[int]]) -> None:
         ...
 
-    def colorize(
+    def lut(self) -> npt.NDArray[np.uint8]:
+        ...
+
+
+class HistogramColoration(GradientColoration):
+
+    def __init__(
+        self, period: float = 1.0,
+        stops: Sequence[Sequence[int]] = GRADIENT_STOPS
+    ) -> None:
+        ...
+
+    def set_counts(self, counts: Optional[npt.NDArray[np.uint64]]) -> None:
+        ...
+
+    def histogram(
         self, np_fractale: npt.NDArray[np.uint32]
-    ) -> npt.NDArray[np.uint8]:
+    ) -> npt.NDArray[np.uint64]:
         ...
 
 
+FRAMES_PER_WORKER: int
+KEYFRAME_RATIO: int
+KEYFRAME_MARGIN: int
+EXPORT_TILE: int
+EXPORT_ROWS: int
+SHORT_MAX: int
+Counts = Tuple[npt.NDArray[np.uint32], Optional[npt.NDArray[np.float32]]]
+FrameSettings = Tuple[Type['Fractale'], Type[Coloration], str, str, bool]
+
+
+def set_threads(threads: int) -> None:
+    ...
+
+
+def parse_schedule(text: str) -> Tuple[str, int]:
+    ...
+
+
+def render_state(
+    settings: FrameSettings, data: bytes, indexed: bool = False,
+    counts: bool = False
+) -> Union[npt.NDArray[np.uint8], Counts]:
+    ...
+
+
+def rgba_buffer(height: int, width: int) -> npt.NDArray[np.uint8]:
+    ...
+
+
+def rgba_image(buffer: npt.NDArray[np.uint8]) -> Image.Image:
+    ...
+
+
+def keyframe_plan(states: Sequence[bytes],
+                  quality: float) -> List[Tuple[bytes, List[bytes]]]:
+    ...
+
+
+def resample_indexes(size: int, pixel_size: float, key_size: int,
+                     key_pixel_size: float) -> npt.NDArray[np.intp]:
+    ...
+
+
+def julia_thumbnails(c_r: npt.NDArray[np.float64],
+                     c_i: npt.NDArray[np.float64], real: float,
+                     imaginary: float, pixel_size: float, width: int,
+                     height: int, iterations: int, kernel: str = "scalar",
+                     threads: int = 0) -> npt.NDArray[np.uint32]:
+    ...
+
+
+def frame_image(frame: npt.NDArray[np.uint8],
+                palette: Optional[npt.NDArray[np.uint8]]) -> Image.Image:
+    ...
+
+
 class Fractale:
     real: float
     imaginary: float
@@ -37,12 +157,32 @@ class Fractale:
     width: int
     height: int
     iterations: int
+    budget: int
+    adaptive: bool
+    resumable: bool
+    symmetry: bool
     need_update: bool
-
-    def __init__(self, color: ModuloColoration, real: float = 0,
+    content: npt.NDArray[np.uint32]
+    kernel: str
+    method: str
+    computed_pixels: int
+    computed_iterations: int
+    incremental: bool
+    cache: Optional[TileCache]
+    cancelled: bool
+    smoothing: bool
+    smooth: Optional[npt.NDArray[np.float32]]
+    metrics: Optional[RenderMetrics]
+    history: Deque[RenderMetrics]
+    threads: int
+    schedule: str
+    chunk: int
+
+    def __init__(self, color: Coloration, real: float = 0,
                  imaginary: float = 0, iterations: int = 1_000,
-                 width: int = 128, height: int = 128, pixel_size: float = 0.02
-                 ) -> None:
+                 width: int = 128, height: int = 128,
+                 pixel_size: float = 0.02, kernel: str = "scalar",
+                 method: str = "pixel") -> None:
         ...
 
     def __str__(self) -> str:
@@ -60,9 +200,45 @@ class Fractale:
     def set_imaginary(self, imaginary: float) -> None:
         ...
 
+    def set_pixel_size(self, pixel_size: float) -> None:
+        ...
+
     def set_iterations(self, iterations: int) -> None:
         ...
 
+    def set_adaptive(self, adaptive: bool) -> None:
+        ...
+
+    def set_resumable(self, resumable: bool) -> None:
+        ...
+
+    def set_symmetry(self, symmetry: bool) -> None:
+        ...
+
+    def set_kernel(self, kernel: str) -> None:
+        ...
+
+    def set_method(self, method: str) -> None:
+        ...
+
+    def set_threads(self, threads: int) -> None:
+        ...
+
+    def set_schedule(self, schedule: str, chunk: int = 0) -> None:
+        ...
+
+    def set_incremental(self, incremental: bool) -> None:
+        ...
+
+    def set_cache(self, cache: Optional[TileCache]) -> None:
+        ...
+
+    def set_smoothing(self, smoothing: bool) -> None:
+        ...
+
+    def set_color(self, color: Coloration) -> None:
+        ...
+
     def resize(self, width: int, height: int) -> None:
         ...
 
@@ -75,9 +251,26 @@ class Fractale:
     def image(self) -> Image.Image:
         ...
 
+    def image_view(self) -> Image.Image:
+        ...
+
+    def counts(self) -> Counts:
+        ...
+
+    def indexes(self) -> npt.NDArray[np.uint8]:
+        ...
+
     def image_at_size(self, width: int, height: int) -> Image.Image:
         ...
 
+    def progressive(
+        self, steps: Sequence[int] = (8, 4, 2)
+    ) -> Iterator[Image.Image]:
+        ...
+
+    def set_cancelled(self, cancelled: bool) -> None:
+        ...
+
     def top(self) -> None:
         ...
 
@@ -112,15 +305,43 @@ class Fractale:
     ) -> None:
         ...
 
+    def tile_state(self, x: float, y: float, width: int, height: int,
+                   pixel_size: float) -> bytes:
+        ...
+
+    def export_tiled(self, path: str, width: int, height: int,
+                     workers: Optional[int] = None,
+                     directory: Optional[str] = None, level: int = 6,
+                     tile: int = 1024) -> None:
+        ...
+
+    def zoom_states(self, width: int, height: int, speed: float,
+                    fps: float) -> List[Tuple[bytes, float]]:
+        ...
+
+    def render_states(
+        self, states: Sequence[bytes], workers: Optional[int] = None,
+        indexed: bool = False, counts: bool = False
+    ) -> Iterator[Union[npt.NDArray[np.uint8], Counts]]:
+        ...
+
+    def render_keyframes(
+        self, states: Sequence[bytes], workers: Optional[int] = None,
+        indexed: bool = False, quality: float = 1
+    ) -> Iterator[npt.NDArray[np.uint8]]:
+        ...
+
 
 class Julia(Fractale):
     c_r: float
     c_i: float
 
-    def __init__(self, color: ModuloColoration, real: float = 0,
+    def __init__(self, color: Coloration, c_r: float = 0,
+                 c_i: float = 0, real: float = 0,
                  imaginary: float = 0, iterations: int = 1_000,
-                 width: int = 128, height: int = 128, pixel_size: float = 0.02
-                 ) -> None:
+                 width: int = 128, height: int = 128,
+                 pixel_size: float = 0.02, kernel: str = "scalar",
+                 method: str = "pixel") -> None:
         ...
 
     def set_c_r(self, c_r: float) -> None:
@@ -132,3 +353,24 @@ class Julia(Fractale):
 
 class Mandelbrot(Fractale):
     ...
+
+
+class DeepMandelbrot(Mandelbrot):
+    center_real: Decimal
+    center_imaginary: Decimal
+
+    def __init__(self, color: Coloration,
+                 real: Union[str, float, Decimal] = 0,
+                 imaginary: Union[str, float, Decimal] = 0,
+                 iterations: int = 1_000, width: int = 128,
+                 height: int = 128, pixel_size: float = 0.02,
+                 kernel: str = "scalar", method: str = "pixel") -> None:
+        ...
+
+    @property
+    def precision(self) -> int:
+        ...
+
+    def set_center(self, real: Union[str, float, Decimal],
+                   imaginary: Union[str, float, Decimal]) -> None:
+        ...
@@ -1,15 +1,28 @@
 # distutils: language=c++
 
 import numpy as np
+import os
 import struct as s
 import cv2
-from math import log
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from decimal import Decimal, localcontext
+from math import log, log10
 from PIL import Image
 
+from .gif import GifWriter
+from .metrics import RenderMetrics, new_history
+from .png import PngWriter
+
 cimport numpy as np
 cimport cython
+cimport openmp
 
-from cython.parallel import prange
+from cython.parallel import parallel, prange, threadid
+from libc.math cimport INFINITY, isinf, isnan, log2, lround
 
 DTYPE = np.uint32
 ctypedef np.uint32_t DTYPE_t
@@ -19,11 +32,54 @@ ctypedef np.uint8_t COLORTYPE_t
 
 DEF PIXEL_DEFAULT = 0.02
 DEF MIN_PIXEL_SIZE = PIXEL_DEFAULT * 16
+DEF PERIOD_CHECK_START = 8
+DEF PERIOD_CHECK_MAX = 1 << 16
+
+DEF KERNEL_SCALAR = 0
+DEF KERNEL_INTERIOR = 1
+DEF KERNEL_BATCH = 2
+
+DEF METHOD_PIXEL = 0
+DEF METHOD_SUBDIVISION = 1
+DEF TILE_SIZE = 128
+DEF BLOCK_WIDTH = 128  # blocks of pixels shared between the threads
+DEF BLOCK_HEIGHT = 8
+DEF SUBDIVISION_MIN_SIZE = 6
+DEF REMAP_TOLERANCE = 1e-6
+DEF GRADIENT_SIZE = 1024  # power of two, indexes are masked
+DEF ADAPTIVE_BASE = 100  # iterations per decade of zoom of the first guess
+DEF ADAPTIVE_SAMPLE = 16  # pixels between the samples of the estimation
+DEF ADAPTIVE_GROWTH = 2
+DEF ADAPTIVE_TOLERANCE = 1e-3  # part of the pixels escaping on a raise
+DEF SYMMETRY_NONE = 0
+DEF SYMMETRY_CONJUGATE = 1  # rows mirrored around the real axis
+DEF SYMMETRY_POINT = 2  # pixels mirrored around 0
+DEF WORK_STRIDE = 8  # slots between the iterations of two threads
+
+PROGRESSIVE_STEPS = (8, 4, 2)
+
+
+cdef extern from "parallel.h" nogil:
+    enum: RUNTIME_SCHEDULE
+    void set_runtime_schedule(int kind, int chunk) noexcept
+
+
+cdef extern from "batch.h" nogil:
+    enum: BATCH_LANES
+    const char* batch_target() noexcept
+    void iterate_batch(const double* start_r, const double* start_i,
+                       const double* c_r, const double* c_i, int lanes,
+                       unsigned int iterations, unsigned int* counts,
+                       double* norms) noexcept
 
 
 cdef unsigned int iterate(double z_r, double z_i, double c_r, double c_i,
-                          unsigned int iterations) nogil except +:
-    """Iterate on a complex numbers. formula: Zn+1 = Zn ** 2 + C"""
+                          unsigned int iterations,
+                          double* norm) noexcept nogil:
+    """
+    Iterate on a complex numbers. formula: Zn+1 = Zn ** 2 + C
+    The squared modulus of the last Z is written in norm.
+    """
     cdef:
         double tmp
         unsigned int i
@@ -34,16 +90,722 @@ cdef unsigned int iterate(double z_r, double z_i, double c_r, double c_i,
         z_i = 2 * z_i * tmp + c_i
         if z_r * z_r + z_i * z_i > 4:
             break
+    norm[0] = z_r * z_r + z_i * z_i
+    return 0 if i == iterations - 1 else i + 1
+
+
+cdef unsigned int iterate_periodic(double z_r, double z_i, double c_r,
+                                   double c_i, unsigned int iterations,
+                                   double* norm) noexcept nogil:
+    """
+    Iterate like iterate() but stop as soon as the orbit comes back
+    exactly on a saved value, such an orbit will never escape.
+    """
+    cdef:
+        double tmp, old_r = z_r, old_i = z_i
+        unsigned int i, period = 0, check = PERIOD_CHECK_START
+
+    for i in range(iterations):
+        tmp = z_r
+        z_r = z_r * z_r - z_i * z_i + c_r
+        z_i = 2 * z_i * tmp + c_i
+        if z_r * z_r + z_i * z_i > 4:
+            break
+        if z_r == old_r and z_i == old_i:
+            return 0
+        period += 1
+        if period == check:
+            period = 0
+            if check < PERIOD_CHECK_MAX:
+                check <<= 1
+            old_r = z_r
+            old_i = z_i
+    norm[0] = z_r * z_r + z_i * z_i
     return 0 if i == iterations - 1 else i + 1
 
 
+cdef inline bint in_main_bulbs(double c_r, double c_i) noexcept nogil:
+    """Return if C is in the main cardioid or the period-2 bulb."""
+    cdef double q, x = c_r - 0.25, y2 = c_i * c_i
+    q = x * x + y2
+    if q * (q + x) <= 0.25 * y2:
+        return True
+    return (c_r + 1) * (c_r + 1) + y2 <= 0.0625
+
+
+cdef unsigned int iterate_interior(double c_r, double c_i,
+                                   unsigned int iterations,
+                                   double* norm) noexcept nogil:
+    """
+    Iterate on C from Z0 = 0, skip the main cardioid and the period-2 bulb.
+    """
+    if in_main_bulbs(c_r, c_i):
+        return 0
+    return iterate_periodic(0, 0, c_r, c_i, iterations, norm)
+
+
+cdef unsigned int iterate_state(double* z_r, double* z_i, double c_r,
+                                double c_i, unsigned int start,
+                                unsigned int iterations, bint periodic,
+                                double* norm) noexcept nogil:
+    """
+    Iterate like iterate() from the Z reached after start iterations, up
+    to start < iterations, and save the last Z to continue later. With
+    periodic, stop like iterate_periodic() and save an infinite Z.
+    """
+    cdef:
+        double tmp, a_r = z_r[0], a_i = z_i[0], old_r = a_r, old_i = a_i
+        unsigned int i, period = 0, check = PERIOD_CHECK_START
+
+    if start >= iterations:
+        norm[0] = a_r * a_r + a_i * a_i
+        return 0
+    for i in range(start, iterations):
+        tmp = a_r
+        a_r = a_r * a_r - a_i * a_i + c_r
+        a_i = 2 * a_i * tmp + c_i
+        if a_r * a_r + a_i * a_i > 4:
+            break
+        if periodic:
+            if a_r == old_r and a_i == old_i:
+                z_r[0] = INFINITY
+                return 0
+            period += 1
+            if period == check:
+                period = 0
+                if check < PERIOD_CHECK_MAX:
+                    check <<= 1
+                old_r = a_r
+                old_i = a_i
+    z_r[0] = a_r
+    z_i[0] = a_i
+    norm[0] = a_r * a_r + a_i * a_i
+    return 0 if i == iterations - 1 else i + 1
+
+
+cdef unsigned int iterate_perturbation(double dc_r, double dc_i,
+                                       double* ref_r, double* ref_i,
+                                       unsigned int ref_length,
+                                       unsigned int iterations,
+                                       double* norm) noexcept nogil:
+    """
+    Iterate the delta between Z and a reference orbit Zref computed in high
+    precision: dZn+1 = 2 * Zrefn * dZn + dZn ** 2 + dC. When Z get closer
+    to zero than the delta (glitch) or when the reference escape, rebase
+    on the start of the reference orbit.
+    """
+    cdef:
+        double dz_r = 0, dz_i = 0, z_r = 0, z_i = 0, a_r, a_i
+        unsigned int i, m = 0
+
+    for i in range(iterations):
+        a_r = 2 * ref_r[m] + dz_r
+        a_i = 2 * ref_i[m] + dz_i
+        dz_r, dz_i = (a_r * dz_r - a_i * dz_i + dc_r,
+                      a_r * dz_i + a_i * dz_r + dc_i)
+        m += 1
+        z_r = ref_r[m] + dz_r
+        z_i = ref_i[m] + dz_i
+        if z_r * z_r + z_i * z_i > 4:
+            break
+        if (z_r * z_r + z_i * z_i < dz_r * dz_r + dz_i * dz_i
+                or m == ref_length - 1):
+            dz_r = z_r
+            dz_i = z_i
+            m = 0
+    norm[0] = z_r * z_r + z_i * z_i
+    return 0 if i == iterations - 1 else i + 1
+
+
+cdef inline float smooth_count(unsigned int count, double norm) noexcept nogil:
+    """
+    Continuous escape count from the squared modulus of the escaped Z,
+    0 for the points that do not escape.
+    """
+    if count == 0:
+        return 0
+    return count + 1 - log2(0.5 * log2(norm))
+
+
+KERNELS = ("scalar", "interior", "batch")
+SCHEDULES = ("static", "dynamic", "guided")
+
+
+def parse_schedule(str text):
+    """Return the schedule and the chunk size of a "schedule[,chunk]"."""
+    schedule, _, chunk = text.partition(",")
+    schedule = schedule.strip()
+    if schedule not in SCHEDULES:
+        raise ValueError(f"unknown schedule {schedule!r}, "
+                         f"expected one of {SCHEDULES}")
+    return schedule, int(chunk) if chunk.strip() else 0
+
+
+# renders share the host, their threads can be capped by the environment
+DEFAULT_THREADS = int(os.environ.get("MANDELIA_THREADS") or 0)
+DEFAULT_SCHEDULE = parse_schedule(os.environ.get("MANDELIA_SCHEDULE")
+                                  or "guided")
+BATCH_TARGET = batch_target().decode()
+METHODS = ("pixel", "subdivision")
+
+
+cdef struct Frame:
+    double real, imaginary, pixel_size
+    int x_center, y_center
+    double c_r, c_i
+    unsigned int iterations
+    int kernel_id
+    bint julia
+    short width, height
+    double* ref_r
+    double* ref_i
+    unsigned int ref_length
+    float* smooth
+    double* z_r
+    double* z_i
+    unsigned long long* work
+
+
+cdef inline void add_work(Frame* frame, unsigned int count,
+                          unsigned int start) noexcept nogil:
+    """
+    Count the iterations done by the calling thread on a pixel iterated
+    from start, up to the iterations of the frame when it did not escape.
+    """
+    if frame.work != NULL:
+        frame.work[openmp.omp_get_thread_num() * WORK_STRIDE] += (
+            (count if count != 0 else frame.iterations) - start)
+
+
+cdef inline double pixel_real(Frame* frame, int x) noexcept nogil:
+    """
+    Real part of the column x of a frame, the columns on both sides of
+    the center are exactly opposite around its real part.
+    """
+    return frame.real + (x - frame.x_center) * frame.pixel_size
+
+
+cdef inline double pixel_imaginary(Frame* frame, int y) noexcept nogil:
+    """Imaginary part of the row y of a frame."""
+    return frame.imaginary + (y - frame.y_center) * frame.pixel_size
+
+
+cdef unsigned int escape_state(Frame* frame, Py_ssize_t index, double r,
+                               double i, unsigned int start,
+                               double* norm) noexcept nogil:
+    """
+    Escape count of the pixel at index of coordinates r, i from the Z
+    saved after start iterations, the Z reached is saved in its turn.
+    An infinite Z is a proven interior, a NaN Z was never iterated and
+    starts again from Z0.
+    """
+    cdef:
+        double* z_r = &frame.z_r[index]
+        double* z_i = &frame.z_i[index]
+        bint interior = frame.kernel_id == KERNEL_INTERIOR
+    if isinf(z_r[0]):
+        return 0
+    if start == 0 or isnan(z_r[0]):
+        start = 0
+        if frame.julia:
+            z_r[0] = r
+            z_i[0] = i
+        else:
+            if interior and in_main_bulbs(r, i):
+                z_r[0] = INFINITY
+                return 0
+            z_r[0] = 0
+            z_i[0] = 0
+    elif z_r[0] * z_r[0] + z_i[0] * z_i[0] > 4:
+        # escaped on the last of the start iterations
+        norm[0] = z_r[0] * z_r[0] + z_i[0] * z_i[0]
+        return start
+    if frame.julia:
+        return iterate_state(z_r, z_i, frame.c_r, frame.c_i, start,
+                             frame.iterations, interior, norm)
+    return iterate_state(z_r, z_i, r, i, start, frame.iterations, interior,
+                         norm)
+
+
+cdef inline unsigned int escape(Frame* frame, int x, int y) noexcept nogil:
+    """
+    Escape count of the pixel at x, y of a frame, also write the smooth
+    count of the pixel when the frame has a smooth channel.
+    """
+    cdef:
+        double r = pixel_real(frame, x)
+        double i = pixel_imaginary(frame, y)
+        double norm = 0
+        unsigned int count
+    if frame.z_r != NULL:
+        count = escape_state(frame, <Py_ssize_t>y * frame.width + x, r, i, 0,
+                             &norm)
+    elif frame.ref_length != 0:
+        count = iterate_perturbation(r, i, frame.ref_r, frame.ref_i,
+                                     frame.ref_length, frame.iterations,
+                                     &norm)
+    elif frame.julia:
+        if frame.kernel_id == KERNEL_INTERIOR:
+            count = iterate_periodic(r, i, frame.c_r, frame.c_i,
+                                     frame.iterations, &norm)
+        else:
+            count = iterate(r, i, frame.c_r, frame.c_i, frame.iterations,
+                            &norm)
+    elif frame.kernel_id == KERNEL_INTERIOR:
+        count = iterate_interior(r, i, frame.iterations, &norm)
+    else:
+        count = iterate(0, 0, r, i, frame.iterations, &norm)
+    add_work(frame, count, 0)
+    if frame.smooth != NULL:
+        frame.smooth[<Py_ssize_t>y * frame.width + x] = smooth_count(count,
+                                                                     norm)
+    return count
+
+
+cdef struct Batch:
+    int x[BATCH_LANES]
+    double start_r[BATCH_LANES]
+    double start_i[BATCH_LANES]
+    double c_r[BATCH_LANES]
+    double c_i[BATCH_LANES]
+    unsigned int counts[BATCH_LANES]
+    double norms[BATCH_LANES]
+    int lanes
+
+
+cdef inline void flush_batch(Frame* frame, Batch* batch, DTYPE_t* content,
+                             Py_ssize_t row) noexcept nogil:
+    """Iterate the pixels gathered in the batch of a row and empty it."""
+    cdef int lane
+    iterate_batch(batch.start_r, batch.start_i, batch.c_r, batch.c_i,
+                  batch.lanes, frame.iterations, batch.counts, batch.norms)
+    for lane in range(batch.lanes):
+        content[row + batch.x[lane]] = batch.counts[lane]
+        add_work(frame, batch.counts[lane], 0)
+        if frame.smooth != NULL:
+            frame.smooth[row + batch.x[lane]] = smooth_count(
+                batch.counts[lane], batch.norms[lane])
+    batch.lanes = 0
+
+
+cdef unsigned long long escape_row(Frame* frame, DTYPE_t* content,
+                                   unsigned char* done, int y, int x0,
+                                   int x1, int step) noexcept nogil:
+    """
+    Escape counts of the pixels not done of a row between x0 and x1
+    excluded, on the columns multiple of step, by batches of BATCH_LANES
+    pixels with the batch kernel. done is NULL when no pixel is done.
+    Return the number of pixels iterated.
+    """
+    cdef:
+        Batch batch
+        int x, column
+        int first = (x0 + step - 1) // step, last = (x1 + step - 1) // step
+        Py_ssize_t row = <Py_ssize_t>y * frame.width
+        double r, i = pixel_imaginary(frame, y)
+        unsigned long long count = 0
+    if (frame.kernel_id != KERNEL_BATCH or frame.ref_length != 0
+            or frame.z_r != NULL):
+        for column in range(first, last):
+            x = column * step
+            if done == NULL or not done[row + x]:
+                content[row + x] = escape(frame, x, y)
+                if done != NULL:
+                    done[row + x] = 1
+                count += 1
+        return count
+    batch.lanes = 0
+    for column in range(first, last):
+        x = column * step
+        if done != NULL:
+            if done[row + x]:
+                continue
+            done[row + x] = 1
+        r = pixel_real(frame, x)
+        batch.x[batch.lanes] = x
+        if frame.julia:
+            batch.start_r[batch.lanes] = r
+            batch.start_i[batch.lanes] = i
+            batch.c_r[batch.lanes] = frame.c_r
+            batch.c_i[batch.lanes] = frame.c_i
+        else:
+            batch.start_r[batch.lanes] = 0
+            batch.start_i[batch.lanes] = 0
+            batch.c_r[batch.lanes] = r
+            batch.c_i[batch.lanes] = i
+        batch.lanes += 1
+        count += 1
+        if batch.lanes == BATCH_LANES:
+            flush_batch(frame, &batch, content, row)
+    if batch.lanes != 0:
+        flush_batch(frame, &batch, content, row)
+    return count
+
+
+cdef unsigned long long escape_block(Frame* frame, DTYPE_t* content,
+                                     unsigned char* done, int block,
+                                     int blocks_x, int step) noexcept nogil:
+    """
+    Escape counts of the pixels not done of a block of the frame, on the
+    grid of step pixels. Return the number of pixels iterated.
+    """
+    cdef:
+        int row
+        int x0 = (block % blocks_x) * BLOCK_WIDTH
+        int y0 = (block // blocks_x) * BLOCK_HEIGHT
+        int x1 = min(x0 + BLOCK_WIDTH, frame.width)
+        int y1 = min(y0 + BLOCK_HEIGHT, frame.height)
+        unsigned long long count = 0
+    for row in range((y0 + step - 1) // step, (y1 + step - 1) // step):
+        count += escape_row(frame, content, done, row * step, x0, x1, step)
+    return count
+
+
+cdef inline bint resume_pixel(Frame* frame, DTYPE_t* content,
+                              Py_ssize_t index,
+                              unsigned int start) noexcept nogil:
+    """
+    Continue a pixel not escaped after start iterations up to the
+    iterations of the frame, return if it escaped.
+    """
+    cdef:
+        int y = index // frame.width
+        int x = index - <Py_ssize_t>y * frame.width
+        double norm = 0
+        unsigned int count
+    if isnan(frame.z_r[index]):
+        start = 0  # never iterated, starts again from Z0
+    count = escape_state(frame, index, pixel_real(frame, x),
+                         pixel_imaginary(frame, y), start, &norm)
+    add_work(frame, count, start)
+    content[index] = count
+    if frame.smooth != NULL:
+        frame.smooth[index] = smooth_count(count, norm)
+    return count != 0
+
+
+cdef inline bint same_parameters(Frame* a, Frame* b) noexcept nogil:
+    """Return if two frames give the same value at the same coordinates."""
+    return (a.iterations == b.iterations and a.kernel_id == b.kernel_id
+            and a.julia == b.julia and a.c_r == b.c_r and a.c_i == b.c_i
+            and a.ref_length == 0 and b.ref_length == 0
+            and (a.smooth == NULL) == (b.smooth == NULL))
+
+
+cdef inline bint same_pixels(Frame* a, Frame* b) noexcept nogil:
+    """
+    Return if two frames iterate the same pixels the same way, whatever
+    their iterations.
+    """
+    return (a.real == b.real and a.imaginary == b.imaginary
+            and a.pixel_size == b.pixel_size and a.width == b.width
+            and a.height == b.height and a.x_center == b.x_center
+            and a.y_center == b.y_center and a.kernel_id == b.kernel_id
+            and a.julia == b.julia and a.c_r == b.c_r and a.c_i == b.c_i
+            and a.ref_length == 0 and b.ref_length == 0
+            and (a.smooth == NULL) == (b.smooth == NULL))
+
+
+cdef inline int frame_symmetry(Frame* frame) noexcept nogil:
+    """
+    Symmetry giving exactly the same counts on both sides of the center
+    of a frame: the Mandelbrot set and the Julia sets of a real C are
+    symmetric around the real axis, every Julia set is symmetric around
+    0. Perturbation frames are never mirrored.
+    """
+    if frame.ref_length != 0 or frame.y_center + 1 >= frame.height:
+        return SYMMETRY_NONE
+    if frame.imaginary == 0 and (not frame.julia or frame.c_i == 0):
+        return SYMMETRY_CONJUGATE
+    if frame.julia and frame.real == 0 and frame.imaginary == 0:
+        return SYMMETRY_POINT
+    return SYMMETRY_NONE
+
+
+cdef void mirror_rows(np.ndarray array, int symmetry, int x_center,
+                      int y_center, int rows):
+    """
+    Copy the rows before rows of a symmetric frame onto the opposite
+    ones, the last two axes of array are the rows and the columns. The
+    first column has no opposite around 0 when the width is even and is
+    left as is.
+    """
+    cdef int height = array.shape[array.ndim - 2]
+    cdef int width = array.shape[array.ndim - 1]
+    cdef int first = 2 * x_center + 1 - width
+    sources = 2 * y_center - np.arange(rows, height)
+    if symmetry == SYMMETRY_CONJUGATE:
+        array[..., rows:, :] = array[..., sources, :]
+    elif symmetry == SYMMETRY_POINT:
+        columns = 2 * x_center - np.arange(first, width)
+        array[..., rows:, first:] = array[..., sources[:, None], columns]
+
+
+def remap_indexes(double start, double pixel_size, short size,
+                  double old_start, double old_pixel_size, short old_size):
+    """
+    For each pixel of an axis, index of the old pixel at the same
+    coordinate or -1 if there is none.
+    """
+    coordinates = start + np.arange(size, dtype=np.float64) * pixel_size
+    position = (coordinates - old_start) / old_pixel_size
+    index = np.rint(position)
+    valid = ((np.abs(position - index) < REMAP_TOLERANCE)
+             & (index >= 0) & (index < old_size))
+    return np.where(valid, index, -1).astype(np.intp)
+
+
+def tile_spans(double origin, int size):
+    """
+    Start and length of the tiles of an axis of size pixels, the pixel 0
+    is at origin in pixels on the grid of tiles of the plane.
+    """
+    cdef int first = min(-lround(origin) % TILE_SIZE, size)
+    spans = [(0, first)] if first else []
+    spans.extend((x, min(TILE_SIZE, size - x))
+                 for x in range(first, size, TILE_SIZE))
+    return spans
+
+
+cdef inline unsigned int escape_at(Frame* frame, DTYPE_t* content,
+                                   unsigned char* done, int x, int y,
+                                   unsigned long long* count) noexcept nogil:
+    """Escape count of a pixel, computed only if not done yet."""
+    cdef Py_ssize_t index = <Py_ssize_t>y * frame.width + x
+    if not done[index]:
+        content[index] = escape(frame, x, y)
+        done[index] = 1
+        count[0] += 1
+    return content[index]
+
+
+cdef bint border_in_bulbs(Frame* frame, int x0, int y0, int x1,
+                          int y1) noexcept nogil:
+    """
+    Return if the pixels of the border of the rectangle [x0, x1]x[y0, y1]
+    of a Mandelbrot frame are all in the main cardioid or the period-2
+    bulb, then so is the rectangle.
+    """
+    cdef int x, y
+    for x in range(x0, x1 + 1):
+        if not (in_main_bulbs(pixel_real(frame, x), pixel_imaginary(frame, y0))
+                and in_main_bulbs(pixel_real(frame, x),
+                                  pixel_imaginary(frame, y1))):
+            return False
+    for y in range(y0 + 1, y1):
+        if not (in_main_bulbs(pixel_real(frame, x0), pixel_imaginary(frame, y))
+                and in_main_bulbs(pixel_real(frame, x1),
+                                  pixel_imaginary(frame, y))):
+            return False
+    return True
+
+
+cdef void subdivide(Frame* frame, DTYPE_t* content, unsigned char* done,
+                    int x0, int y0, int x1, int y1,
+                    unsigned long long* count) noexcept nogil:
+    """
+    Mariani-Silver: iterate the border of the rectangle [x0, x1]x[y0, y1],
+    fill it if the border is uniform otherwise split it in two. Escaping
+    filaments thinner than a pixel cross the set between the pixels of a
+    border, a border in the set is only filled when the whole border is
+    in the main cardioid or the period-2 bulb of the Mandelbrot set.
+    """
+    cdef:
+        int x, y, middle
+        unsigned int value = escape_at(frame, content, done, x0, y0, count)
+        bint uniform = True
+        bint bulbs = not frame.julia and frame.ref_length == 0
+        Py_ssize_t index
+    for x in range(x0, x1 + 1):
+        if escape_at(frame, content, done, x, y0, count) != value:
+            uniform = False
+        if escape_at(frame, content, done, x, y1, count) != value:
+            uniform = False
+    for y in range(y0 + 1, y1):
+        if escape_at(frame, content, done, x0, y, count) != value:
+            uniform = False
+        if escape_at(frame, content, done, x1, y, count) != value:
+            uniform = False
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return
+    if uniform and value == 0:
+        uniform = bulbs and border_in_bulbs(frame, x0, y0, x1, y1)
+    # smooth counts are not uniform outside the set
+    if uniform and (value == 0 or frame.smooth == NULL):
+        for y in range(y0 + 1, y1):
+            for x in range(x0 + 1, x1):
+                index = <Py_ssize_t>y * frame.width + x
+                content[index] = value
+                done[index] = 1
+    elif x1 - x0 <= SUBDIVISION_MIN_SIZE or y1 - y0 <= SUBDIVISION_MIN_SIZE:
+        for y in range(y0 + 1, y1):
+            for x in range(x0 + 1, x1):
+                escape_at(frame, content, done, x, y, count)
+    elif x1 - x0 >= y1 - y0:
+        middle = (x0 + x1) >> 1
+        subdivide(frame, content, done, x0, y0, middle, y1, count)
+        subdivide(frame, content, done, middle, y0, x1, y1, count)
+    else:
+        middle = (y0 + y1) >> 1
+        subdivide(frame, content, done, x0, y0, x1, middle, count)
+        subdivide(frame, content, done, x0, middle, x1, y1, count)
+
+
+cdef unsigned long long subdivide_tile(Frame* frame, DTYPE_t* content,
+                                       unsigned char* done, int tile,
+                                       int tiles_x) noexcept nogil:
+    """Subdivide a tile of the frame, return the number of pixels iterated."""
+    cdef:
+        unsigned long long count = 0
+        int x0 = (tile % tiles_x) * TILE_SIZE
+        int y0 = (tile // tiles_x) * TILE_SIZE
+    subdivide(frame, content, done, x0, y0,
+              min(x0 + TILE_SIZE, frame.width) - 1,
+              min(y0 + TILE_SIZE, frame.height) - 1, &count)
+    return count
+
+
+# Without RUNTIME_SCHEDULE the loops below use the guided schedule, a
+# prange only takes the kind of its schedule as a literal.
+cdef unsigned long long escape_blocks(Frame* frame, DTYPE_t* content,
+                                      unsigned char* done, int step,
+                                      int threads,
+                                      bint* cancelled) noexcept nogil:
+    """
+    Escape counts of the pixels not done of the frame on the grid of step
+    pixels, by blocks shared between the threads. The blocks left are
+    skipped once cancelled, which may be NULL. Return the number of
+    pixels iterated.
+    """
+    cdef:
+        int block
+        int blocks_x = (frame.width + BLOCK_WIDTH - 1) // BLOCK_WIDTH
+        int blocks = blocks_x * ((frame.height + BLOCK_HEIGHT - 1)
+                                 // BLOCK_HEIGHT)
+        unsigned long long count = 0
+    if RUNTIME_SCHEDULE:
+        for block in prange(blocks, schedule='runtime', num_threads=threads):
+            if cancelled != NULL and cancelled[0]:
+                continue
+            count += escape_block(frame, content, done, block, blocks_x,
+                                  step)
+    else:
+        for block in prange(blocks, schedule='guided', num_threads=threads):
+            if cancelled != NULL and cancelled[0]:
+                continue
+            count += escape_block(frame, content, done, block, blocks_x,
+                                  step)
+    return count
+
+
+cdef unsigned long long subdivide_tiles(Frame* frame, DTYPE_t* content,
+                                        unsigned char* done, int threads,
+                                        bint* cancelled) noexcept nogil:
+    """
+    Subdivide the tiles of the frame shared between the threads, return
+    the number of pixels iterated.
+    """
+    cdef:
+        int tile
+        int tiles_x = (frame.width + TILE_SIZE - 1) // TILE_SIZE
+        int tiles = tiles_x * ((frame.height + TILE_SIZE - 1) // TILE_SIZE)
+        unsigned long long count = 0
+    if RUNTIME_SCHEDULE:
+        for tile in prange(tiles, schedule='runtime', num_threads=threads):
+            if cancelled != NULL and cancelled[0]:
+                continue
+            count += subdivide_tile(frame, content, done, tile, tiles_x)
+    else:
+        for tile in prange(tiles, schedule='guided', num_threads=threads):
+            if cancelled != NULL and cancelled[0]:
+                continue
+            count += subdivide_tile(frame, content, done, tile, tiles_x)
+    return count
+
+
+cdef unsigned long long resume_pixels(Frame* frame, DTYPE_t* content,
+                                      np.intp_t* pending, Py_ssize_t size,
+                                      unsigned int start, int threads,
+                                      bint* cancelled) noexcept nogil:
+    """
+    Continue the pending pixels after start iterations shared between the
+    threads, return the number of pixels that escaped.
+    """
+    cdef:
+        Py_ssize_t k
+        unsigned long long escaped = 0
+    if RUNTIME_SCHEDULE:
+        for k in prange(size, schedule='runtime', num_threads=threads):
+            if cancelled != NULL and cancelled[0]:
+                continue
+            escaped += resume_pixel(frame, content, pending[k], start)
+    else:
+        for k in prange(size, schedule='guided', num_threads=threads):
+            if cancelled != NULL and cancelled[0]:
+                continue
+            escaped += resume_pixel(frame, content, pending[k], start)
+    return escaped
+
+
+cdef class Coloration:
+    """Base of the colorations, turn escape counts into RGB images."""
+
+    cpdef to_bytes(self):
+        """Convert Coloration into bytes."""
+        raise NotImplementedError
+
+    cpdef from_bytes(self, bytes bytes_):
+        """Convert bytes into Coloration."""
+        raise NotImplementedError
+
+    cpdef bytes_size(self):
+        raise NotImplementedError
+
+    cpdef np.ndarray palette(self):
+        """
+        Return the RGB colors of the fixed palette of at most 256 colors
+        indexed by indexes(), None if the coloration has none.
+        """
+        return None
+
+    cpdef np.ndarray indexes(self, np.ndarray np_fractale):
+        """Return the index in palette() of each pixel."""
+        raise NotImplementedError
+
+    cpdef np.ndarray colorize(self, np.ndarray np_fractale,
+                              np.ndarray out=None, np.ndarray smooth=None):
+        """
+        ColorInteraction a two-dimensional array, write into out if it
+        has the right shape, RGB or RGBA. Colorations that support it use
+        the smooth counts instead of the escape counts when given.
+        """
+        raise NotImplementedError
+
+    cdef np.ndarray _output(self, Py_ssize_t height, Py_ssize_t width,
+                            np.ndarray out):
+        """
+        Return out if it can hold the image otherwise a new RGB array, a
+        RGBA out keeps its alpha channel untouched.
+        """
+        if (out is None or out.dtype != COLORTYPE
+                or not out.flags.c_contiguous
+                or (<object>out).shape not in ((height, width, 3),
+                                               (height, width, 4))):
+            out = np.empty((height, width, 3), dtype=COLORTYPE)
+        return out
+
+
 modulo_coloration_saver = s.Struct("BBB")
-cdef class ModuloColoration:
+cdef class ModuloColoration(Coloration):
     cdef:
         public unsigned char r, g, b
+        np.ndarray palette_cache
+        tuple palette_key
 
     def __init__(self, r=3, g=1, b=10):
         self.r, self.g, self.b = r, g, b
+        self.palette_cache = None
+        self.palette_key = None
 
     cpdef to_bytes(self):
         """Convert ModuloColor into bytes."""
@@ -56,47 +818,517 @@ cdef class ModuloColoration:
     cpdef bytes_size(self):
         return modulo_coloration_saver.size
 
+    cpdef np.ndarray palette(self):
+        """
+        Return the RGB color of each iteration modulo 256, the product
+        r * i wraps on 8 bits so 256 entries are enough.
+        """
+        key = (self.r, self.g, self.b)
+        if self.palette_key != key:
+            i = np.arange(256, dtype=np.uint32)
+            palette = (np.array(key, dtype=np.uint32) * i[:, None]) & 0xff
+            self.palette_cache = palette.astype(COLORTYPE)
+            self.palette_key = key
+        return self.palette_cache
+
+    cpdef np.ndarray indexes(self, np.ndarray np_fractale):
+        """Return the index in palette() of each pixel."""
+        return (np_fractale & 0xff).astype(COLORTYPE)
+
     @cython.boundscheck(False)  # turn off bounds-checking
     @cython.wraparound(False)  # turn off negative index wrapping
-    cpdef np.ndarray[COLORTYPE_t, ndim=3] colorize(
-            self, np.ndarray[DTYPE_t, ndim=2] np_fractale):
-        """ColorInteraction a two-dimensional array."""
+    cpdef np.ndarray colorize(self, np.ndarray np_fractale,
+                              np.ndarray out=None, np.ndarray smooth=None):
+        """
+        ColorInteraction a two-dimensional array, write into out if it
+        has the right shape. The smooth counts are not used.
+        """
         cdef:
-            short width, height, x, y
-            unsigned char r = self.r, g = self.g, b = self.b
-            unsigned int i
-            np.ndarray[COLORTYPE_t, ndim=3] image
-
-        width = np_fractale.shape[0]
-        height = np_fractale.shape[1]
-        image = np.zeros((height, width, 3), dtype=COLORTYPE)
-        for x in prange(width, schedule='guided', nogil=True):
-            for y in range(height):
-                i = np_fractale[x, y]
-                if i != 0:
-                    image[y, x, 0] = r * i
-                    image[y, x, 1] = g * i
-                    image[y, x, 2] = b * i
-        return image
+            Py_ssize_t width, height, x, y
+            COLORTYPE_t[:, ::1] palette = self.palette()
+            const DTYPE_t[:, ::1] content
+            COLORTYPE_t[:, :, ::1] image
+            const COLORTYPE_t* color
+            const DTYPE_t* row
+            COLORTYPE_t* pixel
+            Py_ssize_t channels
+
+        content = np.ascontiguousarray(np_fractale, dtype=DTYPE)
+        height = content.shape[0]
+        width = content.shape[1]
+        out = self._output(height, width, out)
+        image = out
+        channels = image.shape[2]
+        if height == 0 or width == 0:
+            return out
+        for y in prange(height, schedule='static', nogil=True):
+            row = &content[y, 0]
+            pixel = &image[y, 0, 0]
+            for x in range(width):
+                color = &palette[row[x] & 0xff, 0]
+                pixel[channels * x] = color[0]
+                pixel[channels * x + 1] = color[1]
+                pixel[channels * x + 2] = color[2]
+        return out
+
+
+GRADIENT_STOPS = ((0, 7, 100), (32, 107, 203), (237, 255, 255),
+                  (255, 170, 0), (0, 2, 0))
+gradient_coloration_saver = s.Struct("dB")
+cdef class GradientColoration(Coloration):
+    """
+    Cyclic gradient through color stops, one cycle every period escape
+    counts. With smooth counts the bands between counts disappear.
+    """
+    cdef:
+        public double period
+        readonly tuple stops
+        np.ndarray lut_cache
+        tuple lut_key
+
+    def __init__(self, period=32.0, stops=GRADIENT_STOPS):
+        self.period = period
+        self.set_stops(stops)
+
+    cpdef set_stops(self, stops):
+        """Set the RGB colors of the gradient."""
+        stops = tuple([tuple([int(channel) for channel in stop])
+                       for stop in stops])
+        if not stops or {len(stop) for stop in stops} != {3}:
+            raise ValueError(f"expected RGB stops, got {stops!r}")
+        self.stops = stops
+        self.lut_cache = None
+        self.lut_key = None
+
+    cpdef to_bytes(self):
+        """Convert GradientColoration into bytes."""
+        return (gradient_coloration_saver.pack(self.period, len(self.stops))
+                + bytes([channel for stop in self.stops for channel in stop]))
+
+    cpdef from_bytes(self, bytes bytes_):
+        """Convert bytes into GradientColoration."""
+        cdef Py_ssize_t start = gradient_coloration_saver.size
+        self.period, length = gradient_coloration_saver.unpack(
+            bytes_[:start])
+        data = bytes_[start:start + 3 * length]
+        self.set_stops([data[i:i + 3] for i in range(0, len(data), 3)])
+
+    cpdef bytes_size(self):
+        return gradient_coloration_saver.size + 3 * len(self.stops)
+
+    cpdef np.ndarray lut(self):
+        """Return the RGB colors of one cycle of the gradient."""
+        if self.lut_key != self.stops:
+            stops = np.array(self.stops + self.stops[:1], dtype=np.float64)
+            position = (np.arange(GRADIENT_SIZE, dtype=np.float64)
+                        * (len(self.stops) / GRADIENT_SIZE))
+            lut = np.empty((GRADIENT_SIZE, 3), dtype=np.float64)
+            for channel in range(3):
+                lut[:, channel] = np.interp(position,
+                                            np.arange(len(stops)),
+                                            stops[:, channel])
+            self.lut_cache = np.rint(lut).astype(COLORTYPE)
+            self.lut_key = self.stops
+        return self.lut_cache
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cpdef np.ndarray colorize(self, np.ndarray np_fractale,
+                              np.ndarray out=None, np.ndarray smooth=None):
+        """
+        ColorInteraction a two-dimensional array, write into out if it
+        has the right shape. Use the smooth counts when given.
+        """
+        cdef:
+            Py_ssize_t width, height, x, y
+            COLORTYPE_t[:, ::1] lut = self.lut()
+            const DTYPE_t[:, ::1] content
+            const float[:, ::1] smooth_view
+            COLORTYPE_t[:, :, ::1] image
+            double scale = GRADIENT_SIZE / self.period
+            bint has_smooth = smooth is not None
+            double value
+            const COLORTYPE_t* color
+            COLORTYPE_t* pixel
+            Py_ssize_t channels
+
+        content = np.ascontiguousarray(np_fractale, dtype=DTYPE)
+        height = content.shape[0]
+        width = content.shape[1]
+        smooth_view = self._smooth(smooth, height, width)
+        out = self._output(height, width, out)
+        image = out
+        channels = image.shape[2]
+        if height == 0 or width == 0:
+            return out
+        for y in prange(height, schedule='static', nogil=True):
+            pixel = &image[y, 0, 0]
+            for x in range(width):
+                if content[y, x] == 0:
+                    pixel[channels * x] = pixel[channels * x + 1] = 0
+                    pixel[channels * x + 2] = 0
+                    continue
+                value = smooth_view[y, x] if has_smooth else content[y, x]
+                color = &lut[<Py_ssize_t>(value * scale)
+                             & (GRADIENT_SIZE - 1), 0]
+                pixel[channels * x] = color[0]
+                pixel[channels * x + 1] = color[1]
+                pixel[channels * x + 2] = color[2]
+        return out
+
+    cdef _smooth(self, np.ndarray smooth, Py_ssize_t height,
+                 Py_ssize_t width):
+        """Check the shape of the smooth counts, a dummy array if None."""
+        if smooth is None:
+            return np.zeros((1, 1), dtype=np.float32)
+        shape = (<object>smooth).shape
+        if shape != (height, width):
+            raise ValueError(f"smooth counts of shape {shape} "
+                             f"do not match ({height}, {width})")
+        return np.ascontiguousarray(smooth, dtype=np.float32)
+
+
+cdef class HistogramColoration(GradientColoration):
+    """
+    Gradient indexed by the rank of the escape count among the escaped
+    pixels of the image, the colors are spread evenly whatever the zoom
+    and the maximum of iterations. The period is the number of cycles
+    of the gradient over all the ranks.
+    """
+
+    cdef np.ndarray fixed_counts
+
+    def __init__(self, period=1.0, stops=GRADIENT_STOPS):
+        super().__init__(period, stops)
+        self.fixed_counts = None
+
+    cpdef set_counts(self, np.ndarray counts):
+        """
+        Rank with the counts of a whole image colorized by parts, None to
+        use the histogram of each colorized array.
+        """
+        self.fixed_counts = counts
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cpdef np.ndarray histogram(self, np.ndarray np_fractale):
+        """
+        Count the pixels of each escape count in one parallel pass,
+        each thread fills its own histogram.
+        """
+        cdef:
+            Py_ssize_t width, height, x, y, size
+            int thread, threads = openmp.omp_get_max_threads()
+            const DTYPE_t[:, ::1] content
+            np.uint64_t[:, ::1] local
+            np.uint64_t* counts
+
+        content = np.ascontiguousarray(np_fractale, dtype=DTYPE)
+        height = content.shape[0]
+        width = content.shape[1]
+        size = np.max(content) + 1 if height and width else 1
+        local = np.zeros((threads, size), dtype=np.uint64)
+        with nogil, parallel(num_threads=threads):
+            thread = threadid()
+            counts = &local[thread, 0]
+            for y in prange(height, schedule='static'):
+                for x in range(width):
+                    counts[content[y, x]] += 1
+        return np.asarray(local).sum(axis=0)
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cpdef np.ndarray colorize(self, np.ndarray np_fractale,
+                              np.ndarray out=None, np.ndarray smooth=None):
+        """
+        ColorInteraction a two-dimensional array, write into out if it
+        has the right shape. Use the smooth counts when given to
+        interpolate between the ranks of two counts.
+        """
+        cdef:
+            Py_ssize_t width, height, x, y, low, last
+            COLORTYPE_t[:, ::1] lut = self.lut()
+            const DTYPE_t[:, ::1] content
+            const float[:, ::1] smooth_view
+            const double[::1] ranks
+            COLORTYPE_t[:, :, ::1] image
+            double scale = GRADIENT_SIZE * self.period
+            bint has_smooth = smooth is not None
+            double value, fraction
+            const COLORTYPE_t* color
+            COLORTYPE_t* pixel
+            Py_ssize_t channels
+
+        content = np.ascontiguousarray(np_fractale, dtype=DTYPE)
+        height = content.shape[0]
+        width = content.shape[1]
+        smooth_view = self._smooth(smooth, height, width)
+        out = self._output(height, width, out)
+        image = out
+        channels = image.shape[2]
+        if height == 0 or width == 0:
+            return out
+        if self.fixed_counts is None:
+            counts = self.histogram(np_fractale)
+        else:
+            counts = self.fixed_counts.astype(np.uint64)
+            maximum = np.max(content) + 1
+            if counts.shape[0] < maximum:
+                counts = np.pad(counts, (0, maximum - counts.shape[0]))
+        counts[0] = 0  # points of the set are not ranked
+        cumulative = np.cumsum(counts, dtype=np.float64)
+        ranks = cumulative / max(counts.sum(), 1)
+        last = ranks.shape[0] - 1
+        for y in prange(height, schedule='static', nogil=True):
+            pixel = &image[y, 0, 0]
+            for x in range(width):
+                if content[y, x] == 0:
+                    pixel[channels * x] = pixel[channels * x + 1] = 0
+                    pixel[channels * x + 2] = 0
+                    continue
+                if has_smooth:
+                    # smooth counts fall below 0 for the points escaping
+                    # far beyond the bailout, they are clamped to the ranks
+                    value = min(max(smooth_view[y, x], 0), last)
+                    low = <Py_ssize_t>value
+                    fraction = value - low
+                    value = (ranks[low] + (ranks[min(low + 1, last)]
+                                           - ranks[low]) * fraction)
+                else:
+                    value = ranks[content[y, x]]
+                color = &lut[<Py_ssize_t>(value * scale)
+                             & (GRADIENT_SIZE - 1), 0]
+                pixel[channels * x] = color[0]
+                pixel[channels * x + 1] = color[1]
+                pixel[channels * x + 2] = color[2]
+        return out
+
+FRAMES_PER_WORKER = 2
+KEYFRAME_RATIO = 2
+KEYFRAME_MARGIN = 2
+EXPORT_TILE = 1024
+EXPORT_ROWS = 64
+SHORT_MAX = 32767
+
+
+def set_threads(int threads):
+    """Set the number of OpenMP threads of the process."""
+    openmp.omp_set_num_threads(threads)
+
+
+def render_state(tuple settings, bytes data, bint indexed=False,
+                 bint counts=False):
+    """
+    Return the RGB array of a fractal saved with to_bytes, or the palette
+    indexes of its pixels if indexed and the coloration has a palette,
+    or its escape and smooth counts if counts. Settings are the types of
+    the fractal and its coloration, the kernel, the method, the
+    smoothing, the adaptive mode, the threads, the schedule and the chunk.
+    """
+    (cls, color_cls, kernel, method, smoothing, adaptive, threads, schedule,
+     chunk) = settings
+    width, height = fractale_saver.unpack(data[:fractale_saver.size])[3:5]
+    color = color_cls()
+    fractale = cls(color, width=width, height=height, kernel=kernel,
+                   method=method)
+    fractale.set_smoothing(smoothing)
+    fractale.set_adaptive(adaptive)
+    fractale.set_threads(threads)
+    fractale.set_schedule(schedule, chunk)
+    fractale.from_bytes(data)
+    if counts:
+        return fractale.counts()
+    if indexed and color.palette() is not None:
+        return fractale.indexes()
+    content, smooth = fractale.counts()
+    return color.colorize(content, None, smooth)
+
+
+def rgba_buffer(Py_ssize_t height, Py_ssize_t width):
+    """Return a RGBA array to colorize into, opaque once for all."""
+    buffer = np.empty((height, width, 4), dtype=COLORTYPE)
+    buffer[:, :, 3] = 255
+    return buffer
+
+
+def rgba_image(np.ndarray buffer):
+    """Return a RGBA image sharing the memory of a RGBA array."""
+    return Image.frombuffer('RGBA', (buffer.shape[1], buffer.shape[0]),
+                            buffer, 'raw', 'RGBA', 0, 1)
+
+
+def keyframe_plan(states, double quality):
+    """
+    Group the states of a zoom in segments of KEYFRAME_RATIO zoom, return
+    for each segment the bytes of its keyframe and its states. The
+    keyframe shares the center of the first state and covers every state
+    of the segment with a pixel quality times smaller than needed by the
+    most zoomed state.
+    """
+    if not 0 < quality <= 1:
+        raise ValueError(f"the quality must be in ]0, 1] ({quality})")
+    segments = []
+    for data in states:
+        pixel_size = fractale_saver.unpack(data[:fractale_saver.size])[2]
+        if (not segments
+                or pixel_size * KEYFRAME_RATIO < segments[-1][0]):
+            segments.append((pixel_size, []))
+        segments[-1][1].append(data)
+    plan = []
+    for _, segment in segments:
+        record = fractale_saver.unpack(segment[0][:fractale_saver.size])
+        real, imaginary, _, _, _, iterations = record
+        half_width = half_height = 0.0
+        key_pixel_size = float("inf")
+        for data in segment:
+            _, _, pixel_size, width, height, _ = fractale_saver.unpack(
+                data[:fractale_saver.size])
+            half_width = max(half_width, ((width >> 1) + 1) * pixel_size)
+            half_height = max(half_height, ((height >> 1) + 1) * pixel_size)
+            key_pixel_size = min(key_pixel_size, pixel_size / quality)
+        key = fractale_saver.pack(
+            real, imaginary, key_pixel_size,
+            2 * (int(half_width / key_pixel_size) + KEYFRAME_MARGIN) + 1,
+            2 * (int(half_height / key_pixel_size) + KEYFRAME_MARGIN) + 1,
+            iterations)
+        plan.append((key + segment[0][fractale_saver.size:], segment))
+    return plan
+
+
+def resample_indexes(short size, double pixel_size, short key_size,
+                     double key_pixel_size):
+    """
+    For each pixel of an axis centered like the keyframe axis, index of
+    the nearest pixel of the keyframe.
+    """
+    offsets = (np.arange(size, dtype=np.float64) - (size >> 1)) * pixel_size
+    index = np.rint(offsets / key_pixel_size) + (key_size >> 1)
+    return np.clip(index, 0, key_size - 1).astype(np.intp)
+
+
+def frame_image(np.ndarray frame, np.ndarray palette):
+    """Image of a frame from render_state, indexes need the palette."""
+    if frame.ndim == 3:
+        return Image.fromarray(frame, 'RGB')
+    img = Image.fromarray(frame, 'L')
+    img.putpalette(palette.tobytes())
+    return img
+
+
+cdef inline void julia_row(Frame* model, double c_r, double c_i,
+                           DTYPE_t* content, int y) noexcept nogil:
+    """Escape counts of a row of the Julia set of C in the model frame."""
+    cdef Frame frame = model[0]
+    frame.c_r = c_r
+    frame.c_i = c_i
+    escape_row(&frame, content, NULL, y, 0, frame.width, 1)
+
+
+@cython.boundscheck(False)  # turn off bounds-checking
+@cython.wraparound(False)  # turn off negative index wrapping
+def julia_thumbnails(double[::1] c_r, double[::1] c_i, double real,
+                     double imaginary, double pixel_size, short width,
+                     short height, unsigned int iterations,
+                     str kernel="scalar", int threads=0):
+    """
+    Escape counts of the Julia sets of each C of the same frame, of shape
+    (len(c_r), height, width). The rows of every set are shared between
+    the threads without the GIL, 0 threads for all.
+    """
+    cdef:
+        Frame frame
+        Py_ssize_t row, rows, size = <Py_ssize_t>width * height
+        np.ndarray[DTYPE_t, ndim=3] counts
+        DTYPE_t* counts_ptr
+    if kernel not in KERNELS:
+        raise ValueError(f"unknown kernel {kernel!r}, "
+                         f"expected one of {KERNELS}")
+    counts = np.zeros((c_r.shape[0], height, width), dtype=DTYPE)
+    rows = c_r.shape[0] * height
+    if rows == 0 or width == 0:
+        return counts
+    frame.real = real
+    frame.imaginary = imaginary
+    frame.x_center = width >> 1
+    frame.y_center = height >> 1
+    frame.pixel_size = pixel_size
+    frame.iterations = iterations
+    frame.kernel_id = KERNELS.index(kernel)
+    frame.julia = True
+    frame.width = width
+    frame.height = height
+    frame.ref_r = NULL
+    frame.ref_i = NULL
+    frame.ref_length = 0
+    frame.work = NULL
+    frame.smooth = NULL
+    frame.z_r = NULL
+    frame.z_i = NULL
+    counts_ptr = &counts[0, 0, 0]
+    if threads == 0:
+        threads = openmp.omp_get_max_threads()
+    for row in prange(rows, schedule='guided', num_threads=threads,
+                      nogil=True):
+        julia_row(&frame, c_r[row // height], c_i[row // height],
+                  counts_ptr + (row // height) * size, row % height)
+    return counts
+
 
 fractale_saver = s.Struct("dddhhI")
 cdef class Fractale:
     cdef:
         readonly double real, imaginary, pixel_size
         readonly short width, height
-        readonly unsigned int iterations
+        readonly unsigned int iterations, budget
+        readonly bint adaptive, resumable, symmetry
         readonly need_update
-        content
-        ModuloColoration color
+        readonly content
+        readonly str kernel, method
+        readonly unsigned long long computed_pixels, computed_iterations
+        readonly bint incremental
+        readonly object cache
+        readonly bint cancelled
+        readonly bint smoothing
+        readonly int threads, chunk
+        readonly str schedule
+        readonly smooth
+        readonly object metrics
+        readonly object history
+        np.ndarray rgb
+        int kernel_id, method_id, schedule_id
+        Frame previous
+        bint has_previous
+        tuple unresolved
+        Coloration color
 
-    def __init__(self, ModuloColoration color, real=0.0, imaginary=0.0,
+    def __init__(self, Coloration color, real=0.0, imaginary=0.0,
                  iterations=1_000, width=256, height=256,
-                 pixel_size=PIXEL_DEFAULT):
-        self.content = np.zeros((width, height), dtype=DTYPE)
+                 pixel_size=PIXEL_DEFAULT, kernel="scalar", method="pixel"):
+        self.content = np.zeros((height, width), dtype=DTYPE)
+        self.computed_pixels = 0
+        self.computed_iterations = 0
+        self.incremental = False
+        self.has_previous = False
+        self.cache = None
+        self.cancelled = False
+        self.smoothing = False
+        self.smooth = None
+        self.adaptive = False
+        self.resumable = False
+        self.symmetry = True
+        self.unresolved = None
+        self.metrics = None
+        self.history = new_history()
+        self.set_threads(DEFAULT_THREADS)
+        self.set_schedule(*DEFAULT_SCHEDULE)
+        self.rgb = None
+        self.set_kernel(kernel)
+        self.set_method(method)
         self.color = color
         self.real = real
         self.imaginary = imaginary
         self.iterations = iterations
+        self.budget = iterations
         self.width = width
         self.height = height
         self.pixel_size = pixel_size
@@ -107,6 +1339,14 @@ cdef class Fractale:
         color = type(self.color)()
         frac = type(self)(color)
         frac.from_bytes(data)
+        frac.set_kernel(self.kernel)
+        frac.set_method(self.method)
+        frac.set_smoothing(self.smoothing)
+        frac.set_adaptive(self.adaptive)
+        frac.set_resumable(self.resumable)
+        frac.set_symmetry(self.symmetry)
+        frac.set_threads(self.threads)
+        frac.set_schedule(self.schedule, self.chunk)
         return frac
 
     def drop(self, metadata, handler_progress = None):
@@ -119,42 +1359,50 @@ cdef class Fractale:
         compression = metadata["compression"]
         fractale = self.__copy__()
         open(metadata["path"], "a").close()  # test writable
-        if ext in ("png", "pns", "jpeg", "jpe", "jpeg"):
+        if ext == "png" and (metadata.get("tiled") or width > SHORT_MAX
+                             or height > SHORT_MAX):
+            fractale.export_tiled(path, width, height,
+                                  metadata.get("workers"))
+        elif ext in ("png", "pns", "jpeg", "jpe", "jpeg"):
             img: Image.Image = fractale.image_at_size(width, height)
             img.save(path, quality=compression)
             handler_progress(1, img)
         elif ext in ("gif", "mp4"):
-            pixel_size = fractale.pixel_size
-            speed = metadata["speed"] / 10
-            fractale.top()
-            fractale.resize(width, height)
-            img = fractale.image()
-            handler_progress(0, img)
             fps = metadata["fps"]
-            multi = 1 + speed / fps
-            start_pixel_size = fractale.pixel_size
-            s = log(start_pixel_size, multi)
-            e = log(pixel_size, multi)
+            states = fractale.zoom_states(width, height,
+                                          metadata["speed"] / 10, fps)
+            # GIF frames are written as indexes of the palette if any
+            palette = self.color.palette() if ext == "gif" else None
+            quality = metadata.get("quality")
+            if quality is None:
+                frames = fractale.render_states(
+                    [data for data, _ in states], metadata.get("workers"),
+                    palette is not None)
+            else:
+                frames = fractale.render_keyframes(
+                    [data for data, _ in states], metadata.get("workers"),
+                    palette is not None, quality)
+            img = frame_image(next(frames), palette)
+            handler_progress(0, img)
 
             def iterate_images():
                 progression = 0
-                yield fractale.image()
-                while fractale.pixel_size > pixel_size:
-                    fractale.middle_zoom(multi)
-                    p = log(fractale.pixel_size, multi)
-                    progression = max(0, min(((p - s) / (e - s), 1)))
+                frame_img = img
+                yield img
+                for (_, progression), frame in zip(states[1:], frames):
                     print(f"Progress : {progression * 100:.2f}%")
-                    img = fractale.image()
-                    handler_progress(progression, img)
-                    yield img
+                    frame_img = frame_image(frame, palette)
+                    handler_progress(progression, frame_img)
+                    yield frame_img
                 if progression != 1:
-                    handler_progress(1, fractale.image())
+                    handler_progress(1, frame_img)
 
             if ext == "gif":
-                img.save(metadata["path"], fromat='GIF', save_all=True,
-                         append_images=list(iterate_images()),
-                         optimize=True, duration=int(1000 / fps),
-                         loop=0, palette=Image.ADAPTIVE, disposal=1)
+                with GifWriter(path, width, height, int(1000 / fps),
+                               palette) as gif:
+                    gif.write(img)
+                    for frame in iterate_images():
+                        gif.write(frame)
             else:
                 codec = cv2.VideoWriter_fourcc(*'mp4v')
                 video = cv2.VideoWriter(path, codec, fps, (width, height))
@@ -165,6 +1413,169 @@ cdef class Fractale:
                                              cv2.COLOR_RGB2BGR))
                 video.release()
 
+    def tile_state(self, double x, double y, short width, short height,
+                   double pixel_size):
+        """
+        Return the bytes of the fractal of width x height pixels of
+        pixel_size whose center is x, y pixels away from the center.
+        """
+        return (fractale_saver.pack(self.real + x * pixel_size,
+                                    self.imaginary + y * pixel_size,
+                                    pixel_size, width, height,
+                                    self.iterations)
+                + self.to_bytes()[fractale_saver.size:])
+
+    def export_tiled(self, path, long long width, long long height,
+                     workers=None, directory=None, int level=6,
+                     int tile=EXPORT_TILE):
+        """
+        Render the view at width x height as a PNG, tile by tile on a
+        pool of processes. Escape counts are kept in np.memmap files in
+        directory, a temporary directory by default, then colored and
+        written by bands of EXPORT_ROWS rows so the memory stays bounded
+        whatever the size.
+        """
+        cdef double pixel_size = self.pixel_size * self.width / width
+        tiles = [(x0, y0, min(tile, width - x0), min(tile, height - y0))
+                 for y0 in range(0, height, tile)
+                 for x0 in range(0, width, tile)]
+        states = [self.tile_state(x0 + (w >> 1) - (width >> 1),
+                                  y0 + (h >> 1) - (height >> 1),
+                                  w, h, pixel_size)
+                  for x0, y0, w, h in tiles]
+        with TemporaryDirectory(dir=directory) as temporary:
+            content = np.memmap(os.path.join(temporary, "content.bin"),
+                                dtype=DTYPE, mode="w+",
+                                shape=(height, width))
+            smooth = None
+            if self.smoothing:
+                smooth = np.memmap(os.path.join(temporary, "smooth.bin"),
+                                   dtype=np.float32, mode="w+",
+                                   shape=(height, width))
+            frames = self.render_states(states, workers, counts=True)
+            for (x0, y0, w, h), (tile_content, tile_smooth) in zip(tiles,
+                                                                   frames):
+                content[y0:y0 + h, x0:x0 + w] = tile_content
+                if smooth is not None:
+                    smooth[y0:y0 + h, x0:x0 + w] = tile_smooth
+            self._write_png(path, content, smooth, level)
+            del content, smooth  # close the files before their removal
+
+    cdef void _write_png(self, path, content, smooth, int level):
+        """Color escape counts by bands of rows into a PNG."""
+        cdef Py_ssize_t height = content.shape[0], width = content.shape[1]
+        equalized = isinstance(self.color, HistogramColoration)
+        if equalized:
+            total = np.zeros(1, dtype=np.uint64)
+            for y0 in range(0, height, EXPORT_ROWS):
+                counts = (<HistogramColoration>self.color).histogram(
+                    np.asarray(content[y0:y0 + EXPORT_ROWS]))
+                if counts.shape[0] > total.shape[0]:
+                    total = np.pad(total, (0, counts.shape[0]
+                                           - total.shape[0]))
+                total[:counts.shape[0]] += counts
+            (<HistogramColoration>self.color).set_counts(total)
+        try:
+            rgb = None
+            with PngWriter(path, width, height, level) as png:
+                for y0 in range(0, height, EXPORT_ROWS):
+                    rgb = self.color.colorize(
+                        np.asarray(content[y0:y0 + EXPORT_ROWS]), rgb,
+                        None if smooth is None
+                        else np.asarray(smooth[y0:y0 + EXPORT_ROWS]))
+                    png.write(rgb)
+        finally:
+            if equalized:
+                (<HistogramColoration>self.color).set_counts(None)
+
+    def zoom_states(self, short width, short height, double speed,
+                    double fps):
+        """
+        Return the bytes and the progression of each frame of a zoom from
+        the top to the current position.
+        """
+        fractale = self.__copy__()
+        pixel_size = fractale.pixel_size
+        fractale.top()
+        fractale.resize(width, height)
+        multi = 1 + speed / fps
+        s = log(fractale.pixel_size, multi)
+        e = log(pixel_size, multi)
+        states = [(fractale.to_bytes(), 0)]
+        while fractale.pixel_size > pixel_size:
+            fractale.middle_zoom(multi)
+            p = log(fractale.pixel_size, multi)
+            states.append((fractale.to_bytes(),
+                           max(0, min(((p - s) / (e - s), 1)))))
+        return states
+
+    def render_keyframes(self, states, workers=None, indexed=False,
+                         double quality=1):
+        """
+        Yield the frames of fractals saved with to_bytes in order, like
+        render_states, but only render one keyframe every KEYFRAME_RATIO
+        zoom. Each frame resamples the escape counts of its keyframe
+        before the coloring, the quality in ]0, 1] scales the resolution
+        of keyframes.
+        """
+        plan = keyframe_plan(states, quality)
+        keyframes = self.render_states([key for key, _ in plan], workers,
+                                       counts=True)
+        palette = self.color.palette() if indexed else None
+        for (key, segment), (content, smooth) in zip(plan, keyframes):
+            _, _, key_pixel_size, key_width, key_height, _ = (
+                fractale_saver.unpack(key[:fractale_saver.size]))
+            for data in segment:
+                _, _, pixel_size, width, height, _ = fractale_saver.unpack(
+                    data[:fractale_saver.size])
+                selection = np.ix_(
+                    resample_indexes(height, pixel_size, key_height,
+                                     key_pixel_size),
+                    resample_indexes(width, pixel_size, key_width,
+                                     key_pixel_size))
+                frame = content[selection]
+                if palette is not None:
+                    yield self.color.indexes(frame)
+                else:
+                    yield self.color.colorize(
+                        frame, None,
+                        None if smooth is None else smooth[selection])
+
+    def render_states(self, states, workers=None, indexed=False,
+                      counts=False):
+        """
+        Yield the frames of fractals saved with to_bytes in order, like
+        render_state. Frames are rendered concurrently on a pool of
+        processes, at most FRAMES_PER_WORKER frames per worker wait to be
+        written. The threads of the fractal are shared between the
+        workers.
+        """
+        cdef int cpus = os.cpu_count() or 1, threads = self.threads
+        if workers is None:
+            workers = cpus
+        workers = max(1, min(workers, len(states)))
+        if workers != 1:
+            threads = max(1, min(threads or cpus, cpus // workers))
+        settings = (type(self), type(self.color), self.kernel, self.method,
+                    self.smoothing, self.adaptive, threads, self.schedule,
+                    self.chunk)
+        if workers == 1:
+            for data in states:
+                yield render_state(settings, data, indexed, counts)
+            return
+        with ProcessPoolExecutor(workers, initializer=set_threads,
+                                 initargs=(threads,)) as pool:
+            remaining = iter(states)
+            pending = deque(
+                pool.submit(render_state, settings, data, indexed, counts)
+                for data in islice(remaining, workers * FRAMES_PER_WORKER))
+            while pending:
+                frame = pending.popleft().result()
+                for data in islice(remaining, 1):
+                    pending.append(pool.submit(render_state, settings, data,
+                                               indexed, counts))
+                yield frame
+
     def __str__(self):
         return self.__repr__()
 
@@ -183,10 +1594,128 @@ cdef class Fractale:
         self.imaginary = imaginary
         self.need_update = True
 
+    cpdef set_pixel_size(self, double pixel_size):
+        """Set the size of a pixel in the complex plane."""
+        self.pixel_size = pixel_size
+        self.need_update = True
+
     cpdef set_iterations(self, unsigned int iterations):
         """Set max iterations."""
+        if iterations != self.iterations:
+            self.need_update = True
         self.iterations = iterations
 
+    cpdef set_adaptive(self, bint adaptive):
+        """
+        Estimate the iterations each compute needs, the iterations of the
+        fractal become the maximum. The pixels not escaped are continued
+        from their Z while raising the budget lets enough of them escape.
+        """
+        if adaptive != self.adaptive:
+            self.need_update = True
+        self.adaptive = adaptive
+
+    cpdef set_resumable(self, bint resumable):
+        """
+        Keep the Z of the pixels not escaped after each compute, a compute
+        of the same pixels with more iterations only continues them. The
+        pixels are iterated one by one, even with the batch kernel.
+        """
+        if not resumable:
+            self.unresolved = None
+        self.resumable = resumable
+
+    cpdef set_symmetry(self, bint symmetry):
+        """
+        Compute only one half of a frame centered on an axis of symmetry
+        of the fractal, the other half is mirrored.
+        """
+        self.symmetry = symmetry
+
+    cpdef set_kernel(self, str kernel):
+        """Set the escape-time kernel, one of KERNELS."""
+        if kernel not in KERNELS:
+            raise ValueError(f"unknown kernel {kernel!r}, "
+                             f"expected one of {KERNELS}")
+        self.kernel = kernel
+        self.kernel_id = KERNELS.index(kernel)
+        self.need_update = True
+
+    cpdef set_incremental(self, bint incremental):
+        """
+        Reuse the samples of the previous compute that fall exactly on a
+        pixel of the new frame, like after a pan or a zoom by 2.
+        """
+        self.incremental = incremental
+
+    cpdef set_cache(self, cache):
+        """
+        Set the TileCache used to serve tiles already computed,
+        None to disable it.
+        """
+        self.cache = cache
+
+    cpdef set_smoothing(self, bint smoothing):
+        """
+        Also compute the continuous escape count of each pixel in smooth,
+        used by the colorations that support it.
+        """
+        if smoothing and not self.smoothing:
+            self.need_update = True
+        if not smoothing:
+            self.smooth = None
+            self.has_previous = False
+        self.smoothing = smoothing
+
+    cpdef set_color(self, Coloration color):
+        """Set the coloration, the next image is only recolored."""
+        self.color = color
+
+    cpdef set_method(self, str method):
+        """Set the rendering method, one of METHODS."""
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}, "
+                             f"expected one of {METHODS}")
+        self.method = method
+        self.method_id = METHODS.index(method)
+        self.need_update = True
+
+    cpdef set_threads(self, int threads):
+        """
+        Set the number of threads of the computes, 0 for every thread
+        OpenMP allows.
+        """
+        if threads < 0:
+            raise ValueError(f"invalid number of threads {threads}")
+        self.threads = threads
+
+    cpdef set_schedule(self, str schedule, int chunk=0):
+        """
+        Set how the blocks of pixels are shared between the threads, one
+        of SCHEDULES, with chunk blocks at once or 0 for the default.
+        Ignored without OpenMP 3.0, like with MSVC, the blocks are then
+        shared with the guided schedule.
+        """
+        if schedule not in SCHEDULES:
+            raise ValueError(f"unknown schedule {schedule!r}, "
+                             f"expected one of {SCHEDULES}")
+        if chunk < 0:
+            raise ValueError(f"invalid chunk size {chunk}")
+        self.schedule = schedule
+        self.schedule_id = SCHEDULES.index(schedule)
+        self.chunk = chunk
+
+    cdef int _parallel(self):
+        """
+        Apply the schedule to the next parallel loops of the calling
+        thread, return their number of threads.
+        """
+        # OpenMP schedule kinds start at 1 in the order of SCHEDULES
+        set_runtime_schedule(self.schedule_id + 1, self.chunk)
+        if self.threads > 0:
+            return self.threads
+        return openmp.omp_get_max_threads()
+
     cpdef resize(self, short width, short height):
         """Resize width and height, and adjust the zoom if necessary."""
         cdef:
@@ -205,7 +1734,7 @@ cdef class Fractale:
         """Total number of iterations."""
         cdef unsigned long long sum_
         sum_ = np.sum(self.content)
-        sum_ += np.count_nonzero(self.content == 0) * self.iterations
+        sum_ += np.count_nonzero(self.content == 0) * self.budget
         return sum_
 
     cpdef iterations_per_pixel(self):
@@ -229,26 +1758,84 @@ cdef class Fractale:
     cpdef image(self):
         """
         Compute image if there is update otherwise just do the coloring.
+        The RGB image is a copy, kept as is by the next colorings.
+        """
+        return self._image(True)
+
+    cpdef image_view(self):
+        """
+        Same as image but without copy, the RGBA image shares the buffer
+        of the fractal and the next coloring overwrites it.
         """
-        cdef np.ndarray[COLORTYPE_t, ndim=3] colored
+        return self._image(False)
+
+    cdef _image(self, bint copy):
+        """Compute, color and record the metrics of an image."""
+        cdef:
+            double start = perf_counter(), computed, colored
+            bint fresh = self.need_update
         if self.need_update:
             self._compute()
             self.need_update = False
-        colored = self.color.colorize(self.content)
-        return Image.fromarray(colored, 'RGB')
+        computed = perf_counter()
+        if (self.rgb is None or (<object>self.rgb).shape[:2]
+                != (<object>self.content).shape):
+            self.rgb = rgba_buffer(self.content.shape[0],
+                                   self.content.shape[1])
+        self.color.colorize(self.content, self.rgb, self.smooth)
+        colored = perf_counter()
+        img = rgba_image(self.rgb)
+        if copy:
+            img = img.convert('RGB')
+        self._record(computed - start, colored - computed,
+                     perf_counter() - colored, fresh)
+        return img
+
+    cdef _record(self, double compute, double colorize, double convert,
+                 bint computed):
+        """Keep the metrics of an image in the rolling history."""
+        self.metrics = RenderMetrics(
+            compute, colorize, convert,
+            self.computed_iterations if computed else 0,
+            self.computed_pixels if computed else 0)
+        self.history.append(self.metrics)
+
+    cpdef tuple counts(self):
+        """
+        Compute if there is update and return the escape counts and the
+        smooth counts, None unless smoothing.
+        """
+        if self.need_update:
+            self._compute()
+            self.need_update = False
+        return self.content, self.smooth
+
+    cpdef indexes(self):
+        """
+        Compute if there is update and return the index of each pixel in
+        the palette of the coloration.
+        """
+        if self.need_update:
+            self._compute()
+            self.need_update = False
+        return self.color.indexes(self.content)
 
     cpdef image_at_size(self, short width, short height):
         """
-        Get image with specific size.
+        Get RGB image with specific size.
         """
         cdef:
             np.ndarray[DTYPE_t, ndim=2] content_copy
+            object smooth_copy = self.smooth
             short x
             short w_copy = self.width
             short h_copy = self.height
             double real_copy = self.real
             double imaginary_copy = self.imaginary
             double pixel_copy = self.pixel_size
+            Frame previous_copy = self.previous
+            bint has_previous_copy = self.has_previous
+            tuple unresolved_copy = self.unresolved
 
         if w_copy != width or h_copy != height:
             content_copy = self.content.copy()
@@ -258,8 +1845,12 @@ cdef class Fractale:
             self.imaginary = imaginary_copy
             self.pixel_size = pixel_copy
             self.content = content_copy
+            self.smooth = smooth_copy
             self.width = w_copy
             self.height = h_copy
+            self.previous = previous_copy
+            self.has_previous = has_previous_copy
+            self.unresolved = unresolved_copy
         else:
             img = self.image()
         return img
@@ -298,9 +1889,479 @@ cdef class Fractale:
         self.pixel_size = PIXEL_DEFAULT
         self.need_update = True
 
+    cdef void _frame(self, Frame* frame):
+        """Fill the frame with the parameters of the fractal."""
+        frame.real = self.real
+        frame.imaginary = self.imaginary
+        frame.x_center = self.width >> 1
+        frame.y_center = self.height >> 1
+        frame.pixel_size = self.pixel_size
+        frame.iterations = self.iterations
+        frame.kernel_id = self.kernel_id
+        frame.width = self.width
+        frame.height = self.height
+        frame.julia = False
+        frame.c_r = 0
+        frame.c_i = 0
+        frame.ref_r = NULL
+        frame.ref_i = NULL
+        frame.ref_length = 0
+        frame.smooth = NULL
+        frame.z_r = NULL
+        frame.z_i = NULL
+        frame.work = NULL
+
+    cdef void _before_compute(self):
+        """Hook called before the frame of a new compute is built."""
+        pass
+
     cdef np.ndarray[DTYPE_t, ndim=2] _compute(self):
         """Compute fractale."""
-        raise NotImplementedError()
+        cdef:
+            Frame frame, half
+            int rows
+            unsigned long long count = 0
+        self._before_compute()
+        self._frame(&frame)
+        work = self._new_work(&frame)
+        if self.adaptive:
+            frame.iterations = self._estimate(&frame)
+        content = np.zeros((frame.height, frame.width), dtype=DTYPE)
+        smooth = self._new_smooth(&frame)
+        state = self._new_state(&frame)
+        missing = None
+        done = self._continue(&frame, content, smooth, state, False, &count)
+        if done is None:
+            done, missing = self._prepare(&frame, content, smooth)
+        rows = self._unique_rows(&frame)
+        half = frame
+        half.height = rows
+        count += self._iterate(&half, content[:rows],
+                               None if done is None else done[:rows], False)
+        if self.adaptive and state is not None:
+            self._extend(&half, content[:rows], state[0, :rows], False)
+            frame.iterations = half.iterations
+        count += self._mirror(&frame, content, smooth, state, done, rows)
+        self._store(&frame, content, smooth, missing, count, state, work)
+        return content
+
+    cdef int _unique_rows(self, Frame* frame):
+        """
+        Number of rows to compute, the following ones are the mirror of
+        the previous ones when the frame is symmetric.
+        """
+        if (not self.symmetry
+                or frame_symmetry(frame) == SYMMETRY_NONE):
+            return frame.height
+        return frame.y_center + 1
+
+    cdef unsigned long long _mirror(self, Frame* frame, np.ndarray content,
+                                    smooth, state, done, int rows):
+        """
+        Copy the unique rows of a symmetric frame onto the other ones,
+        the pixels without opposite are computed when not done. Return
+        the number of pixels iterated.
+        """
+        cdef:
+            int y
+            int symmetry = frame_symmetry(frame)
+            int first = 2 * frame.x_center + 1 - frame.width
+            unsigned long long count = 0
+            DTYPE_t[:, ::1] content_view = content
+            unsigned char[:, ::1] done_view
+            unsigned char* done_ptr = NULL
+        if rows >= frame.height:
+            return 0
+        for array in (content, smooth, state):
+            if array is not None:
+                mirror_rows(array, symmetry, frame.x_center, frame.y_center,
+                            rows)
+        if state is not None and symmetry == SYMMETRY_CONJUGATE:
+            state[1, rows:] *= -1
+        if symmetry == SYMMETRY_POINT and first != 0:
+            if done is not None:
+                done_view = done
+                done_ptr = &done_view[0, 0]
+            for y in range(rows, frame.height):
+                count += escape_row(frame, &content_view[0, 0], done_ptr, y,
+                                    0, first, 1)
+        return count
+
+    cdef object _new_work(self, Frame* frame):
+        """
+        Return the iterations done by each thread of a new compute and
+        point the frame on them.
+        """
+        cdef unsigned long long[::1] view
+        work = np.zeros(max(1, self._parallel()) * WORK_STRIDE,
+                        dtype=np.uint64)
+        view = work
+        frame.work = &view[0]
+        return work
+
+    cdef object _new_smooth(self, Frame* frame):
+        """
+        Return the smooth counts of a new compute and point the frame on
+        them, or None when smoothing is disabled.
+        """
+        cdef float[:, ::1] view
+        frame.smooth = NULL
+        if not self.smoothing:
+            return None
+        smooth = np.zeros((frame.height, frame.width), dtype=np.float32)
+        if frame.width != 0 and frame.height != 0:
+            view = smooth
+            frame.smooth = &view[0, 0]
+        return smooth
+
+    cdef object _new_state(self, Frame* frame):
+        """
+        Return the Z of each pixel of an adaptive or resumable compute,
+        NaN until iterated, and point the frame on them, or None when the
+        pixels are not continued. Perturbation frames are never continued.
+        """
+        cdef double[:, :, ::1] view
+        frame.z_r = NULL
+        frame.z_i = NULL
+        if (not (self.adaptive or self.resumable) or frame.ref_length != 0
+                or frame.width == 0 or frame.height == 0):
+            return None
+        state = np.full((2, frame.height, frame.width), np.nan)
+        view = state
+        frame.z_r = &view[0, 0, 0]
+        frame.z_i = &view[1, 0, 0]
+        return state
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cdef unsigned int _estimate(self, Frame* frame):
+        """
+        Iterations of an adaptive compute: a guess from the depth of the
+        zoom, raised to twice the slowest escape of a sparse sample of the
+        frame, at most the iterations of the fractal.
+        """
+        cdef:
+            Frame sample = frame[0]
+            double depth = max(0.0, log10(PIXEL_DEFAULT / frame.pixel_size))
+            unsigned long long guess = <unsigned long long>(
+                ADAPTIVE_BASE * (1 + depth))
+            int threads = self._parallel()
+            np.ndarray[DTYPE_t, ndim=2] counts
+        sample.width = (frame.width + ADAPTIVE_SAMPLE - 1) // ADAPTIVE_SAMPLE
+        sample.height = ((frame.height + ADAPTIVE_SAMPLE - 1)
+                         // ADAPTIVE_SAMPLE)
+        sample.pixel_size = frame.pixel_size * ADAPTIVE_SAMPLE
+        sample.x_center = frame.x_center // ADAPTIVE_SAMPLE
+        sample.y_center = frame.y_center // ADAPTIVE_SAMPLE
+        sample.iterations = min(guess * ADAPTIVE_SAMPLE, self.iterations)
+        sample.smooth = NULL
+        sample.z_r = NULL
+        sample.z_i = NULL
+        if sample.width != 0 and sample.height != 0:
+            counts = np.zeros((sample.height, sample.width), dtype=DTYPE)
+            with nogil:
+                escape_blocks(&sample, &counts[0, 0], NULL, 1, threads, NULL)
+            guess = max(guess, 2 * <unsigned long long>counts.max())
+        return max(1, min(guess, self.iterations))
+
+    cdef object _continue(self, Frame* frame, np.ndarray content, smooth,
+                          state, bint cancellable,
+                          unsigned long long* count):
+        """
+        When the frame only raises the iterations of the previous compute,
+        copy its results and continue its unresolved pixels from their
+        saved Z. Return the mask of the pixels done, the ones never
+        iterated like the filled ones are left to the rendering method,
+        or None when the frame is not continued.
+        """
+        cdef Frame* old = &self.previous
+        if (state is None or self.unresolved is None or not self.has_previous
+                or old.iterations >= frame.iterations
+                or not same_pixels(frame, old)):
+            return None
+        indexes, z_r, z_i = self.unresolved
+        content[...] = self.content
+        if smooth is not None:
+            smooth[...] = self.smooth
+        state[0].ravel()[indexes] = z_r
+        state[1].ravel()[indexes] = z_i
+        pending = indexes[np.isfinite(z_r)]
+        self._resume(frame, content, pending, old.iterations, cancellable)
+        count[0] += pending.size
+        done = np.ones((frame.height, frame.width), dtype=np.uint8)
+        done.ravel()[indexes[np.isnan(z_r)]] = 0
+        return done
+
+    cdef void _extend(self, Frame* frame, np.ndarray content,
+                      np.ndarray z_r, bint cancellable):
+        """
+        Raise the iterations of the frame up to the iterations of the
+        fractal, each raise only continues the pixels not escaped yet and
+        stops once too few of them escape.
+        """
+        cdef:
+            unsigned int start
+            unsigned long long escaped
+            double pixels = frame.width * frame.height
+        while frame.iterations < self.iterations:
+            pending = np.flatnonzero((content == 0) & ~np.isinf(z_r))
+            if pending.size == 0 or cancellable and self.cancelled:
+                return
+            start = frame.iterations
+            frame.iterations = min(
+                <unsigned long long>start * ADAPTIVE_GROWTH, self.iterations)
+            escaped = self._resume(frame, content, pending, start,
+                                   cancellable)
+            if escaped < pixels * ADAPTIVE_TOLERANCE:
+                return
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cdef unsigned long long _resume(
+            self, Frame* frame, np.ndarray[DTYPE_t, ndim=2] content,
+            np.ndarray[np.intp_t, ndim=1] pending, unsigned int start,
+            bint cancellable):
+        """
+        Continue the pending pixels after start iterations, return the
+        number of pixels that escaped.
+        """
+        cdef:
+            int threads = self._parallel()
+            unsigned long long escaped
+            bint* cancelled = &self.cancelled if cancellable else NULL
+        if pending.shape[0] == 0:
+            return 0
+        with nogil:
+            escaped = resume_pixels(frame, &content[0, 0], &pending[0],
+                                    pending.shape[0], start, threads,
+                                    cancelled)
+        return escaped
+
+    def progressive(self, steps=PROGRESSIVE_STEPS):
+        """
+        Yield images from coarse to fine during the compute, each pass
+        reuses the samples of the previous ones. The last image is the
+        full image, shared with the fractal like image_view. Stop without
+        result when cancelled.
+        """
+        cdef:
+            Frame frame, half
+            unsigned long long count = 0
+            int step, rows, first
+            double start, compute = 0, computed, colored
+        if not self.need_update:
+            yield self.image_view()
+            return
+        start = perf_counter()
+        self._before_compute()
+        self._frame(&frame)
+        work = self._new_work(&frame)
+        if self.adaptive:
+            frame.iterations = self._estimate(&frame)
+        content = np.zeros((frame.height, frame.width), dtype=DTYPE)
+        smooth = self._new_smooth(&frame)
+        state = self._new_state(&frame)
+        missing = None
+        done = self._continue(&frame, content, smooth, state, True, &count)
+        if done is not None:
+            steps = ()  # the previous image is already a full preview
+        else:
+            done, missing = self._prepare(&frame, content, smooth)
+            if done is None:
+                done = np.zeros((frame.height, frame.width), dtype=np.uint8)
+        rows = self._unique_rows(&frame)
+        half = frame
+        half.height = rows
+        for step in steps:
+            count += self._sample(&half, content[:rows], done[:rows], step)
+            compute += perf_counter() - start
+            if self.cancelled:
+                return
+            preview = np.repeat(np.repeat(content[::step, ::step], step,
+                                          axis=0), step, axis=1)
+            preview = np.ascontiguousarray(
+                preview[:frame.height, :frame.width])
+            if rows < frame.height:
+                mirror_rows(preview, frame_symmetry(&frame), frame.x_center,
+                            frame.y_center, rows)
+                # the column without opposite is shown like its neighbour
+                first = 2 * frame.x_center + 1 - frame.width
+                preview[rows:, :first] = preview[rows:, first:first + 1]
+            # each image has its own buffer, the previous ones may still
+            # wait to be displayed by another thread
+            yield rgba_image(self.color.colorize(
+                preview, rgba_buffer(frame.height, frame.width)))
+            start = perf_counter()
+        count += self._iterate(&half, content[:rows], done[:rows], True)
+        if self.adaptive and state is not None:
+            self._extend(&half, content[:rows], state[0, :rows], True)
+            frame.iterations = half.iterations
+        if self.cancelled:
+            return
+        count += self._mirror(&frame, content, smooth, state, done, rows)
+        self._store(&frame, content, smooth, missing, count, state, work)
+        self.need_update = False
+        computed = perf_counter()
+        compute += computed - start
+        self.rgb = self.color.colorize(
+            content, rgba_buffer(frame.height, frame.width), smooth)
+        colored = perf_counter()
+        img = rgba_image(self.rgb)
+        self._record(compute, colored - computed, perf_counter() - colored,
+                     True)
+        yield img
+
+    cpdef set_cancelled(self, bint cancelled):
+        """Cancel or allow the progressive compute."""
+        self.cancelled = cancelled
+
+    cdef tuple _prepare(self, Frame* frame, np.ndarray content, smooth):
+        """
+        Fill content with samples from the previous compute and the cache,
+        return the mask of the pixels done and the tiles missing in cache.
+        Tiles only hold escape counts of known iterations so the cache is
+        skipped when smooth counts are computed or when adaptive.
+        """
+        done = None
+        if (self.incremental and self.has_previous
+                and same_parameters(frame, &self.previous)):
+            done = self._remap(frame, content, smooth)
+        missing = None
+        if self.cache is not None and smooth is None and not self.adaptive:
+            if done is None:
+                done = np.zeros((frame.height, frame.width), dtype=np.uint8)
+            missing = self._cached_tiles(frame, content, done)
+        return done, missing
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cdef unsigned long long _iterate(
+            self, Frame* frame, np.ndarray[DTYPE_t, ndim=2] content,
+            np.ndarray[np.uint8_t, ndim=2] done, bint cancellable):
+        """
+        Compute every pixel not done with the rendering method,
+        return the number of pixels iterated.
+        """
+        cdef:
+            int threads = self._parallel()
+            unsigned long long count
+            DTYPE_t* content_ptr
+            unsigned char* done_ptr = NULL
+            bint* cancelled = &self.cancelled if cancellable else NULL
+        if frame.width == 0 or frame.height == 0:
+            return 0
+        if self.method_id == METHOD_SUBDIVISION and done is None:
+            done = np.zeros((frame.height, frame.width), dtype=np.uint8)
+        content_ptr = &content[0, 0]
+        if done is not None:
+            done_ptr = &done[0, 0]
+        with nogil:
+            if self.method_id == METHOD_SUBDIVISION:
+                count = subdivide_tiles(frame, content_ptr, done_ptr, threads,
+                                        cancelled)
+            else:
+                count = escape_blocks(frame, content_ptr, done_ptr, 1,
+                                      threads, cancelled)
+        return count
+
+    @cython.boundscheck(False)  # turn off bounds-checking
+    @cython.wraparound(False)  # turn off negative index wrapping
+    cdef unsigned long long _sample(
+            self, Frame* frame, np.ndarray[DTYPE_t, ndim=2] content,
+            np.ndarray[np.uint8_t, ndim=2] done, int step):
+        """
+        Compute the pixels not done on a grid of step pixels,
+        return the number of pixels iterated.
+        """
+        cdef:
+            int threads = self._parallel()
+            unsigned long long count
+        if frame.width == 0 or frame.height == 0:
+            return 0
+        with nogil:
+            count = escape_blocks(frame, &content[0, 0], &done[0, 0], step,
+                                  threads, &self.cancelled)
+        return count
+
+    cdef void _store(self, Frame* frame, np.ndarray content, smooth,
+                     list missing, unsigned long long count, state, work):
+        """
+        Keep the result of a compute, put missing tiles in cache. When
+        resumable, only the Z of the pixels not escaped are kept.
+        """
+        if missing:
+            for key, x0, y0, w, h in missing:
+                self.cache.put(key, content[y0:y0 + h, x0:x0 + w].copy())
+        self.content = content
+        self.smooth = smooth
+        self.computed_pixels = count
+        self.computed_iterations = int(work.sum())
+        self.budget = frame.iterations
+        self.unresolved = None
+        if self.resumable and state is not None:
+            indexes = np.flatnonzero(content == 0)
+            self.unresolved = (indexes, state[0].ravel()[indexes],
+                               state[1].ravel()[indexes])
+        self.previous = frame[0]
+        self.has_previous = frame.width != 0 and frame.height != 0
+
+    cdef tuple _cache_prefix(self, Frame* frame):
+        """Part of the cache key of tiles shared by the whole frame."""
+        return (type(self).__name__, self.kernel, self.method, frame.c_r,
+                frame.c_i, frame.iterations,
+                float(f"{frame.pixel_size:.12e}"))
+
+    cdef list _cached_tiles(self, Frame* frame, np.ndarray content,
+                            np.ndarray done):
+        """
+        Copy tiles found in cache into content and mark them as done,
+        return the list of missing tiles with their keys. Tiles are cut
+        on a grid of the plane so that a pan finds the tiles of the
+        previous views, the tiles on the edges of the frame are partial.
+        """
+        cdef:
+            int x0, y0, w, h
+            double x_origin = frame.real / frame.pixel_size - frame.x_center
+            double y_origin = (frame.imaginary / frame.pixel_size
+                               - frame.y_center)
+        prefix = self._cache_prefix(frame)
+        missing = []
+        for x0, w in tile_spans(x_origin, frame.width):
+            for y0, h in tile_spans(y_origin, frame.height):
+                # tiles closer than REMAP_TOLERANCE pixel share the same key
+                key = prefix + (round(x_origin + x0, 6),
+                                round(y_origin + y0, 6), w, h)
+                tile = self.cache.get(key)
+                if tile is None:
+                    missing.append((key, x0, y0, w, h))
+                else:
+                    content[y0:y0 + h, x0:x0 + w] = tile
+                    done[y0:y0 + h, x0:x0 + w] = 1
+        return missing
+
+    cdef np.ndarray _remap(self, Frame* frame, np.ndarray content, smooth):
+        """
+        Copy the samples of the previous compute still valid in the frame
+        into content and smooth, return the mask of copied pixels.
+        """
+        cdef Frame* old = &self.previous
+        done = np.zeros((frame.height, frame.width), dtype=np.uint8)
+        xs = remap_indexes(pixel_real(frame, 0), frame.pixel_size,
+                           frame.width, pixel_real(old, 0), old.pixel_size,
+                           old.width)
+        ys = remap_indexes(pixel_imaginary(frame, 0), frame.pixel_size,
+                           frame.height, pixel_imaginary(old, 0),
+                           old.pixel_size, old.height)
+        new_xs, = np.nonzero(xs >= 0)
+        new_ys, = np.nonzero(ys >= 0)
+        if new_xs.size and new_ys.size:
+            selection = np.ix_(new_ys, new_xs)
+            old_selection = np.ix_(ys[new_ys], xs[new_xs])
+            content[selection] = self.content[old_selection]
+            if smooth is not None:
+                smooth[selection] = self.smooth[old_selection]
+            done[selection] = 1
+        return done
 
     cpdef real_at_x(self, short x):
         """Return real part of Z at x in image."""
@@ -344,13 +2405,13 @@ julia_saver = s.Struct("dd")
 cdef class Julia(Fractale):
     cdef:
         readonly double c_r, c_i
-    def __init__(self, color: ModuloColoration, c_r=0, c_i=0, real=0,
+    def __init__(self, color: Coloration, c_r=0, c_i=0, real=0,
                  imaginary=0, iterations=1_000, width=48, height=48,
-                 pixel_size=PIXEL_DEFAULT):
+                 pixel_size=PIXEL_DEFAULT, kernel="scalar", method="pixel"):
         self.c_r = c_r
         self.c_i = c_i
         super().__init__(color, real, imaginary, iterations, width,
-                         height, pixel_size)
+                         height, pixel_size, kernel, method)
 
     cpdef set_c_r(self, double c_r):
         """Set real part of C."""
@@ -375,55 +2436,194 @@ cdef class Julia(Fractale):
     cpdef bytes_size(self):
         return super(Julia, self).bytes_size() + julia_saver.size
 
-    @cython.boundscheck(False)  # turn off bounds-checking
-    @cython.wraparound(False)  # turn off negative index wrapping
-    cdef np.ndarray[DTYPE_t, ndim=2] _compute(self):
-        """Compute fractal."""
-        cdef:
-            double z_r, z_i, tmp, x_start, y_start
-            double real = self.real
-            double imaginary = self.imaginary
-            double pixel_size = self.pixel_size
-            double c_r = self.c_r
-            double c_i = self.c_i
-            short width = self.width, height = self.height
-            short y, x
-            unsigned int i, iterations = self.iterations
-            np.ndarray[DTYPE_t, ndim=2] content = np.zeros((width, height),
-                                                           dtype=DTYPE)
-        x_start = real - (width >> 1) * pixel_size
-        y_start = imaginary - (height >> 1) * pixel_size
-        for x in prange(width, schedule='guided', nogil=True):
-            z_r = x_start + x * pixel_size
-            for y in range(height):
-                z_i = y_start + y * pixel_size
-                content[x, y] = iterate(z_r, z_i, c_r, c_i, iterations)
-        self.content = content
+    cdef void _frame(self, Frame* frame):
+        """Fill the frame with the parameters of the fractal."""
+        Fractale._frame(self, frame)
+        frame.julia = True
+        frame.c_r = self.c_r
+        frame.c_i = self.c_i
 
 
 cdef class Mandelbrot(Fractale):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    @cython.boundscheck(False)  # turn off bounds-checking
-    @cython.wraparound(False)  # turn off negative index wrapping
-    cdef np.ndarray[DTYPE_t, ndim=2] _compute(self):
-        """Compute mandelbrot fractale."""
+
+deep_saver = s.Struct("HH")
+cdef class DeepMandelbrot(Mandelbrot):
+    """
+    Mandelbrot for deep zoom, the center is kept in high precision and
+    pixels are iterated in double precision as a delta against one
+    reference orbit computed at the center.
+    """
+    cdef:
+        readonly object center_real, center_imaginary
+        np.ndarray reference_r, reference_i
+
+    def __init__(self, Coloration color, real=0, imaginary=0,
+                 *args, **kwargs):
+        super().__init__(color, float(real), float(imaginary),
+                         *args, **kwargs)
+        self.set_center(real, imaginary)
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__} "
+                f"pixel_size={self.pixel_size} "
+                f"{self.center_real}{self.center_imaginary:+}i>")
+
+    @property
+    def precision(self):
+        """Number of significant digits needed at the current zoom."""
+        return max(30, int(-log10(self.pixel_size)) + 20)
+
+    cpdef set_center(self, real, imaginary):
+        """Set the center from decimal strings, floats or Decimal."""
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            self.center_real = +Decimal(real)
+            self.center_imaginary = +Decimal(imaginary)
+        self.real = float(self.center_real)
+        self.imaginary = float(self.center_imaginary)
+        self.need_update = True
+
+    cpdef set_real(self, double real):
+        """Set real part of Z."""
+        self.set_center(real, self.center_imaginary)
+
+    cpdef set_imaginary(self, double imaginary):
+        """Set imaginary part of Z."""
+        self.set_center(self.center_real, imaginary)
+
+    cpdef zoom(self, short x, short y, double multiplier):
+        """Zoom at a position in the image."""
+        cdef double pixel = self.pixel_size
+        if -1e-09 < multiplier < 1e-09:
+            raise ZeroDivisionError(
+                f"the multiplier is too close to zero ({multiplier})")
+        self.pixel_size /= multiplier
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            factor = Decimal(pixel) * (1 - 1 / Decimal(multiplier))
+            real = self.center_real + (x - Decimal(self.width) / 2) * factor
+            imaginary = (self.center_imaginary
+                         + (y - Decimal(self.height) / 2) * factor)
+            if self.pixel_size > MIN_PIXEL_SIZE:
+                real *= Decimal(MIN_PIXEL_SIZE) / Decimal(self.pixel_size)
+                imaginary *= (Decimal(MIN_PIXEL_SIZE)
+                              / Decimal(self.pixel_size))
+                self.pixel_size = MIN_PIXEL_SIZE
+        self.set_center(real, imaginary)
+
+    cpdef reset(self):
+        """Reset position and pixel size."""
+        Mandelbrot.reset(self)
+        self.set_center(0, 0)
+
+    cpdef image_at_size(self, short width, short height):
+        """
+        Get image with specific size.
+        """
+        real, imaginary = self.center_real, self.center_imaginary
+        img = Mandelbrot.image_at_size(self, width, height)
+        self.center_real, self.center_imaginary = real, imaginary
+        return img
+
+    cpdef real_at_x(self, short x):
+        """Return real part of Z at x in image."""
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            return float(self.center_real
+                         + Decimal((x - self.width / 2) * self.pixel_size))
+
+    cpdef imaginary_at_y(self, short y):
+        """Return imaginary part of Z at y in image."""
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            return float(self.center_imaginary
+                         + Decimal((y - self.height / 2) * self.pixel_size))
+
+    cpdef to_bytes(self):
+        """Return bytes representative of the fractal."""
+        real = str(self.center_real).encode("ascii")
+        imaginary = str(self.center_imaginary).encode("ascii")
+        return (Mandelbrot.to_bytes(self)
+                + deep_saver.pack(len(real), len(imaginary))
+                + real + imaginary)
+
+    cpdef from_bytes(self, bytes bytes_):
+        """Load data on the fractal."""
+        cdef Py_ssize_t start = Mandelbrot.bytes_size(self)
+        cdef Py_ssize_t middle = start + deep_saver.size
+        len_real, len_imaginary = deep_saver.unpack(bytes_[start:middle])
+        real = bytes_[middle:middle + len_real].decode("ascii")
+        imaginary = bytes_[middle + len_real:
+                           middle + len_real + len_imaginary].decode("ascii")
+        self.pixel_size = fractale_saver.unpack(
+            bytes_[:fractale_saver.size])[2]
+        self.set_center(real, imaginary)
+        Mandelbrot.from_bytes(self, bytes_[:start])
+
+    cpdef bytes_size(self):
+        return len(self.to_bytes())
+
+    cdef void _reference_orbit(self):
+        """Compute the orbit of the center in high precision."""
         cdef:
-            double c_r, c_i, z_r, z_i, tmp, x_start, y_start
-            double real = self.real
-            double imaginary = self.imaginary
-            double pixel_size = self.pixel_size
-            short y, x
-            unsigned int i, iterations = self.iterations
-            short width = self.width, height = self.height
-            np.ndarray[DTYPE_t, ndim=2] content = np.zeros((width, height),
-                                                           dtype=DTYPE)
-        x_start = real - (width >> 1) * pixel_size
-        y_start = imaginary - (height >> 1) * pixel_size
-        for x in prange(width, schedule='guided', nogil=True):
-            c_r = x_start + x * pixel_size
-            for y in range(height):
-                c_i = y_start + y * pixel_size
-                content[x, y] = iterate(0, 0, c_r, c_i, iterations)
-        self.content = content
+            unsigned int n, iterations = self.iterations
+            np.ndarray[np.float64_t, ndim=1] ref_r, ref_i
+        ref_r = np.zeros(iterations + 1, dtype=np.float64)
+        ref_i = np.zeros(iterations + 1, dtype=np.float64)
+        n = 0
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            c_r, c_i = self.center_real, self.center_imaginary
+            z_r = z_i = Decimal(0)
+            while n < iterations:
+                z_r, z_i = z_r * z_r - z_i * z_i + c_r, 2 * z_r * z_i + c_i
+                n += 1
+                ref_r[n] = float(z_r)
+                ref_i[n] = float(z_i)
+                if ref_r[n] * ref_r[n] + ref_i[n] * ref_i[n] > 4:
+                    break
+        self.reference_r = ref_r[:n + 1]
+        self.reference_i = ref_i[:n + 1]
+
+    cdef void _frame(self, Frame* frame):
+        """Fill the frame with the parameters of the fractal."""
+        cdef np.float64_t[::1] ref_r, ref_i
+        if self.reference_r is None:
+            self._reference_orbit()
+        ref_r = self.reference_r
+        ref_i = self.reference_i
+        Mandelbrot._frame(self, frame)
+        frame.real = 0
+        frame.imaginary = 0
+        frame.ref_r = &ref_r[0]
+        frame.ref_i = &ref_i[0]
+        frame.ref_length = ref_r.shape[0]
+
+    def tile_state(self, double x, double y, short width, short height,
+                   double pixel_size):
+        """
+        Return the bytes of the fractal of width x height pixels of
+        pixel_size whose center is x, y pixels away from the center.
+        """
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            real = str(self.center_real + Decimal(x) * Decimal(pixel_size))
+            imaginary = str(self.center_imaginary
+                            + Decimal(y) * Decimal(pixel_size))
+        real, imaginary = real.encode("ascii"), imaginary.encode("ascii")
+        return (Mandelbrot.tile_state(self, x, y, width, height, pixel_size)
+                [:Mandelbrot.bytes_size(self)]
+                + deep_saver.pack(len(real), len(imaginary))
+                + real + imaginary)
+
+    cdef tuple _cache_prefix(self, Frame* frame):
+        """Part of the cache key of tiles shared by the whole frame."""
+        return Mandelbrot._cache_prefix(self, frame) + (
+            str(self.center_real), str(self.center_imaginary))
+
+    cdef void _before_compute(self):
+        """Compute the reference orbit of the new frame."""
+        self._reference_orbit()
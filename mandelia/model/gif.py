@@ -0,0 +1,127 @@
+"""Streaming GIF encoder."""
+import struct
+from io import BytesIO
+from types import TracebackType
+from typing import BinaryIO, Optional, Type
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+PALETTE_SIZE = 256
+EXTENSION = 0x21
+CONTROL = 0xf9  # label of the graphic control extension
+DESCRIPTOR = 0x2c
+
+
+def skip_blocks(data: bytes, offset: int) -> int:
+    """Return the offset after the data sub-blocks at offset."""
+    while data[offset]:
+        offset += data[offset] + 1
+    return offset + 1
+
+
+def frame_blocks(data: bytes) -> bytes:
+    """
+    Return the graphic control extension, the image descriptor, the
+    local color table and the image data of the first frame of a GIF,
+    without its header, its other extensions nor its trailer.
+    """
+    offset = 13
+    if data[10] & 0x80:
+        offset += 3 << ((data[10] & 0x07) + 1)
+    control = b""
+    while data[offset] == EXTENSION:
+        end = skip_blocks(data, offset + 2)
+        if data[offset + 1] == CONTROL:
+            control = data[offset:end]
+        offset = end
+    if data[offset] != DESCRIPTOR:
+        raise ValueError("Bloc GIF inattendu")
+    start, flags = offset, data[offset + 9]
+    offset += 10
+    if flags & 0x80:
+        offset += 3 << ((flags & 0x07) + 1)
+    # LZW minimum code size then the image data
+    return control + data[start:skip_blocks(data, offset + 1)]
+
+
+class GifWriter:
+    """
+    Write a GIF animation frame by frame, only the current frame is kept
+    in memory.
+
+    With a global palette, P frames are indexes into it and are written
+    as is, without any quantization. Otherwise each frame is quantized
+    with its own local palette.
+    """
+    def __init__(self, path: str, width: int, height: int,
+                 duration: int, palette: Optional[npt.NDArray[np.uint8]],
+                 loop: int = 0, disposal: int = 1) -> None:
+        """Instantiate GifWriter and write the header."""
+        self.width = width
+        self.height = height
+        self.duration = duration
+        self.disposal = disposal
+        self.frames = 0
+        self.__palette: Optional[Image.Image] = None
+        self.__file: BinaryIO = open(path, "wb")
+        flags = 0
+        if palette is not None:
+            # global color table of 256 colors of 8 bits
+            flags = 0xf7
+            colors = np.zeros((PALETTE_SIZE, 3), dtype=palette.dtype)
+            colors[:len(palette)] = palette[:PALETTE_SIZE]
+            self.__palette = Image.new("P", (1, 1))
+            self.__palette.putpalette(colors.tobytes())
+        self.__file.write(b"GIF89a" + struct.pack("<HHBBB", width, height,
+                                                  flags, 0, 0))
+        if palette is not None:
+            self.__file.write(colors.tobytes())
+        self.__file.write(b"!\xff\x0bNETSCAPE2.0\x03\x01"
+                          + struct.pack("<H", loop) + b"\x00")
+
+    def __repr__(self) -> str:
+        """Represent a GifWriter."""
+        name = self.__class__.__name__
+        return (f"<{name} {self.width}x{self.height} "
+                f"frames={self.frames}>")
+
+    def __enter__(self) -> 'GifWriter':
+        """Enter in context manager."""
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        """Close the file."""
+        self.close()
+
+    def write(self, image: Image.Image) -> None:
+        """
+        Append a frame, a P image indexing the global palette or any
+        image to quantize.
+        """
+        if image.size != (self.width, self.height):
+            raise ValueError(f"La taille de l'image {image.size} ne "
+                             f"correspond pas à celle du GIF "
+                             f"{(self.width, self.height)}")
+        if self.__palette is not None:
+            if image.mode not in ("P", "L"):
+                image = image.convert("RGB").quantize(
+                    palette=self.__palette, dither=Image.Dither.NONE)
+        elif image.mode != "P":
+            image = image.convert("RGB").quantize(PALETTE_SIZE)
+        # the frame is encoded alone then its blocks are appended
+        buffer = BytesIO()
+        image.save(buffer, "GIF", duration=self.duration,
+                   disposal=self.disposal, optimize=False, interlace=False,
+                   include_color_table=self.__palette is None)
+        self.__file.write(frame_blocks(buffer.getvalue()))
+        self.frames += 1
+
+    def close(self) -> None:
+        """Write the trailer and close the file."""
+        if not self.__file.closed:
+            self.__file.write(b";")
+            self.__file.close()
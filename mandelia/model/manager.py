@@ -1,10 +1,13 @@
 """Manage fractale mandelbrot and julia."""
 import sys
-from typing import Callable, Optional, Tuple
+from typing import Callable, Deque, Optional, Tuple
 
 from PIL import Image
 
+from .atlas import JuliaAtlas
+from .cache import TileCache
 from .fractale import Fractale, Julia, Mandelbrot, ModuloColoration
+from .metrics import RenderMetrics, throughput
 
 if sys.version_info >= (3, 8):
     from typing import TypedDict
@@ -12,7 +15,14 @@ else:
     from typing_extensions import TypedDict
 
 
-class DataExport(TypedDict):
+class ExportOptions(TypedDict, total=False):
+    """Optional settings of a media export."""
+    workers: int
+    quality: float
+    tiled: bool
+
+
+class DataExport(ExportOptions):
     """Represent a metadata of media export."""
     path: str
     ext: str
@@ -29,8 +39,10 @@ ProgressHandler = Callable[[float, Image.Image], None]
 
 class FractaleManager:
     """Manage fractale mandelbrot and julia."""
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(self, width: int, height: int,
+                 cache: Optional[TileCache] = None) -> None:
         """Instantiate FractaleManager."""
+        self.cache = TileCache() if cache is None else cache
         self.__coloration = ModuloColoration(3, 1, 10)
         self.__mandelbrot = Mandelbrot(self.__coloration,
                                        width=width,
@@ -38,8 +50,16 @@ class FractaleManager:
         self.__julia = Julia(self.__coloration,
                              width=int(width / RATIO),
                              height=int(height / RATIO))
+        self.__mandelbrot.set_incremental(True)
+        self.__julia.set_incremental(True)
+        # the Julia set changes with each motion, its tiles would evict
+        # those of the Mandelbrot set
+        self.julia_cache = TileCache()
+        self.__mandelbrot.set_cache(self.cache)
+        self.__julia.set_cache(self.julia_cache)
         self.first: Fractale = self.__mandelbrot
         self.second: Fractale = self.__julia
+        self.atlas: Optional[JuliaAtlas] = None
 
     def resize(self, width: int, height: int) -> None:
         """Resize 2 fractals."""
@@ -77,6 +97,30 @@ class FractaleManager:
             self.__julia.set_c_r(r)
             self.__julia.set_c_i(i)
 
+    def build_atlas(self) -> None:
+        """
+        Compute the Julia atlas over the region shown by Mandelbrot, may
+        run on another thread.
+        """
+        atlas = self.atlas
+        if atlas is not None:
+            atlas.build(self.__mandelbrot, self.__julia)
+
+    def atlas_image(self) -> Optional[Image.Image]:
+        """
+        Thumbnail of the Julia set in the atlas at the size of the second
+        fractal, None without thumbnail for its C.
+        """
+        if self.atlas is None or not self.is_mandelbrot_first():
+            return None
+        julia = self.__julia
+        counts = self.atlas.nearest(julia)
+        if counts is None:
+            return None
+        image = Image.fromarray(self.__coloration.colorize(counts), "RGB")
+        return image.resize((julia.width, julia.height),
+                            Image.Resampling.NEAREST)
+
     def save_size(self) -> int:
         """Return the size of save."""
         return 1 + self.__mandelbrot.bytes_size() + self.__julia.bytes_size()
@@ -143,6 +187,54 @@ class FractaleManager:
         self.first.set_iterations(iterations)
         self.second.set_iterations(iterations)
 
+    @property
+    def adaptive(self) -> bool:
+        """Get if the iterations are estimated, up to the max iterations."""
+        return self.first.adaptive
+
+    @adaptive.setter
+    def adaptive(self, adaptive: bool) -> None:
+        """Set if the iterations are estimated, up to the max iterations."""
+        self.first.set_adaptive(adaptive)
+        self.second.set_adaptive(adaptive)
+
+    @property
+    def resumable(self) -> bool:
+        """Get if raising the iterations continues the last computes."""
+        return self.first.resumable
+
+    @resumable.setter
+    def resumable(self, resumable: bool) -> None:
+        """Set if raising the iterations continues the last computes."""
+        self.first.set_resumable(resumable)
+        self.second.set_resumable(resumable)
+
+    @property
+    def budget(self) -> int:
+        """Iterations of the last compute of the first fractal."""
+        return self.first.budget
+
+    @property
+    def threads(self) -> int:
+        """Get the threads of the computes, 0 for all."""
+        return self.first.threads
+
+    @threads.setter
+    def threads(self, threads: int) -> None:
+        """Set the threads of the computes, 0 for all."""
+        self.first.set_threads(threads)
+        self.second.set_threads(threads)
+
+    @property
+    def schedule(self) -> Tuple[str, int]:
+        """Get the schedule of the computes and its chunk size."""
+        return self.first.schedule, self.first.chunk
+
+    def set_schedule(self, schedule: str, chunk: int = 0) -> None:
+        """Set the schedule of the computes and its chunk size."""
+        self.first.set_schedule(schedule, chunk)
+        self.second.set_schedule(schedule, chunk)
+
     def color(self, r: int, g: int, b: int) -> None:
         """Set RGB color."""
         color = self.__coloration
@@ -178,8 +270,28 @@ class FractaleManager:
 
     @property
     def iter_second(self) -> float:
-        """Iterations per seconds."""
-        return 0
+        """Iterations per seconds over the history of the first fractal."""
+        return throughput(self.first.history)
+
+    @property
+    def metrics(self) -> Optional[RenderMetrics]:
+        """Metrics of the last image of the first fractal."""
+        return self.first.metrics
+
+    @property
+    def history(self) -> Deque[RenderMetrics]:
+        """Metrics of the last images of the first fractal."""
+        return self.first.history
+
+    @property
+    def cache_hits(self) -> int:
+        """Number of tiles served from cache."""
+        return self.cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        """Number of tiles computed because missing in cache."""
+        return self.cache.misses
 
     def reset(self) -> None:
         """Reset fractals."""
@@ -0,0 +1,45 @@
+"""Timings of the rendering of fractals."""
+from collections import deque
+from typing import Iterable, NamedTuple
+
+METRICS_HISTORY = 64
+
+
+class RenderMetrics(NamedTuple):
+    """
+    Timings in seconds of the steps of a rendered image. Iterations are
+    the iterations done by the compute, not those of the pixels served
+    by the cache, remapped or mirrored nor those saved by a previous
+    compute, 0 when the image was only colorized again.
+    """
+    compute: float
+    colorize: float
+    convert: float
+    iterations: int
+    pixels: int
+
+    @property
+    def total(self) -> float:
+        """Duration of the whole rendering."""
+        return self.compute + self.colorize + self.convert
+
+    @property
+    def iterations_per_second(self) -> float:
+        """Throughput of the compute, 0 without compute."""
+        return self.iterations / self.compute if self.compute > 0 else 0.0
+
+
+def new_history() -> 'deque[RenderMetrics]':
+    """Return an empty rolling history of metrics."""
+    return deque(maxlen=METRICS_HISTORY)
+
+
+def throughput(history: Iterable[RenderMetrics]) -> float:
+    """Iterations per second over the computed images of a history."""
+    iterations = 0
+    seconds = 0.0
+    for metrics in history:
+        if metrics.iterations:
+            iterations += metrics.iterations
+            seconds += metrics.compute
+    return iterations / seconds if seconds > 0 else 0.0
@@ -0,0 +1,99 @@
+"""Streaming PNG encoder."""
+import struct
+import zlib
+from types import TracebackType
+from typing import BinaryIO, List, Optional, Type
+
+import numpy as np
+import numpy.typing as npt
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHUNK_SIZE = 1 << 20
+
+
+class PngWriter:
+    """
+    Write a RGB PNG band of rows by band of rows, only the current band
+    and one compressed chunk are kept in memory whatever the size.
+    """
+    def __init__(self, path: str, width: int, height: int,
+                 level: int = 6) -> None:
+        """Instantiate PngWriter and write the header."""
+        if not 0 < width < 1 << 31 or not 0 < height < 1 << 31:
+            raise ValueError(f"Taille d'image invalide ({width}x{height})")
+        self.width = width
+        self.height = height
+        self.rows = 0
+        self.__compressor = zlib.compressobj(level)
+        self.__pending: List[bytes] = []
+        self.__pending_size = 0
+        self.__file: BinaryIO = open(path, "wb")
+        self.__file.write(SIGNATURE)
+        # 8 bits per channel, RGB, no interlace
+        self.__chunk(b"IHDR", struct.pack(">IIBBBBB", width, height,
+                                          8, 2, 0, 0, 0))
+
+    def __repr__(self) -> str:
+        """Represent a PngWriter."""
+        name = self.__class__.__name__
+        return (f"<{name} {self.width}x{self.height} "
+                f"rows={self.rows}>")
+
+    def __enter__(self) -> 'PngWriter':
+        """Enter in context manager."""
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        """Close the file."""
+        self.close()
+
+    def write(self, rows: npt.NDArray[np.uint8]) -> None:
+        """Append a band of RGB rows of shape (rows, width, 3)."""
+        if rows.ndim != 3 or rows.shape[1:] != (self.width, 3):
+            raise ValueError(f"Les lignes de forme {rows.shape} ne "
+                             f"correspondent pas à une image de largeur "
+                             f"{self.width}")
+        count = len(rows)
+        if self.rows + count > self.height:
+            raise ValueError("Trop de lignes pour la hauteur de l'image")
+        # each row starts with its filter type, 0 for none
+        scanlines = np.zeros((count, 1 + 3 * self.width), dtype=rows.dtype)
+        scanlines[:, 1:] = rows.reshape(count, -1)
+        self.__compress(self.__compressor.compress(scanlines.tobytes()))
+        self.rows += count
+
+    def close(self) -> None:
+        """Write the remaining data and the trailer, close the file."""
+        if self.__file.closed:
+            return
+        try:
+            self.__compress(self.__compressor.flush())
+            self.__flush()
+            self.__chunk(b"IEND", b"")
+        finally:
+            self.__file.close()
+        if self.rows != self.height:
+            raise ValueError(f"Image incomplète, {self.rows} lignes "
+                             f"écrites sur {self.height}")
+
+    def __compress(self, data: bytes) -> None:
+        """Keep compressed data, write a chunk when there is enough."""
+        if data:
+            self.__pending.append(data)
+            self.__pending_size += len(data)
+        if self.__pending_size >= CHUNK_SIZE:
+            self.__flush()
+
+    def __flush(self) -> None:
+        """Write compressed data in a IDAT chunk."""
+        if self.__pending:
+            self.__chunk(b"IDAT", b"".join(self.__pending))
+            self.__pending.clear()
+            self.__pending_size = 0
+
+    def __chunk(self, kind: bytes, data: bytes) -> None:
+        """Write a chunk."""
+        self.__file.write(struct.pack(">I", len(data)) + kind + data
+                          + struct.pack(">I", zlib.crc32(kind + data)))
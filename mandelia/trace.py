@@ -0,0 +1,190 @@
+"""
+Level-gated tracing of the durations of the application. The spans are
+written as a Chrome trace, readable by chrome://tracing or Perfetto, or
+summarized on stderr at exit.
+
+    MANDELIA_TRACE=debug MANDELIA_TRACE_FILE=trace.json python -m mandelia
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+from collections import deque
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Deque, Dict, Optional, Tuple, TypeVar, Union
+
+if sys.version_info >= (3, 8):
+    from typing import TypedDict
+else:
+    from typing_extensions import TypedDict
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+T = TypeVar('T')
+P = ParamSpec('P')
+
+
+class Event(TypedDict):
+    """Complete event of a Chrome trace, times in microseconds."""
+    name: str
+    ph: str
+    ts: float
+    dur: float
+    pid: int
+    tid: int
+
+
+OFF = 0
+INFO = 1  # renders, colorings and image conversions
+DEBUG = 2  # also every handler of the interface
+LEVELS = {"off": OFF, "info": INFO, "debug": DEBUG}
+MAX_EVENTS = 1_000_000  # the oldest events are dropped beyond
+
+
+class Span:
+    """Time a block and record it in a tracer on exit."""
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        """Instantiate Span."""
+        self.tracer = tracer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "Span":
+        """Start the span."""
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Record the span."""
+        self.tracer.record(self.name, self.start, perf_counter())
+
+
+class NullSpan:
+    """Span of a disabled level, does nothing."""
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Do nothing."""
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """
+    Record the spans of the enabled levels as Chrome trace events timed
+    with perf_counter. Nothing is formatted nor printed during a span,
+    a disabled level costs a comparison.
+    """
+    def __init__(self, level: int = OFF, path: Optional[str] = None,
+                 max_events: int = MAX_EVENTS) -> None:
+        """Instantiate Tracer."""
+        self.level = level
+        self.path = path
+        self.events: Deque[Event] = deque(maxlen=max_events)
+        self.__origin = perf_counter()
+        self.__pid = os.getpid()
+
+    def __repr__(self) -> str:
+        """Represent a Tracer."""
+        name = self.__class__.__name__
+        return f"<{name} level={self.level} events={len(self.events)}>"
+
+    @classmethod
+    def from_environ(cls) -> "Tracer":
+        """Tracer set by MANDELIA_TRACE and MANDELIA_TRACE_FILE."""
+        name = (os.environ.get("MANDELIA_TRACE") or "off").lower()
+        if name not in LEVELS:
+            raise ValueError(f"unknown trace level {name!r}, "
+                             f"expected one of {tuple(LEVELS)}")
+        return cls(LEVELS[name], os.environ.get("MANDELIA_TRACE_FILE"))
+
+    def enabled(self, level: int = INFO) -> bool:
+        """Return if the spans of a level are recorded."""
+        return level <= self.level
+
+    def span(self, name: str, level: int = INFO) -> Union[Span, NullSpan]:
+        """Context manager recording the duration of its block."""
+        if level > self.level:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Record a span between two perf_counter times."""
+        self.events.append({
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.__origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": self.__pid,
+            "tid": threading.get_ident(),
+        })
+
+    def traced(self, level: int = DEBUG
+               ) -> Callable[[Callable[P, T]], Callable[P, T]]:
+        """
+        Decorator recording a span for each call of a function. Functions
+        decorated while their level is disabled are returned unchanged.
+        """
+        def decorator(function: Callable[P, T]) -> Callable[P, T]:
+            if level > self.level:
+                return function
+            name = function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, start, perf_counter())
+            return wrapper
+        return decorator
+
+    def summary(self) -> str:
+        """Count, total and maximum duration of each kind of span."""
+        spans: Dict[str, Tuple[int, float, float]] = {}
+        for event in self.events:
+            count, total, longest = spans.get(event["name"], (0, 0.0, 0.0))
+            spans[event["name"]] = (count + 1, total + event["dur"],
+                                    max(longest, event["dur"]))
+
+        def total_of(name: str) -> float:
+            return spans[name][1]
+        return "\n".join(
+            f"{name:<40} {count:>8} {total / 1000:>10.1f}ms "
+            f"{longest / 1000:>8.1f}ms max"
+            for name, (count, total, longest) in (
+                (name, spans[name])
+                for name in sorted(spans, key=total_of, reverse=True)))
+
+    def write(self, path: str) -> None:
+        """Write the events as a Chrome trace."""
+        trace: Dict[str, object] = {"traceEvents": list(self.events),
+                                    "displayTimeUnit": "ms"}
+        with open(path, "w", encoding="utf8") as file:
+            json.dump(trace, file)
+
+    def close(self) -> None:
+        """Write the trace file, or the summary on stderr without one."""
+        if not self.events:
+            return
+        if self.path is not None:
+            self.write(self.path)
+        else:
+            print(self.summary(), file=sys.stderr)
+
+
+tracer = Tracer.from_environ()
+atexit.register(tracer.close)
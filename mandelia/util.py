@@ -2,18 +2,7 @@
 import os
 import sys
 import tkinter as tk
-from datetime import datetime
-from functools import wraps
-from typing import Callable, Optional, TypeVar, Union
-
-if sys.version_info >= (3, 10):
-    from typing import ParamSpec
-else:
-    from typing_extensions import ParamSpec
-
-
-T = TypeVar('T')
-P = ParamSpec('P')
+from typing import Optional, Union
 
 
 def rel_path(relative_path: str) -> str:
@@ -29,20 +18,6 @@ def rel_path(relative_path: str) -> str:
     return os.path.join(dir_path, relative_path)
 
 
-def logger(function: Callable[P, T]) -> Callable[P, T]:
-    """Log function by displaying arguments."""
-    @wraps(function)
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        name = function.__qualname__
-        str_args = ", ".join(repr(arg) for arg in args)  # type: ignore
-        str_kwargs = ",".join(f"{k}={arg!r}"  # type: ignore
-                              for k, arg in kwargs.items())  # type: ignore
-        str_params = ",".join(part for part in (str_args, str_kwargs) if part)
-        print(f"[{datetime.now()}] {name}({str_params})")
-        return function(*args, **kwargs)
-    return wrapper
-
-
 def sizeof_fmt(path: str) -> str:
     """Show information on a path."""
     size = float(os.path.getsize(path))
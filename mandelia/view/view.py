@@ -6,9 +6,10 @@ from typing import Callable, Optional
 from PIL import Image, ImageTk
 
 from ..model.manager import DataExport
+from ..trace import tracer
 from ..util import set_icon
 from .export import Export
-from .widget import AdjustableInput, Output
+from .widget import AdjustableInput, Output, Switch
 
 _CallableExport = Callable[[DataExport], None]
 
@@ -21,9 +22,11 @@ class StateInteraction(tk.LabelFrame):
 
         self.actualization = tk.Button(self, text="Actualiser")
         self.reset = tk.Button(self, text="Réinitialiser")
+        self.atlas = Switch(self, "Atlas Julia", False)
 
         self.actualization.pack(pady=5, fill=X, padx=20)
         self.reset.pack(pady=5, fill=X, padx=20)
+        self.atlas.pack(anchor=W, fill=X)
 
 
 class FileInteraction(tk.LabelFrame):
@@ -65,12 +68,18 @@ class IterationInteraction(tk.LabelFrame):
         super().__init__(master, text="Iterations", labelanchor=NW)
 
         self.max = AdjustableInput(self, "Max", 100, 2_000, 10_000)
+        self.adaptive = Switch(self, "Auto", False)
+        self.budget = Output(self, "Budget", "0")
         self.sum = Output(self, "Total", "0")
         self.per_pixel = Output(self, "Par pixel", "0")
+        self.per_second = Output(self, "Par seconde", "0")
 
         self.max.pack(anchor=W, fill=X)
+        self.adaptive.pack(anchor=W, fill=X)
+        self.budget.pack(anchor=W, fill=X)
         self.sum.pack(anchor=W, fill=X)
         self.per_pixel.pack(anchor=W, fill=X)
+        self.per_second.pack(anchor=W, fill=X)
 
 
 class PositioningInteraction(tk.LabelFrame):
@@ -147,7 +156,10 @@ class View(tk.Tk):
     def set_image(self, image: Image.Image) -> None:
         """Set the main image."""
         self.__image = image
-        self.__image_tk = ImageTk.PhotoImage(self.__image)
+        with tracer.span("photo"):
+            if self.__paste(self.__image_tk, image):
+                return
+            self.__image_tk = ImageTk.PhotoImage(self.__image)
         if self.__index is not None:
             self.visualization.delete(self.__index)
         self.__index = self.visualization.create_image(
@@ -158,7 +170,10 @@ class View(tk.Tk):
     def set_2nd_image(self, image: Image.Image) -> None:
         """Set the second image."""
         self.__image2 = image
-        self.__image_tk2 = ImageTk.PhotoImage(self.__image2)
+        with tracer.span("photo"):
+            if self.__paste(self.__image_tk2, image):
+                return
+            self.__image_tk2 = ImageTk.PhotoImage(self.__image2)
         if self.__index2 is not None:
             self.visualization.delete(self.__index2)
         self.__index2 = self.visualization.create_image(
@@ -166,6 +181,18 @@ class View(tk.Tk):
         self.visualization.tag_raise(self.__index2)
         self.update_idletasks()
 
+    def __paste(self, photo: Optional[ImageTk.PhotoImage],
+                image: Image.Image) -> bool:
+        """
+        Copy the image into the displayed photo if it has the same size,
+        the photo and its canvas item are kept. Return if it was done.
+        """
+        if photo is None or (photo.width(), photo.height()) != image.size:
+            return False
+        photo.paste(image)
+        self.update_idletasks()
+        return True
+
     @property
     def width(self) -> int:
         """Get width of visualization canvas."""
@@ -125,6 +125,17 @@ class AdjustableInput(Labeled, VariableContainer[tk.DoubleVar]):
             self.on_update_entry(name="", index="", mode="")
 
 
+class Switch(Labeled, VariableContainer[tk.BooleanVar]):
+    """Checkbox of a boolean."""
+    def __init__(self, master: Optional[tk.Misc],
+                 text: str, default: bool) -> None:
+        """Instantiate Switch."""
+        Labeled.__init__(self, master, text)
+        VariableContainer.__init__(self, tk.BooleanVar(self, default))
+        self.check = tk.Checkbutton(self, variable=self.var)
+        self.check.pack(side=LEFT)
+
+
 class Output(Labeled, VariableContainer[tk.StringVar]):
     """Read-Only Entry."""
     def __init__(self, master: Optional[tk.Misc],
@@ -60,7 +60,7 @@ def version():
 
 extra_compile_args = []  # type: list[str]
 extra_link_args = []  # type: list[str]
-include_dirs = [np.get_include()]  # type: list[str]
+include_dirs = [np.get_include(), "mandelia/model"]  # type: list[str]
 library_dirs = []  # type: list[str]
 libraries = []  # type: list[str]
 
@@ -99,7 +99,8 @@ setup(
     author_email="dashstrom.pro@gmail.com",
     url='https://github.com/Dashstrom/mandelia',
     license="GPL-3.0 License",
-    packages=find_packages(exclude=('tests', 'docs', '.github')),
+    packages=find_packages(
+        exclude=('tests', 'benchmarks', 'docs', '.github')),
     description="Application to visualize fractals of mandelbrot and julia.",
     long_description=read("README.md"),
     long_description_content_type="text/markdown",
@@ -128,7 +129,8 @@ setup(
     include_package_data=True,
     test_suite="tests",
     package_data={
-        "mandelia": ["view/images/*", "**/*.pyi", "**/*.pyx", "py.typed"],
+        "mandelia": ["view/images/*", "**/*.pyi", "**/*.pyx", "**/*.h",
+                     "py.typed"],
     },
     keywords=["mandelbrot", "julia", "fractale", "tkinter"],
     install_requires=read("requirements.txt").split("\n"),
@@ -0,0 +1,53 @@
+"""Unit tests for mandelia.model.atlas."""
+from unittest import TestCase
+
+import numpy as np
+
+from mandelia.model import (FractaleManager, Julia, JuliaAtlas, Mandelbrot,
+                            ModuloColoration)
+
+
+class TestJuliaAtlas(TestCase):
+
+    def setUp(self) -> None:
+        self.color = ModuloColoration()
+        self.mandelbrot = Mandelbrot(self.color, -0.5, 0.0, 300, 160, 120,
+                                     0.02)
+        self.julia = Julia(self.color, iterations=300, width=96, height=72)
+        self.atlas = JuliaAtlas(columns=8, thumbnail_width=32)
+
+    def test_nearest(self) -> None:
+        self.assertIsNone(self.atlas.nearest(self.julia))
+        self.atlas.build(self.mandelbrot, self.julia)
+        self.assertTrue(self.atlas.ready)
+        # C of the cell of the pixel 50, 40 of the Mandelbrot set
+        column, row = 50 * 8 // 160, 40 * 6 // 120
+        c_r = self.mandelbrot.real_at_x(column * 20 + 10)
+        c_i = self.mandelbrot.imaginary_at_y(row * 20 + 10)
+        self.julia.set_c_r(self.mandelbrot.real_at_x(50))
+        self.julia.set_c_i(self.mandelbrot.imaginary_at_y(40))
+        counts = self.atlas.nearest(self.julia)
+        assert counts is not None
+        expected = Julia(self.color, c_r, c_i, self.julia.real,
+                         self.julia.imaginary, 300, 32, 24,
+                         self.julia.pixel_size * 3)
+        np.testing.assert_array_equal(counts, expected.counts()[0])
+        # out of the region or with another view of Julia
+        self.julia.set_c_r(2.0)
+        self.assertIsNone(self.atlas.nearest(self.julia))
+        self.julia.set_c_r(c_r)
+        self.julia.set_pixel_size(0.01)
+        self.assertIsNone(self.atlas.nearest(self.julia))
+        self.atlas.clear()
+        self.assertFalse(self.atlas.ready)
+
+    def test_manager(self) -> None:
+        manager = FractaleManager(120, 90)
+        self.assertIsNone(manager.atlas_image())
+        manager.atlas = JuliaAtlas(columns=4)
+        manager.build_atlas()
+        manager.motion(60, 45)
+        image = manager.atlas_image()
+        assert image is not None
+        self.assertEqual(image.size, (manager.second.width,
+                                      manager.second.height))
@@ -0,0 +1,79 @@
+"""Unit tests for mandelia.batch."""
+import json
+import os
+import subprocess
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+
+from PIL import Image
+
+from mandelia.batch import DEFAULTS, Job, build_manager, main, run_jobs
+from mandelia.model.fractale import Julia
+
+
+class TestBatch(TestCase):
+
+    def test_build_manager(self) -> None:
+        job: Job = {**DEFAULTS, "julia": (0.285, 0.01), "real": 0.1,
+                    "pixel_size": 0.005, "iterations": 321, "threads": 2,
+                    "schedule": "dynamic,8", "adaptive": True}
+        manager = build_manager(job)
+        self.assertEqual(manager.threads, 2)
+        self.assertEqual(manager.schedule, ("dynamic", 8))
+        self.assertEqual(manager.second.schedule, "dynamic")
+        self.assertFalse(manager.is_mandelbrot_first())
+        assert isinstance(manager.first, Julia)
+        self.assertEqual(manager.first.c_r, 0.285)
+        self.assertEqual(manager.first.real, 0.1)
+        self.assertEqual(manager.pixel_size, 0.005)
+        self.assertEqual(manager.iterations, 321)
+        self.assertTrue(manager.second.adaptive)
+
+    def test_run_jobs(self) -> None:
+        with TemporaryDirectory() as directory:
+            jobs: List[Job] = [{**DEFAULTS, "width": 64, "height": 48,
+                                "output": os.path.join(directory,
+                                                       f"{i}.png")}
+                               for i in range(2)]
+            jobs.append({**DEFAULTS, "config": "missing.mbc",
+                         "output": os.path.join(directory, "bad.png")})
+            with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+                results = run_jobs(jobs, workers=2)
+            errors = {os.path.basename(result.output): result.error
+                      for result in results}
+            self.assertIsNone(errors["0.png"])
+            self.assertIsNone(errors["1.png"])
+            self.assertIsNotNone(errors["bad.png"])
+            with Image.open(os.path.join(directory, "0.png")) as img:
+                self.assertEqual(img.size, (64, 48))
+
+    def test_manifest(self) -> None:
+        with TemporaryDirectory() as directory:
+            manifest = os.path.join(directory, "jobs.json")
+            with open(manifest, "w", encoding="utf8") as file:
+                json.dump({"jobs": [{"output": "a.png", "width": 40}]}, file)
+            with redirect_stdout(StringIO()):
+                status = main(["-m", manifest, "--height", "30"])
+            self.assertEqual(status, 0)
+            with Image.open(os.path.join(directory, "a.png")) as img:
+                self.assertEqual(img.size, (40, 30))
+
+    def test_manifest_invalid(self) -> None:
+        with TemporaryDirectory() as directory:
+            manifest = os.path.join(directory, "jobs.json")
+            with open(manifest, "w", encoding="utf8") as file:
+                json.dump(["a.png"], file)
+            with redirect_stderr(StringIO()) as stderr:
+                with self.assertRaises(SystemExit):
+                    main(["-m", manifest])
+            self.assertIn("liste de rendus", stderr.getvalue())
+
+    def test_no_tkinter(self) -> None:
+        code = ("import sys, mandelia.__main__, mandelia.batch; "
+                "sys.exit('tkinter' in sys.modules)")
+        process = subprocess.run([sys.executable, "-c", code], check=False)
+        self.assertEqual(process.returncode, 0)
@@ -0,0 +1,84 @@
+"""Unit tests for mandelia.model.cache."""
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from mandelia.model import (METHODS, FractaleManager, Mandelbrot,
+                            ModuloColoration)
+from mandelia.model.cache import TileCache
+
+
+class TestTileCache(TestCase):
+
+    def test_lru(self) -> None:
+        cache = TileCache(max_tiles=2)
+        for key in range(3):
+            cache.put(key, np.full((2, 2), key, dtype=np.uint32))
+        self.assertIsNone(cache.get(0))
+        self.assertIsNotNone(cache.get(1))
+        cache.put(3, np.zeros((2, 2), dtype=np.uint32))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_spill(self) -> None:
+        with TemporaryDirectory() as directory:
+            cache = TileCache(max_tiles=1, directory=directory)
+            tile = np.arange(12, dtype=np.uint32).reshape(3, 4)
+            cache.put("a", tile)
+            cache.put("b", tile + 1)
+            self.assertEqual(len(cache), 2)
+            np.testing.assert_array_equal(cache.get("a"), tile)
+            np.testing.assert_array_equal(cache.get("b"), tile + 1)
+            cache.clear()
+
+
+class TestFractaleCache(TestCase):
+
+    def test_zoom_back(self) -> None:
+        cache = TileCache()
+        mandelbrot = Mandelbrot(ModuloColoration(), width=300, height=200,
+                                pixel_size=0.01)
+        mandelbrot.set_cache(cache)
+        mandelbrot.image()
+        content = mandelbrot.content.copy()
+        mandelbrot.zoom(123, 45, 2)
+        mandelbrot.image()
+        mandelbrot.zoom(123, 45, 0.5)
+        mandelbrot.image()
+        self.assertEqual(mandelbrot.computed_pixels, 0)
+        np.testing.assert_array_equal(mandelbrot.content, content)
+
+    def test_pan(self) -> None:
+        cache = TileCache()
+        mandelbrot = Mandelbrot(ModuloColoration(), width=640, height=480,
+                                pixel_size=0.005)
+        mandelbrot.set_cache(cache)
+        mandelbrot.image()
+        # a pan of half a tile still finds the tiles inside both views
+        mandelbrot.set_real(mandelbrot.real + 64 * mandelbrot.pixel_size)
+        mandelbrot.image()
+        self.assertGreater(cache.hits, 0)
+        self.assertLess(mandelbrot.computed_pixels, 640 * 480 // 2)
+
+    def test_method(self) -> None:
+        cache = TileCache()
+        for method in METHODS:
+            mandelbrot = Mandelbrot(ModuloColoration(), width=300,
+                                    height=200, pixel_size=0.01,
+                                    method=method)
+            mandelbrot.set_cache(cache)
+            mandelbrot.image()
+        self.assertEqual(cache.hits, 0)
+
+    def test_manager(self) -> None:
+        manager = FractaleManager(300, 300)
+        manager.images()
+        misses = manager.cache_misses
+        manager.swap()
+        manager.swap()
+        manager.images()
+        self.assertEqual(manager.cache_misses, misses)
+        self.assertGreater(manager.cache_hits, 0)
+        self.assertIsNot(manager.julia_cache, manager.cache)
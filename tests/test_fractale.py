@@ -1,7 +1,118 @@
 """Unit tests for mandelia.model."""
+import os
+import subprocess
+import sys
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from typing import Optional, Tuple
 from unittest import TestCase
 
-from mandelia.model import Julia, Mandelbrot, ModuloColoration
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+from mandelia.model import (KERNELS, METHODS, DeepMandelbrot,
+                            GradientColoration, HistogramColoration, Julia,
+                            Mandelbrot, ModuloColoration)
+from mandelia.model.fractale import SCHEDULES, parse_schedule
+
+VIEWS = [
+    (0.0, 0.0, 0.02),
+    (-0.75, 0.1, 0.001),
+    (-0.12, 0.75, 0.0002),
+    (-1.7549, 0.0, 0.00001),
+]
+
+
+class SettingsMandelbrot(Mandelbrot):
+    """Mandelbrot giving its settings instead of its escape counts."""
+
+    def counts(
+        self
+    ) -> Tuple[npt.NDArray[np.uint32], Optional[npt.NDArray[np.float32]]]:
+        """Compute and return the budget, threads, schedule and chunk."""
+        super().counts()
+        return np.array([self.budget, self.threads,
+                         SCHEDULES.index(self.schedule), self.chunk],
+                        dtype=np.uint32), None
+
+
+class TestModuloColoration(TestCase):
+
+    def test_colorize(self) -> None:
+        color = ModuloColoration(9, 2, 3)
+        content = np.arange(600, dtype=np.uint32).reshape(20, 30)
+        image = color.colorize(content)
+        self.assertEqual(image.shape, (20, 30, 3))
+        expected = (content[..., None].astype(np.uint64)
+                    * np.array([9, 2, 3], dtype=np.uint64)) % 256
+        np.testing.assert_array_equal(image, expected)
+
+    def test_colorize_out(self) -> None:
+        color = ModuloColoration(9, 2, 3)
+        content = np.ones((4, 5), dtype=np.uint32)
+        out = np.zeros((4, 5, 3), dtype=np.uint8)
+        self.assertIs(color.colorize(content, out), out)
+        color.r = 1
+        self.assertEqual(color.colorize(content, out)[0, 0, 0], 1)
+
+    def test_colorize_rgba(self) -> None:
+        color = ModuloColoration(9, 2, 3)
+        content = np.arange(20, dtype=np.uint32).reshape(4, 5)
+        out = np.full((4, 5, 4), 7, dtype=np.uint8)
+        self.assertIs(color.colorize(content, out), out)
+        np.testing.assert_array_equal(out[..., :3], color.colorize(content))
+        self.assertTrue((out[..., 3] == 7).all())
+
+
+class TestGradientColoration(TestCase):
+
+    def test_colorize(self) -> None:
+        color = GradientColoration(period=4, stops=((0, 0, 0), (255, 0, 0)))
+        content = np.array([[0, 1, 2, 4]], dtype=np.uint32)
+        image = color.colorize(content)
+        np.testing.assert_array_equal(image[0, :, 0], [0, 128, 255, 0])
+        smooth = np.array([[0, 1.5, 2, 4]], dtype=np.float32)
+        self.assertGreater(color.colorize(content, None, smooth)[0, 1, 0],
+                           image[0, 1, 0])
+
+    def test_bytes(self) -> None:
+        color = GradientColoration(7.5, ((1, 2, 3), (4, 5, 6)))
+        copy = GradientColoration()
+        copy.from_bytes(color.to_bytes())
+        self.assertEqual(copy.period, 7.5)
+        self.assertEqual(copy.stops, ((1, 2, 3), (4, 5, 6)))
+        self.assertEqual(copy.bytes_size(), len(color.to_bytes()))
+
+
+class TestHistogramColoration(TestCase):
+
+    def test_histogram(self) -> None:
+        content = np.random.default_rng(0).integers(
+            0, 300, (97, 61), dtype=np.uint32)
+        np.testing.assert_array_equal(
+            HistogramColoration().histogram(content),
+            np.bincount(content.ravel()))
+
+    def test_colorize(self) -> None:
+        color = HistogramColoration(stops=((0, 0, 0), (255, 0, 0)))
+        content = np.array([[0, 1, 1, 1000]], dtype=np.uint32)
+        image = color.colorize(content)
+        # two thirds of the escaped pixels have a count of 1 or less
+        np.testing.assert_array_equal(image[0, :, 0], [0, 170, 170, 0])
+
+    def test_negative_smooth(self) -> None:
+        # far from the set, Z escapes far beyond the bailout at once
+        color = HistogramColoration()
+        julia = Julia(color, -0.8, 0.156, width=400, height=300,
+                      pixel_size=0.3)
+        julia.set_smoothing(True)
+        image = np.array(julia.image())
+        content, smooth = julia.counts()
+        assert smooth is not None
+        self.assertLess(smooth.min(), -1)
+        expected = color.colorize(content, None, np.maximum(smooth, 0))
+        np.testing.assert_array_equal(image, expected)
 
 
 class TestMandelbrot(TestCase):
@@ -15,6 +126,346 @@ class TestMandelbrot(TestCase):
         w, h = img.size
         self.assertEqual(w, 256)
         self.assertEqual(h, 128)
+        self.assertEqual(img.mode, "RGB")
+        img.save(BytesIO(), "JPEG")
+        self.assertEqual(self.mandelbrot.image_at_size(256, 128).mode, "RGB")
+
+    def test_image_buffer(self) -> None:
+        kept = self.mandelbrot.image()
+        img = self.mandelbrot.image_view()
+        self.assertEqual(img.mode, "RGBA")
+        pixels = np.array(img)
+        self.assertTrue((pixels[..., 3] == 255).all())
+        np.testing.assert_array_equal(np.array(kept), pixels[..., :3])
+        # a recoloring is written in the buffer of the view, not in copies
+        self.mandelbrot.set_color(GradientColoration())
+        expected = np.array(self.mandelbrot.image_view())
+        np.testing.assert_array_equal(np.array(img), expected)
+        self.assertFalse(np.array_equal(pixels, expected))
+        np.testing.assert_array_equal(np.array(kept), pixels[..., :3])
+
+    def test_interior_kernel(self) -> None:
+        for real, imaginary, pixel_size in VIEWS:
+            scalar = Mandelbrot(self.color, real, imaginary, 500, 96, 64,
+                                pixel_size)
+            interior = Mandelbrot(self.color, real, imaginary, 500, 96, 64,
+                                  pixel_size, kernel="interior")
+            scalar.image()
+            interior.image()
+            np.testing.assert_array_equal(scalar.content, interior.content)
+
+    def test_batch_kernel(self) -> None:
+        # 97 pixels per row leave a partial batch at the end of each row
+        for real, imaginary, pixel_size in VIEWS:
+            scalar = Mandelbrot(self.color, real, imaginary, 500, 97, 64,
+                                pixel_size)
+            batch = Mandelbrot(self.color, real, imaginary, 500, 97, 64,
+                               pixel_size, kernel="batch")
+            scalar.set_smoothing(True)
+            batch.set_smoothing(True)
+            scalar.image()
+            list(batch.progressive())
+            np.testing.assert_array_equal(scalar.content, batch.content)
+            np.testing.assert_array_equal(scalar.smooth, batch.smooth)
+
+    def test_subdivision(self) -> None:
+        for kernel in ("scalar", "interior"):
+            pixel = Mandelbrot(self.color, width=300, height=200,
+                               pixel_size=0.012, kernel=kernel)
+            subdivision = Mandelbrot(self.color, width=300, height=200,
+                                     pixel_size=0.012, kernel=kernel,
+                                     method="subdivision")
+            pixel.image()
+            subdivision.image()
+            np.testing.assert_array_equal(pixel.content, subdivision.content)
+            self.assertLess(subdivision.computed_pixels,
+                            pixel.computed_pixels)
+
+    def test_subdivision_filaments(self) -> None:
+        # escaping filaments cross the borders of the set between pixels
+        for real, imaginary, pixel_size, width, height in (
+                (-0.5, 0.0, 0.0032, 960, 540),
+                (-0.1, 0.8, 0.0004, 800, 600),
+                (-1.25, 0.0, 0.002, 400, 300)):
+            contents = []
+            for method in METHODS:
+                mandelbrot = Mandelbrot(self.color, real, imaginary,
+                                        iterations=500, width=width,
+                                        height=height, pixel_size=pixel_size,
+                                        method=method)
+                contents.append(mandelbrot.counts()[0])
+            for content in contents[1:]:
+                np.testing.assert_array_equal(contents[0], content)
+
+    def test_incremental(self) -> None:
+        mandelbrot = Mandelbrot(self.color, width=200, height=150,
+                                pixel_size=0.016)
+        mandelbrot.set_incremental(True)
+        mandelbrot.image()
+        mandelbrot.zoom(50, 60, 2)
+        mandelbrot.image()
+        self.assertEqual(mandelbrot.computed_pixels, 200 * 150 * 3 // 4)
+        mandelbrot.set_real(mandelbrot.real + 10 * mandelbrot.pixel_size)
+        mandelbrot.image()
+        self.assertEqual(mandelbrot.computed_pixels, 10 * 150)
+        reference = Mandelbrot(self.color, mandelbrot.real,
+                               mandelbrot.imaginary, width=200, height=150,
+                               pixel_size=mandelbrot.pixel_size)
+        reference.image()
+        self.assertLess(np.mean(reference.content != mandelbrot.content),
+                        0.001)
+
+    def test_progressive(self) -> None:
+        mandelbrot = Mandelbrot(self.color, width=201, height=103)
+        images = list(mandelbrot.progressive())
+        self.assertEqual(len(images), 4)
+        # images wait in a queue, they must not share a buffer
+        self.assertFalse(np.array_equal(np.array(images[0]),
+                                        np.array(images[-1])))
+        self.assertEqual(images[0].size, (201, 103))
+        # the rows after the real axis are mirrored
+        self.assertEqual(mandelbrot.computed_pixels, 201 * 52)
+        self.assertFalse(mandelbrot.need_update)
+        reference = Mandelbrot(self.color, width=201, height=103)
+        reference.image()
+        np.testing.assert_array_equal(mandelbrot.content, reference.content)
+
+    def test_progressive_cancelled(self) -> None:
+        self.mandelbrot.set_cancelled(True)
+        self.assertEqual(list(self.mandelbrot.progressive()), [])
+        self.assertTrue(self.mandelbrot.need_update)
+
+    def test_smoothing(self) -> None:
+        self.mandelbrot.set_kernel("interior")
+        self.mandelbrot.set_method("subdivision")
+        self.mandelbrot.set_smoothing(True)
+        self.mandelbrot.image()
+        smooth = self.mandelbrot.smooth
+        content = self.mandelbrot.content
+        self.assertEqual(smooth.dtype, np.float32)
+        self.assertEqual(smooth.shape, content.shape)
+        self.assertTrue((smooth[content == 0] == 0).all())
+        escaped = content != 0
+        delta = smooth[escaped] - content[escaped].astype(np.float64)
+        self.assertTrue(((-2 < delta) & (delta <= 1)).all())
+        reference = Mandelbrot(self.color, width=256, height=128)
+        reference.set_smoothing(True)
+        reference.image()
+        np.testing.assert_array_equal(reference.content, content)
+        np.testing.assert_array_equal(reference.smooth, smooth)
+
+    def test_recolor(self) -> None:
+        self.mandelbrot.set_smoothing(True)
+        self.mandelbrot.image()
+        content = self.mandelbrot.content
+        for color in (GradientColoration(), HistogramColoration()):
+            self.mandelbrot.set_color(color)
+            self.assertFalse(self.mandelbrot.need_update)
+            img = self.mandelbrot.image()
+            self.assertIs(self.mandelbrot.content, content)
+            self.assertEqual(img.size, (256, 128))
+
+    def test_render_states(self) -> None:
+        self.mandelbrot.set_real(-0.75)
+        self.mandelbrot.set_pixel_size(0.005)
+        states = self.mandelbrot.zoom_states(40, 30, 5, 10)
+        self.assertEqual(states[0][1], 0)
+        self.assertEqual(states[-1][1], 1)
+        data = [state for state, _ in states]
+        sequential = list(self.mandelbrot.render_states(data, 1))
+        parallel = list(self.mandelbrot.render_states(data, 2))
+        self.assertEqual(len(sequential), len(states))
+        for expected, frame in zip(sequential, parallel):
+            self.assertEqual(frame.shape, (30, 40, 3))
+            np.testing.assert_array_equal(frame, expected)
+
+    def test_render_states_settings(self) -> None:
+        # exports keep the adaptive mode and the threads of the fractal
+        mandelbrot = SettingsMandelbrot(self.color, -0.2, 0.0, 50_000, 40,
+                                        30, 0.0005)
+        mandelbrot.set_adaptive(True)
+        mandelbrot.set_threads(1)
+        mandelbrot.set_schedule("dynamic", 2)
+        data = [mandelbrot.to_bytes()] * 2
+        for workers in (1, 2):
+            for settings, _ in mandelbrot.render_states(data, workers,
+                                                        counts=True):
+                self.assertLess(settings[0], 50_000)
+                self.assertEqual(settings[1:].tolist(),
+                                 [1, SCHEDULES.index("dynamic"), 2])
+
+    def test_render_keyframes(self) -> None:
+        self.mandelbrot.set_real(-0.75)
+        self.mandelbrot.set_pixel_size(0.002)
+        states = [state for state, _ in
+                  self.mandelbrot.zoom_states(40, 30, 3, 10)]
+        exact = list(self.mandelbrot.render_states(states, 1))
+        frames = list(self.mandelbrot.render_keyframes(states, 1))
+        self.assertEqual(len(frames), len(exact))
+        mismatch = np.mean([(frame != expected).any(axis=2).mean()
+                            for frame, expected in zip(frames, exact)])
+        self.assertLess(mismatch, 0.1)
+        with self.assertRaises(ValueError):
+            next(self.mandelbrot.render_keyframes(states, 1, False, 0))
+
+    def test_export_tiled(self) -> None:
+        mandelbrot = Mandelbrot(self.color, -0.75, 0.1, 1000, 150, 100,
+                                0.004)
+        reference = Mandelbrot(self.color, -0.75, 0.1, 1000, 300, 200,
+                               0.002)
+        expected = np.array(reference.image_at_size(300, 200))
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tiled.png")
+            mandelbrot.export_tiled(path, 300, 200, 1, directory, tile=64)
+            with Image.open(path) as img:
+                image = np.array(img)
+            self.assertEqual(os.listdir(directory), ["tiled.png"])
+        self.assertEqual(image.shape, (200, 300, 3))
+        self.assertLess(np.mean((image != expected).any(axis=2)), 0.01)
+
+    def test_parallel(self) -> None:
+        # a tall and narrow frame has less columns than a block
+        reference = Mandelbrot(self.color, -0.75, 0.1, 300, 37, 301, 0.001)
+        reference.image()
+        for schedule in SCHEDULES:
+            for threads, chunk in ((1, 0), (3, 2)):
+                for method in METHODS:
+                    mandelbrot = Mandelbrot(self.color, -0.75, 0.1, 300, 37,
+                                            301, 0.001, method=method)
+                    mandelbrot.set_threads(threads)
+                    mandelbrot.set_schedule(schedule, chunk)
+                    list(mandelbrot.progressive())
+                    np.testing.assert_array_equal(mandelbrot.content,
+                                                  reference.content)
+        with self.assertRaises(ValueError):
+            self.mandelbrot.set_schedule("auto")
+        with self.assertRaises(ValueError):
+            self.mandelbrot.set_threads(-1)
+        self.assertEqual(parse_schedule("dynamic, 4"), ("dynamic", 4))
+        self.assertEqual(parse_schedule("static"), ("static", 0))
+
+    def test_parallel_environment(self) -> None:
+        code = ("import sys; from mandelia.model import Mandelbrot, "
+                "ModuloColoration; m = Mandelbrot(ModuloColoration()); "
+                "sys.exit((m.threads, m.schedule, m.chunk) "
+                "!= (3, 'static', 2))")
+        env = {**os.environ, "MANDELIA_THREADS": "3",
+               "MANDELIA_SCHEDULE": "static,2"}
+        process = subprocess.run([sys.executable, "-c", code], env=env,
+                                 check=False)
+        self.assertEqual(process.returncode, 0)
+
+    def test_adaptive(self) -> None:
+        # the adaptive counts are those of a compute at the chosen budget
+        for real, imaginary, pixel_size in VIEWS:
+            for kernel in KERNELS:
+                for method in METHODS:
+                    adaptive = Mandelbrot(self.color, real, imaginary, 20_000,
+                                          97, 64, pixel_size, kernel, method)
+                    adaptive.set_adaptive(True)
+                    adaptive.set_smoothing(True)
+                    list(adaptive.progressive())
+                    self.assertLessEqual(adaptive.budget, 20_000)
+                    direct = Mandelbrot(self.color, real, imaginary,
+                                        adaptive.budget, 97, 64, pixel_size,
+                                        kernel, method)
+                    direct.set_smoothing(True)
+                    direct.image()
+                    np.testing.assert_array_equal(adaptive.content,
+                                                  direct.content)
+                    np.testing.assert_array_equal(adaptive.smooth,
+                                                  direct.smooth)
+        # a view inside the set stops far below the maximum
+        interior = Mandelbrot(self.color, -0.2, 0.0, 100_000, 64, 64, 0.0005)
+        interior.set_adaptive(True)
+        interior.image()
+        self.assertLess(interior.budget, 1_000)
+        self.assertLess(interior.iterations_sum(), 64 * 64 * 1_000)
+
+    def test_resumable(self) -> None:
+        for kernel in KERNELS:
+            for method in METHODS:
+                resumed = Mandelbrot(self.color, -0.75, 0.1, 200, 97, 64,
+                                     0.001, kernel, method)
+                resumed.set_resumable(True)
+                resumed.set_smoothing(True)
+                resumed.image()
+                pixels = np.count_nonzero(resumed.content == 0)
+                resumed.set_iterations(2_000)
+                self.assertTrue(resumed.need_update)
+                list(resumed.progressive())
+                self.assertLessEqual(resumed.computed_pixels, pixels)
+                direct = Mandelbrot(self.color, -0.75, 0.1, 2_000, 97, 64,
+                                    0.001, kernel, method)
+                direct.set_smoothing(True)
+                direct.image()
+                np.testing.assert_array_equal(resumed.content,
+                                              direct.content)
+                np.testing.assert_array_equal(resumed.smooth, direct.smooth)
+        # moving the view computes every pixel again
+        resumed.set_method("pixel")
+        resumed.set_real(-0.7)
+        resumed.set_iterations(3_000)
+        resumed.image()
+        self.assertEqual(resumed.computed_pixels, 97 * 64)
+
+    def test_symmetry(self) -> None:
+        for kernel in KERNELS:
+            for method in METHODS:
+                for width, height in ((97, 64), (96, 65)):
+                    mirrored = Mandelbrot(self.color, -0.5, 0.0, 500, width,
+                                          height, 0.03, kernel, method)
+                    mirrored.set_smoothing(True)
+                    list(mirrored.progressive())
+                    self.assertLess(mirrored.computed_pixels,
+                                    width * (height // 2 + 2))
+                    direct = Mandelbrot(self.color, -0.5, 0.0, 500, width,
+                                        height, 0.03, kernel, method)
+                    direct.set_smoothing(True)
+                    direct.set_symmetry(False)
+                    direct.image()
+                    np.testing.assert_array_equal(mirrored.content,
+                                                  direct.content)
+                    np.testing.assert_array_equal(mirrored.smooth,
+                                                  direct.smooth)
+        # out of the real axis every pixel is computed
+        mirrored.set_imaginary(0.01)
+        mirrored.set_method("pixel")
+        mirrored.image()
+        self.assertEqual(mirrored.computed_pixels, 96 * 65)
+
+    def test_unknown_kernel(self) -> None:
+        with self.assertRaises(ValueError):
+            self.mandelbrot.set_kernel("unknown")
+
+
+class TestDeepMandelbrot(TestCase):
+
+    def setUp(self) -> None:
+        self.color = ModuloColoration(9, 2, 3)
+
+    def test_shallow(self) -> None:
+        double = Mandelbrot(self.color, -0.7453, 0.1127, 1000, 128, 96, 1e-5)
+        deep = DeepMandelbrot(self.color, -0.7453, 0.1127, 1000, 128, 96,
+                              1e-5)
+        double.image()
+        deep.image()
+        self.assertLess(np.mean(double.content != deep.content), 0.01)
+
+    def test_deep(self) -> None:
+        deep = DeepMandelbrot(self.color, "0", "1", 1000, 128, 96, 1e-100)
+        deep.image()
+        self.assertGreater(len(np.unique(deep.content)), 10)
+
+    def test_bytes(self) -> None:
+        real = "-1.74995768370609350360221450607069970727110579726252077930"
+        deep = DeepMandelbrot(self.color, real, "0", 1000, 256, 256, 1e-50)
+        deep.zoom(10, 20, 2)
+        other = DeepMandelbrot(self.color)
+        other.from_bytes(deep.to_bytes())
+        self.assertEqual(other.center_real, deep.center_real)
+        self.assertEqual(other.center_imaginary, deep.center_imaginary)
+        self.assertEqual(other.pixel_size, deep.pixel_size)
 
 
 class TestJulia(TestCase):
@@ -28,3 +479,64 @@ class TestJulia(TestCase):
         w, h = img.size
         self.assertEqual(w, 256)
         self.assertEqual(h, 128)
+
+    def test_interior_kernel(self) -> None:
+        for c_r, c_i in ((0.0, 0.0), (-0.12, 0.75), (-0.8, 0.156)):
+            scalar = Julia(self.color, c_r, c_i, width=96, height=64,
+                           iterations=500)
+            interior = Julia(self.color, c_r, c_i, width=96, height=64,
+                             iterations=500, kernel="interior")
+            batch = Julia(self.color, c_r, c_i, width=96, height=64,
+                          iterations=500, kernel="batch")
+            scalar.image()
+            interior.image()
+            batch.image()
+            np.testing.assert_array_equal(scalar.content, interior.content)
+            np.testing.assert_array_equal(scalar.content, batch.content)
+
+    def test_adaptive(self) -> None:
+        for kernel in KERNELS:
+            adaptive = Julia(self.color, -0.123, 0.745, iterations=5_000,
+                             width=96, height=64, kernel=kernel)
+            adaptive.set_adaptive(True)
+            adaptive.image()
+            direct = Julia(self.color, -0.123, 0.745,
+                           iterations=adaptive.budget, width=96, height=64,
+                           kernel=kernel)
+            direct.image()
+            np.testing.assert_array_equal(adaptive.content, direct.content)
+
+    def test_symmetry(self) -> None:
+        # around the real axis for a real C, around 0 for any C
+        for c_r, c_i in ((-0.8, 0.0), (-0.123, 0.745)):
+            for kernel in KERNELS:
+                for width, height in ((97, 64), (96, 65)):
+                    mirrored = Julia(self.color, c_r, c_i, iterations=500,
+                                     width=width, height=height,
+                                     pixel_size=0.03, kernel=kernel)
+                    mirrored.set_smoothing(True)
+                    mirrored.set_adaptive(True)
+                    mirrored.image()
+                    self.assertLess(mirrored.computed_pixels,
+                                    width * (height // 2 + 2))
+                    direct = Julia(self.color, c_r, c_i,
+                                   iterations=mirrored.budget, width=width,
+                                   height=height, pixel_size=0.03,
+                                   kernel=kernel)
+                    direct.set_smoothing(True)
+                    direct.set_symmetry(False)
+                    direct.image()
+                    np.testing.assert_array_equal(mirrored.content,
+                                                  direct.content)
+                    np.testing.assert_array_equal(mirrored.smooth,
+                                                  direct.smooth)
+
+    def test_subdivision(self) -> None:
+        for c_r, c_i in ((0.0, 0.0), (-0.8, 0.156)):
+            pixel = Julia(self.color, c_r, c_i, width=300, height=200,
+                          pixel_size=0.01)
+            subdivision = Julia(self.color, c_r, c_i, width=300, height=200,
+                                pixel_size=0.01, method="subdivision")
+            pixel.image()
+            subdivision.image()
+            np.testing.assert_array_equal(pixel.content, subdivision.content)
@@ -0,0 +1,81 @@
+"""Unit tests for mandelia.model.gif."""
+import os
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from mandelia.model import Mandelbrot, ModuloColoration
+from mandelia.model.gif import GifWriter, frame_blocks
+
+
+def read_frames(path: str) -> list:
+    """Return the RGB arrays of the frames of a GIF."""
+    with Image.open(path) as gif:
+        return [np.array(frame.convert("RGB"))
+                for frame in ImageSequence.Iterator(gif)]
+
+
+class TestGifWriter(TestCase):
+
+    def test_palette(self) -> None:
+        palette = ModuloColoration(9, 2, 3).palette()
+        rng = np.random.default_rng(0)
+        indexes = [rng.integers(0, 256, (12, 16), dtype=np.uint8)
+                   for _ in range(3)]
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a.gif")
+            with GifWriter(path, 16, 12, 40, palette) as gif:
+                for frame in indexes:
+                    gif.write(Image.fromarray(frame, "L"))
+            frames = read_frames(path)
+        self.assertEqual(len(frames), 3)
+        for frame, expected in zip(frames, indexes):
+            np.testing.assert_array_equal(frame, palette[expected])
+
+    def test_quantize(self) -> None:
+        image = np.zeros((12, 16, 3), dtype=np.uint8)
+        image[:, 8:] = (200, 100, 50)
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a.gif")
+            with GifWriter(path, 16, 12, 40, None) as gif:
+                gif.write(Image.fromarray(image, "RGB"))
+                with self.assertRaises(ValueError):
+                    gif.write(Image.new("RGB", (3, 3)))
+            frames = read_frames(path)
+        self.assertEqual(len(frames), 1)
+        np.testing.assert_array_equal(frames[0], image)
+
+    def test_frame_blocks(self) -> None:
+        image = Image.new("P", (16, 12))
+        buffer = BytesIO()
+        image.save(buffer, "GIF", duration=40, loop=0, comment=b"note")
+        data = buffer.getvalue()
+        blocks = frame_blocks(data)
+        # graphic control extension, frame and no comment nor trailer
+        self.assertTrue(blocks.startswith(b"!\xf9"))
+        self.assertNotIn(b"note", blocks)
+        self.assertTrue(data[:-1].endswith(blocks[8:]))
+
+    def test_drop(self) -> None:
+        color = ModuloColoration(9, 2, 3)
+        mandelbrot = Mandelbrot(color, width=40, height=30)
+        mandelbrot.set_real(-0.75)
+        mandelbrot.set_pixel_size(0.005)
+        states = mandelbrot.zoom_states(40, 30, 3, 10)
+        expected = list(mandelbrot.render_states(
+            [data for data, _ in states], 1))
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "zoom.gif")
+            with redirect_stdout(StringIO()):
+                mandelbrot.drop({"path": path, "ext": "gif", "width": 40,
+                                 "height": 30, "compression": 95, "fps": 10,
+                                 "speed": 30, "workers": 1})
+            frames = read_frames(path)
+        # the first frame is shown twice
+        self.assertEqual(len(frames), len(expected) + 1)
+        for frame, image in zip(frames[1:], expected):
+            np.testing.assert_array_equal(frame, image)
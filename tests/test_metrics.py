@@ -0,0 +1,67 @@
+"""Unit tests for mandelia.model.metrics."""
+from unittest import TestCase
+
+from mandelia.model import (FractaleManager, Mandelbrot, ModuloColoration,
+                            RenderMetrics, TileCache)
+from mandelia.model.metrics import METRICS_HISTORY, throughput
+
+
+class TestMetrics(TestCase):
+
+    def test_throughput(self) -> None:
+        history = [RenderMetrics(2.0, 0.1, 0.1, 100, 10),
+                   RenderMetrics(0.0, 0.1, 0.1, 0, 0),
+                   RenderMetrics(3.0, 0.1, 0.1, 400, 10)]
+        self.assertEqual(throughput(history), 100)
+        self.assertEqual(throughput([]), 0)
+        self.assertAlmostEqual(history[0].total, 2.2)
+        self.assertEqual(history[1].iterations_per_second, 0)
+
+    def test_manager(self) -> None:
+        manager = FractaleManager(120, 90)
+        self.assertIsNone(manager.metrics)
+        self.assertEqual(manager.iter_second, 0)
+        manager.first.image()
+        metrics = manager.metrics
+        assert metrics is not None
+        # the rows after the real axis are mirrored, not iterated
+        self.assertEqual(metrics.pixels, 120 * 46)
+        self.assertGreater(metrics.iterations, 0)
+        self.assertLess(metrics.iterations, manager.iter_sum)
+        self.assertGreater(metrics.compute, 0)
+        self.assertGreater(manager.iter_second, 0)
+        # a coloring alone does not count as a compute
+        manager.color(1, 2, 3)
+        manager.first.image()
+        metrics = manager.metrics
+        assert metrics is not None
+        self.assertEqual(metrics.iterations, 0)
+        self.assertEqual(len(manager.history), 2)
+        for _ in range(METRICS_HISTORY):
+            manager.first.image()
+        self.assertEqual(len(manager.history), METRICS_HISTORY)
+
+    def test_progressive(self) -> None:
+        manager = FractaleManager(120, 90)
+        list(manager.first.progressive())
+        self.assertEqual(len(manager.history), 1)
+        metrics = manager.metrics
+        assert metrics is not None
+        self.assertGreater(metrics.iterations, 0)
+        self.assertLess(metrics.iterations, manager.iter_sum)
+
+    def test_iterations_done(self) -> None:
+        mandelbrot = Mandelbrot(ModuloColoration(), -0.5, 0.1, 1000, 128,
+                                96, 0.01)
+        mandelbrot.set_cache(TileCache())
+        mandelbrot.image()
+        metrics = mandelbrot.metrics
+        assert metrics is not None
+        # every pixel iterated from Z0
+        self.assertEqual(metrics.iterations, mandelbrot.iterations_sum())
+        # the same compute served by the cache iterates nothing
+        mandelbrot.set_real(mandelbrot.real)
+        mandelbrot.image()
+        metrics = mandelbrot.metrics
+        assert metrics is not None
+        self.assertEqual((metrics.pixels, metrics.iterations), (0, 0))
@@ -0,0 +1,36 @@
+"""Unit tests for mandelia.model.png."""
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+from PIL import Image
+
+from mandelia.model.png import PngWriter
+
+
+class TestPngWriter(TestCase):
+
+    def test_bands(self) -> None:
+        image = np.random.default_rng(0).integers(
+            0, 256, (50, 30, 3), dtype=np.uint8)
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a.png")
+            with PngWriter(path, 30, 50) as png:
+                for y0 in range(0, 50, 7):
+                    png.write(image[y0:y0 + 7])
+            with Image.open(path) as img:
+                self.assertEqual(img.mode, "RGB")
+                np.testing.assert_array_equal(np.array(img), image)
+
+    def test_invalid(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a.png")
+            png = PngWriter(path, 4, 2)
+            with self.assertRaises(ValueError):
+                png.write(np.zeros((1, 5, 3), dtype=np.uint8))
+            png.write(np.zeros((1, 4, 3), dtype=np.uint8))
+            with self.assertRaises(ValueError):
+                png.write(np.zeros((2, 4, 3), dtype=np.uint8))
+            with self.assertRaises(ValueError):
+                png.close()
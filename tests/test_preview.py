@@ -0,0 +1,48 @@
+"""Unit tests for mandelia.controller.preview."""
+from unittest import TestCase
+
+from mandelia.controller.preview import (MAX_SCALE, MIN_ITERATIONS,
+                                         PreviewQuality)
+
+
+class TestPreviewQuality(TestCase):
+
+    def test_update(self) -> None:
+        quality = PreviewQuality(0.016)
+        self.assertEqual(quality.scale, 2)
+        # slower than the budget, the preview gets smaller
+        quality.update(0.02)
+        self.assertEqual(quality.scale, 3)
+        # within the budget, kept as is
+        quality.update(0.01)
+        self.assertEqual(quality.scale, 3)
+        # faster than half the budget, the preview gets finer
+        quality.update(0.005)
+        self.assertEqual(quality.scale, 2)
+
+    def test_scale_clamps(self) -> None:
+        quality = PreviewQuality(0.016)
+        for _ in range(MAX_SCALE + 2):
+            quality.update(1.0)
+        self.assertEqual(quality.scale, MAX_SCALE)
+        for _ in range(MAX_SCALE + 2):
+            quality.update(0.0)
+        self.assertEqual(quality.scale, 1)
+
+    def test_size(self) -> None:
+        quality = PreviewQuality()
+        self.assertEqual(quality.size(300, 200), (150, 100))
+        quality.scale = MAX_SCALE
+        self.assertEqual(quality.size(300, 5), (300 // MAX_SCALE, 1))
+        quality.scale = 1
+        self.assertEqual(quality.size(300, 200), (300, 200))
+
+    def test_iterations(self) -> None:
+        quality = PreviewQuality()
+        self.assertEqual(quality.iterations(1000), 500)
+        quality.scale = MAX_SCALE
+        self.assertEqual(quality.iterations(MIN_ITERATIONS * 2),
+                         MIN_ITERATIONS)
+        # never more than the iterations of the full image
+        self.assertEqual(quality.iterations(MIN_ITERATIONS // 2),
+                         MIN_ITERATIONS // 2)
@@ -0,0 +1,57 @@
+"""Unit tests for mandelia.trace."""
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from mandelia.trace import DEBUG, INFO, NULL_SPAN, OFF, Tracer
+
+
+class TestTracer(TestCase):
+
+    def test_disabled(self) -> None:
+        tracer = Tracer(OFF)
+
+        def handler() -> int:
+            return 1
+
+        self.assertIs(tracer.traced()(handler), handler)
+        self.assertIs(tracer.span("render"), NULL_SPAN)
+        with tracer.span("render"):
+            pass
+        self.assertEqual(len(tracer.events), 0)
+        self.assertFalse(tracer.enabled(INFO))
+
+    def test_spans(self) -> None:
+        tracer = Tracer(INFO, max_events=3)
+
+        @tracer.traced(INFO)
+        def render() -> int:
+            return 1
+
+        self.assertEqual(render(), 1)
+        self.assertIs(tracer.traced(DEBUG)(render), render)
+        with tracer.span("photo"):
+            pass
+        with tracer.span("handler", DEBUG):
+            pass
+        names = [event["name"] for event in tracer.events]
+        self.assertEqual(names, [render.__qualname__, "photo"])
+        self.assertTrue(all(event["dur"] >= 0 for event in tracer.events))
+        self.assertIn("photo", tracer.summary())
+        for _ in range(3):
+            render()
+        self.assertEqual(len(tracer.events), 3)
+
+    def test_write(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            tracer = Tracer(DEBUG, path)
+            with tracer.span("render"):
+                pass
+            tracer.close()
+            with open(path, "r", encoding="utf8") as file:
+                events = json.load(file)["traceEvents"]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["name"], "render")